@@ -0,0 +1,136 @@
+"""
+Compara la validación de la carga masiva de productos fila por fila (iterrows) con la validación
+por columnas de ProductService.parse_and_validate_file.
+
+Genera un CSV sintético con filas válidas y con errores (columnas vacías, fabricantes y categorías
+desconocidos), valida el archivo con las dos implementaciones, comprueba que el resultado sea
+idéntico e imprime el tiempo de cada una. No necesita base de datos: los fabricantes y las
+categorías se pasan como diccionarios.
+
+Uso:
+    python benchmarks/upload_preview_validation.py [--rows 100000] [--error-rate 0.1]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import uuid
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "products"))
+
+from app.services.product_service import REQUIRED_COLUMNS, validate_upload_frame, batch_upload_chunks  # noqa: E402
+
+CHUNK_SIZE = 100
+MANUFACTURERS = [f"Fabricante {i}" for i in range(50)]
+CATEGORIES = [f"Categoría {i}" for i in range(20)]
+
+
+def build_csv(rows, error_rate, seed=7):
+    rnd = random.Random(seed)
+    data = []
+    for i in range(rows):
+        row = {
+            "Nombre del producto": f"Producto {i}",
+            "Descripción": f"Descripción del producto {i}",
+            "Cantidad inicial": rnd.randint(1, 500),
+            "Precio unitario": rnd.randint(1000, 90000),
+            "Nombre del fabricante": rnd.choice(MANUFACTURERS),
+            "Nombre de la categoría": rnd.choice(CATEGORIES),
+        }
+        if rnd.random() < error_rate:
+            error = rnd.choice(["vacío", "fabricante", "categoría"])
+            if error == "vacío":
+                row[rnd.choice(REQUIRED_COLUMNS[:4])] = None
+            elif error == "fabricante":
+                row["Nombre del fabricante"] = "Fabricante desconocido"
+            else:
+                row["Nombre de la categoría"] = "Categoría desconocida"
+        data.append(row)
+    buffer = io.StringIO()
+    pd.DataFrame(data).to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+def validate_iterrows(content, manufacturer_map, category_map):
+    """Implementación anterior: valida cada fila con iterrows y row.to_dict()."""
+    validos = []
+    errores = []
+    for chunk in pd.read_csv(io.StringIO(content), chunksize=CHUNK_SIZE):
+        chunk = chunk.fillna('').astype(object)
+        for _, row in chunk.iterrows():
+            item = row.to_dict()
+            item['errores'] = []
+            for col in REQUIRED_COLUMNS:
+                if str(row.get(col)).strip() == '':
+                    item['errores'].append(f"Columna '{col}' vacía")
+
+            manufacturer_id = manufacturer_map.get(str(row.get("Nombre del fabricante")).strip().lower())
+            if not manufacturer_id:
+                item['errores'].append("Fabricante no encontrado")
+            else:
+                item['manufacturer_id'] = manufacturer_id
+
+            category_id = category_map.get(str(row.get("Nombre de la categoría")).strip().lower())
+            if not category_id:
+                item['errores'].append("Categoría no encontrada")
+            else:
+                item['category_id'] = category_id
+
+            if not item['errores']:
+                validos.append({
+                    "name": row["Nombre del producto"],
+                    "description": row["Descripción"],
+                    "quantity": int(row["Cantidad inicial"]),
+                    "amount_unit": float(row["Precio unitario"]),
+                    "manufacturer_id": manufacturer_id,
+                    "manufacturer_name": row["Nombre del fabricante"],
+                    "category_id": category_id,
+                })
+            else:
+                errores.append(item)
+    return validos, errores
+
+
+def validate_columns(content, manufacturer_map, category_map):
+    validos = []
+    errores = []
+    chunks = (chunk.fillna('').astype(object) for chunk in pd.read_csv(io.StringIO(content), chunksize=CHUNK_SIZE))
+    for batch in batch_upload_chunks(chunks):
+        batch_validos, batch_errores, _ = validate_upload_frame(batch, manufacturer_map, category_map)
+        validos.extend(batch_validos)
+        errores.extend(batch_errores)
+    return validos, errores
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run(rows, error_rate):
+    content = build_csv(rows, error_rate)
+    manufacturer_map = {name.lower(): uuid.uuid4() for name in MANUFACTURERS}
+    category_map = {name.lower(): uuid.uuid4() for name in CATEGORIES}
+
+    before, before_seconds = timed(validate_iterrows, content, manufacturer_map, category_map)
+    after, after_seconds = timed(validate_columns, content, manufacturer_map, category_map)
+    if before != after:
+        raise SystemExit("❌ Las dos implementaciones no retornan el mismo resultado")
+
+    print(f"Filas: {rows} ({len(after[0])} válidas, {len(after[1])} con errores)")
+    print(f"{'implementación':20} {'segundos':>9}")
+    print(f"{'iterrows':20} {before_seconds:9.2f}")
+    print(f"{'por columnas':20} {after_seconds:9.2f}")
+    print(f"Mejora: {before_seconds / after_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="Cantidad de filas del archivo sintético")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="Proporción de filas con algún error")
+    args = parser.parse_args()
+    run(args.rows, args.error_rate)
@@ -3,6 +3,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.customer_service import CustomerService
 from app.models.customer_model import CustomerSchema
 from app.utils.response_util import format_response
+from app.utils.validate_role import validate_role
+from app.utils import http_client
 from app.exceptions.http_exceptions import BadRequestError
 
 customer_bp = Blueprint('customer', __name__, url_prefix='/customers')
@@ -33,6 +35,13 @@ def get_customers():
         return format_response("success", 200, message="Todos los clientes han sido obtenidos", data=customers)
 
 
+@customer_bp.route('/metrics', methods=['GET'])
+@jwt_required()
+@validate_role("admin")
+def get_metrics():
+    return format_response("success", 200, "Métricas obtenidas con éxito", data={"http_client": http_client.get_metrics()})
+
+
 @customer_bp.route('/ping', methods=['GET'])
 def ping():
     return format_response("success", 200, "pong")
\ No newline at end of file
@@ -1,11 +1,11 @@
 import uuid
 import re
-import requests
 import os
 from app.repositories.customer_repository import CustomerRepository
 from app.exceptions.http_exceptions import BadRequestError
 from app.models.customer_model import Customer, DocumentTypeEnum
 from flask import request
+from app.utils import http_client
 
 def validate_uuid(id):
     try:
@@ -36,7 +36,7 @@ class CustomerService:
             headers = {
                 'Authorization': f'Bearer {token}',
             }
-            response = requests.get(f'{CustomerService.BASE_URL_USER_API}/{customer.user_id}', headers=headers)
+            response = http_client.get(f'{CustomerService.BASE_URL_USER_API}/{customer.user_id}', upstream="users", headers=headers)
 
             if response.status_code != 200:
                 raise BadRequestError(f"No se pudo obtener los datos del usuario con ID {customer.user_id}")
@@ -96,7 +96,7 @@ class CustomerService:
             user_data["role"] = "customer"        
 
         user_service_url = CustomerService.BASE_URL_USER_API
-        user_response = requests.post(user_service_url, json=user_data)
+        user_response = http_client.post(user_service_url, upstream="users", json=user_data)
 
         if user_response.status_code != 201:
             raise BadRequestError(f"Error al crear el usuario: {user_response.json().get('error')}")
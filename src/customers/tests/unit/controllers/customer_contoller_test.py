@@ -1,6 +1,6 @@
 import pytest
 from flask import Flask
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, create_access_token
 
 from app.controllers.customer_controller import customer_bp
 from app.exceptions.http_exceptions import BadRequestError
@@ -426,7 +426,7 @@ def test_create_customer_user_service_error(mocker, client):
     }
  
     mocker.patch(
-        "app.services.customer_service.requests.post",
+        "app.services.customer_service.http_client.post",
         return_value=mocker.Mock(
             status_code=400,
             json=lambda: user_service_error_response
@@ -504,4 +504,21 @@ def test_ping(client):
     assert response.status_code == 200
     data = response.get_json()
     assert data["status"] == "success"
-    assert data["message"] == "pong"
\ No newline at end of file
+    assert data["message"] == "pong"
+
+def auth_header(app, role):
+    with app.app_context():
+        return {"Authorization": f"Bearer {create_access_token(identity='user-1', additional_claims={'role': role})}"}
+
+def test_get_metrics(mocker, app, client):
+    mocker.patch("app.utils.http_client.get_metrics", return_value={"users": {"requests": 3}})
+
+    response = client.get("/customers/metrics", headers=auth_header(app, "admin"))
+
+    assert response.status_code == 200
+    assert response.get_json()["data"] == {"http_client": {"users": {"requests": 3}}}
+
+def test_get_metrics_requires_admin(app, client):
+    response = client.get("/customers/metrics", headers=auth_header(app, "customer"))
+
+    assert response.status_code == 403
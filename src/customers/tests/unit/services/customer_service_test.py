@@ -43,7 +43,7 @@ def test_is_valid_data():
     assert is_valid_data("12345") is False
     assert is_valid_data("Colombia123") is False
 
-@patch("app.services.customer_service.requests.post")
+@patch("app.services.customer_service.http_client.post")
 def test_create_customer_user_service_error(mock_post, mock_customer):
     mock_post.return_value = MagicMock(
         status_code=400,
@@ -123,7 +123,7 @@ def test_get_all_customers_no_data(mock_get_all):
         CustomerService.get_all()
 
 @patch("app.repositories.customer_repository.CustomerRepository.get_all")
-@patch("app.services.customer_service.requests.get")
+@patch("app.services.customer_service.http_client.get")
 def test_get_all_customers_success(mock_requests_get, mock_get_all):
     mock_get_all.return_value = [
         Customer(
@@ -187,7 +187,7 @@ def test_get_all_customers_success(mock_requests_get, mock_get_all):
     assert result[1]["address"] == "Calle 123"
 
 @patch("app.repositories.customer_repository.CustomerRepository.get_all")
-@patch("app.services.customer_service.requests.get")
+@patch("app.services.customer_service.http_client.get")
 def test_get_all_customers_identification_type(mock_requests_get, mock_get_all):
     customer_enum = Customer(
         identification_type=DocumentTypeEnum.CC,
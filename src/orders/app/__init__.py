@@ -1,13 +1,18 @@
 import os
+from datetime import datetime
 from flask import Flask
 from flask_cors import CORS
 from app.core.config import Config
 from app.core.routes import register_routes
 from app.core.database import init_db
 from app.core.jwt import init_jwt
-from app.extensions import socketio
+from app.extensions import socketio, socketio_queue_options
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.jobs.auto_update_delivered_orders import auto_update_delivered_orders
+from app.jobs.backfill_order_products_snapshot import backfill_order_products_snapshot
+from app.jobs.dispatch_outbox_events import dispatch_outbox_events, purge_processed_outbox_events
+from app.jobs.reconcile_stock_sagas import reconcile_stock_sagas
+from app.utils.validate_auth_util import refresh_blocked_users
 
 def create_app(config = Config):
     allowed_origins = os.getenv("ALLOWED_ORIGINS").split(",")
@@ -20,7 +25,17 @@ def create_app(config = Config):
 
     scheduler = BackgroundScheduler()
     scheduler.add_job(lambda: auto_update_delivered_orders(app), 'interval', minutes=int(os.getenv("EXECUTION_MINUTES_JOB")))
+    # Se ejecuta al iniciar para completar la copia de productos en pedidos antiguos; se reprograma si falla
+    scheduler.add_job(lambda: backfill_order_products_snapshot(app, scheduler=scheduler))
+    scheduler.add_job(lambda: refresh_blocked_users(app), 'interval',
+                      seconds=int(os.getenv("BLOCKED_USERS_REFRESH_SECONDS", "60")), next_run_time=datetime.now())
+    scheduler.add_job(lambda: dispatch_outbox_events(app), 'interval',
+                      seconds=int(os.getenv("OUTBOX_DISPATCH_SECONDS", "2")), max_instances=1)
+    scheduler.add_job(lambda: purge_processed_outbox_events(app), 'interval',
+                      minutes=int(os.getenv("OUTBOX_PURGE_MINUTES", "60")), max_instances=1)
+    scheduler.add_job(lambda: reconcile_stock_sagas(app), 'interval',
+                      seconds=int(os.getenv("STOCK_SAGA_RECONCILE_SECONDS", "60")), max_instances=1)
     scheduler.start()
-    socketio.init_app(app)
+    socketio.init_app(app, **socketio_queue_options(app.config))
     
     return app
\ No newline at end of file
@@ -2,10 +2,14 @@ from flask import Blueprint, request
 from app.services.order_service import OrderService
 from app.models.order_model import OrderSchema
 from app.utils.response_util import format_response
-from app.utils.validate_auth_util import get_authenticated_user_id
-from app.exceptions.http_exceptions import NotFoundError, BadRequestError
-from flask_jwt_extended import jwt_required
+from app.utils.validate_auth_util import get_authenticated_user_id, verified_users
+from app.exceptions.http_exceptions import NotFoundError, BadRequestError, ConflictError, ServiceUnavailableError
+from flask_jwt_extended import jwt_required, get_jwt
 from app.utils.validate_role_util import validate_role
+from app.utils import http_client
+from app.utils.pagination_util import parse_limit
+from app.utils.product_info_util import products_breaker, products_cache, last_known_products
+from app.jobs.auto_update_delivered_orders import last_run as delivered_job_last_run
 
 order_bp = Blueprint('orders', __name__, url_prefix='/orders')
 order_schema = OrderSchema()
@@ -17,14 +21,37 @@ orders_schema = OrderSchema(many=True)
 def get_orders_by_customer():
     try:
         customer_id = get_authenticated_user_id()
-        orders = OrderService.get_orders_by_customer(customer_id)
+        limit = parse_limit(request.args.get("limit"))
+        orders, next_cursor = OrderService.get_orders_by_customer(customer_id, limit, request.args.get("cursor"))
+        meta = {"limit": limit, "next_cursor": next_cursor}
         if not orders:
-            return format_response("success", 200, message="No hay pedidos registrados", data=[])
-        return format_response("success", 200, message="Todos los pedidos han sido obtenidos", data=orders)
+            return format_response("success", 200, message="No hay pedidos registrados", data=[], meta=meta)
+        return format_response("success", 200, message="Todos los pedidos han sido obtenidos", data=orders, meta=meta)
+    except (BadRequestError, NotFoundError, ServiceUnavailableError) as e:
+        return format_response("error", e.code, error=e.description)
     except Exception as e:
         return format_response("error", 500, message="Ocurrió un error al obtener los pedidos", error=str(e))
 
 
+@order_bp.route('/changes', methods=['GET'])
+@jwt_required()
+@validate_role(["customer", "seller"])
+def get_order_changes():
+    """
+    Pedidos del usuario que cambiaron de estado después del cursor 'since'. El cliente guarda
+    meta.next_since y lo envía en la siguiente consulta para sincronizar solo los cambios.
+    """
+    try:
+        user_id = get_authenticated_user_id()
+        limit = parse_limit(request.args.get("limit"))
+        filters = {"seller_id": user_id} if get_jwt().get("role") == "seller" else {"customer_id": user_id}
+        orders, next_since, has_more = OrderService.get_state_changes(request.args.get("since"), limit, **filters)
+    except (BadRequestError, NotFoundError) as e:
+        return format_response("error", e.code, error=e.description)
+    return format_response("success", 200, "Cambios de pedidos obtenidos con éxito", data=orders,
+                           meta={"next_since": next_since, "has_more": has_more})
+
+
 @order_bp.route('/<string:id>', methods=['GET'])
 @jwt_required()
 @validate_role(["customer", "seller"])
@@ -44,8 +71,8 @@ def create_order():
     try:
         order_data = request.get_json()
         user_id = get_authenticated_user_id()
-        order = OrderService.create_order(user_id, order_data)
-    except (BadRequestError, NotFoundError) as e:
+        order = OrderService.create_order(user_id, order_data, request.headers.get("Idempotency-Key"))
+    except (BadRequestError, NotFoundError, ConflictError, ServiceUnavailableError) as e:
         return format_response("error", e.code, error=e.description)
     else:
         return format_response("success", 201, "Pedido creado con éxito", data=order)
@@ -58,8 +85,8 @@ def create_order_seller():
     try:
         order_data = request.get_json()
         seller_id = get_authenticated_user_id()
-        order = OrderService.create_order_seller(seller_id, order_data)
-    except (BadRequestError, NotFoundError) as e:
+        order = OrderService.create_order_seller(seller_id, order_data, request.headers.get("Idempotency-Key"))
+    except (BadRequestError, NotFoundError, ConflictError, ServiceUnavailableError) as e:
         return format_response("error", e.code, error=e.description)
     else:
         return format_response("success", 201, "Pedido creado con éxito", data=order)
@@ -70,13 +97,28 @@ def create_order_seller():
 @validate_role(["seller"])
 def get_orders_by_customer_for_seller(customer_id):
     try:
-        orders = OrderService.get_orders_by_customer(customer_id)
+        limit = parse_limit(request.args.get("limit"))
+        orders, next_cursor = OrderService.get_orders_by_customer(customer_id, limit, request.args.get("cursor"))
+        meta = {"limit": limit, "next_cursor": next_cursor}
         if not orders:
-            return format_response("success", 200, message="No hay pedidos registrados para este cliente", data=[])
-        return format_response("success", 200, message="Todos los pedidos del cliente han sido obtenidos", data=orders)
+            return format_response("success", 200, message="No hay pedidos registrados para este cliente", data=[], meta=meta)
+        return format_response("success", 200, message="Todos los pedidos del cliente han sido obtenidos", data=orders, meta=meta)
     except (BadRequestError, NotFoundError) as e:
        return format_response("error", e.code, error=e.description)
 
+@order_bp.route('/metrics', methods=['GET'])
+@jwt_required()
+@validate_role(["admin"])
+def get_metrics():
+    return format_response("success", 200, "Métricas obtenidas con éxito", data={
+        "http_client": http_client.get_metrics(),
+        "auth_cache": verified_users.stats(),
+        "products_breaker": products_breaker.stats(),
+        "products_cache": products_cache.stats(),
+        "products_stale_cache": last_known_products.stats(),
+        "auto_update_delivered_orders": delivered_job_last_run
+    })
+
 @order_bp.route('/ping', methods=['GET'])
 def ping():
     return format_response("success", 200, "pong")
\ No newline at end of file
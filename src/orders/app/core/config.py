@@ -6,4 +6,7 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
-    SOCKET_SECRET_KEY = os.getenv('SOCKET_SECRET_KEY')    
\ No newline at end of file
+    SOCKET_SECRET_KEY = os.getenv('SOCKET_SECRET_KEY')    
+    # Cola compartida entre workers/réplicas, p. ej. redis://redis:6379/0 ("local" para pruebas)
+    SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+    SOCKETIO_CHANNEL = os.getenv('SOCKETIO_CHANNEL', 'orders-inventory')
@@ -34,4 +34,22 @@ class NotFoundError(HTTPException):
     def __init__(self, description=None):
         if description:
             self.description = description
-        super().__init__()
\ No newline at end of file
+        super().__init__()
+
+class ConflictError(HTTPException):
+    code:int = 409
+    description:str = "Conflicto con el estado actual del recurso"
+
+    def __init__(self, description=None):
+        if description:
+            self.description = description
+        super().__init__()
+
+class ServiceUnavailableError(HTTPException):
+    code:int = 503
+    description:str = "Servicio no disponible temporalmente"
+
+    def __init__(self, description=None):
+        if description:
+            self.description = description
+        super().__init__()
@@ -1,3 +1,17 @@
 from flask_socketio import SocketIO
+from app.websockets.local_pubsub_manager import LocalPubSubManager
 
-socketio = SocketIO(async_mode="eventlet", cors_allowed_origins="*")
\ No newline at end of file
+socketio = SocketIO(async_mode="eventlet", cors_allowed_origins="*")
+
+def socketio_queue_options(config):
+    """
+    Opciones de cola de mensajes para que varios workers o réplicas compartan las salas de
+    Socket.IO. Sin SOCKETIO_MESSAGE_QUEUE se mantiene el comportamiento de un solo proceso.
+    """
+    url = config.get("SOCKETIO_MESSAGE_QUEUE")
+    channel = config.get("SOCKETIO_CHANNEL")
+    if not url:
+        return {}
+    if url.startswith("local"):
+        return {"client_manager": LocalPubSubManager(channel=channel)}
+    return {"message_queue": url, "channel": channel}
@@ -1,16 +1,83 @@
+import os
+import time as timer
 from datetime import datetime, time
+from sqlalchemy import update, select, text
 from app.models.order_model import Order, OrderStateEnum
 from app.core.database import db
+from app.repositories.order_state_change_repository import OrderStateChangeRepository
 
-def auto_update_delivered_orders(app):
+DELIVERED_JOB_CHUNK_SIZE = int(os.getenv("DELIVERED_JOB_CHUNK_SIZE", "500"))
+# Todas las réplicas comparten la base de datos, el bloqueo asegura que solo una ejecute el job
+DELIVERED_JOB_LOCK = "auto_update_delivered_orders"
+PENDING_DELIVERY_STATES = (OrderStateEnum.PREPARING, OrderStateEnum.ON_ROUTE)
+
+# Resultado de la última ejecución en este proceso, se expone en /orders/metrics
+last_run = {}
+
+def update_delivered_chunk(now, chunk_size):
+    """
+    Marca como entregado un bloque de pedidos vencidos, registra cada cambio de estado y
+    retorna cuántos se actualizaron. Las filas bloqueadas por otra transacción se omiten
+    y se toman en una ejecución posterior.
+    """
+    orders = db.session.execute(
+        select(Order.id, Order.customer_id, Order.seller_id, Order.state)
+        .where(Order.state.in_(PENDING_DELIVERY_STATES), Order.delivery_date <= now)
+        .limit(chunk_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if orders:
+        db.session.execute(
+            update(Order)
+            .where(Order.id.in_([order.id for order in orders]))
+            .values(state=OrderStateEnum.DELIVERED)
+            .execution_options(synchronize_session=False)
+        )
+        OrderStateChangeRepository.add_changes([
+            {
+                "order_id": order.id,
+                "customer_id": order.customer_id,
+                "seller_id": order.seller_id,
+                "from_state": order.state,
+                "to_state": OrderStateEnum.DELIVERED
+            }
+            for order in orders
+        ])
+    db.session.commit()
+    return len(orders)
+
+def auto_update_delivered_orders(app, chunk_size=DELIVERED_JOB_CHUNK_SIZE):
     with app.app_context():
-        now = datetime.combine(datetime.utcnow().date(), time.min)
-        updated_rows = db.session.query(Order).filter(
-            Order.delivery_date <= now,
-            Order.state != OrderStateEnum.DELIVERED
-        ) \
-        .update({ Order.state: OrderStateEnum.DELIVERED }, synchronize_session=False)
+        with db.engine.connect() as lock_connection:
+            use_lock = lock_connection.dialect.name == "postgresql"
+            if use_lock and not lock_connection.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": DELIVERED_JOB_LOCK}
+            ).scalar():
+                print("⏭️ Otra réplica está actualizando los pedidos entregados")
+                return None
+
+            try:
+                start = timer.monotonic()
+                now = datetime.combine(datetime.utcnow().date(), time.min)
+                updated_rows = 0
+                chunks = 0
+                while True:
+                    chunk_rows = update_delivered_chunk(now, chunk_size)
+                    updated_rows += chunk_rows
+                    chunks += 1
+                    if chunk_rows < chunk_size:
+                        break
+            finally:
+                if use_lock:
+                    lock_connection.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": DELIVERED_JOB_LOCK})
+                    lock_connection.commit()
 
-        db.session.commit()
-        
-        print(f"✅ Actualizados {updated_rows} pedidos a 'DELIVERED'")
\ No newline at end of file
+        elapsed_ms = round((timer.monotonic() - start) * 1000, 2)
+        last_run.update({
+            "updated": updated_rows,
+            "chunks": chunks,
+            "elapsed_ms": elapsed_ms,
+            "finished_at": datetime.utcnow().isoformat()
+        })
+        print(f"✅ Actualizados {updated_rows} pedidos a 'DELIVERED' en {chunks} bloques ({elapsed_ms} ms)")
+        return updated_rows
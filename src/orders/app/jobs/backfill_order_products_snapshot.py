@@ -0,0 +1,78 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.models.order_product_model import OrderProducts
+from app.core.database import db
+from app.exceptions.http_exceptions import ServiceUnavailableError
+from app.utils.product_info_util import get_products_info
+
+BATCH_SIZE = 500
+# Espera antes de reintentar si el servicio de productos no responde; se duplica en cada intento
+BACKFILL_RETRY_SECONDS = int(os.getenv("BACKFILL_RETRY_SECONDS", "30"))
+BACKFILL_RETRY_MAX_SECONDS = int(os.getenv("BACKFILL_RETRY_MAX_SECONDS", "1800"))
+# Cada réplica y worker lo programa al iniciar, el bloqueo asegura que solo uno lo ejecute a la vez
+BACKFILL_JOB_LOCK = "backfill_order_products_snapshot"
+
+def backfill_retry_delay(attempt):
+    return min(BACKFILL_RETRY_SECONDS * (2 ** attempt), BACKFILL_RETRY_MAX_SECONDS)
+
+def backfill_order_products_snapshot(app, batch_size=BATCH_SIZE, scheduler=None, attempt=0):
+    """
+    Completa la copia de los datos del producto (nombre, imagen y precio unitario) en las líneas
+    de pedido creadas antes de que existiera. Recorre las filas por lotes ordenados por id.
+    Si el servicio de productos no está disponible se libera el bloqueo y, con un scheduler,
+    se vuelve a programar con backoff; los lotes ya confirmados no se repiten.
+    """
+    with app.app_context():
+        with db.engine.connect() as lock_connection:
+            use_lock = lock_connection.dialect.name == "postgresql"
+            if use_lock and not lock_connection.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": BACKFILL_JOB_LOCK}
+            ).scalar():
+                print("⏭️ Otra réplica está completando la copia de productos en los pedidos")
+                return None
+
+            updated_rows = 0
+            unavailable = False
+            try:
+                last_id = None
+
+                while True:
+                    query = OrderProducts.query.filter(OrderProducts.product_name.is_(None))
+                    if last_id is not None:
+                        query = query.filter(OrderProducts.id > last_id)
+                    order_products = query.order_by(OrderProducts.id).limit(batch_size).all()
+                    if not order_products:
+                        break
+
+                    products_info = get_products_info(order_product.product_id for order_product in order_products)
+                    for order_product in order_products:
+                        product_info = products_info.get(str(order_product.product_id))
+                        if not product_info:
+                            continue
+                        order_product.product_name = product_info.get("name")
+                        order_product.product_image_url = product_info.get("image_url")
+                        order_product.unit_price = product_info.get("unit_amount")
+                        updated_rows += 1
+
+                    db.session.commit()
+                    last_id = order_products[-1].id
+            except ServiceUnavailableError:
+                db.session.rollback()
+                unavailable = True
+            finally:
+                if use_lock:
+                    lock_connection.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": BACKFILL_JOB_LOCK})
+                    lock_connection.commit()
+
+        if unavailable:
+            retry_seconds = backfill_retry_delay(attempt)
+            print(f"⚠️ El servicio de productos no está disponible, la copia de productos se reintenta en {retry_seconds} s "
+                  f"({updated_rows} líneas copiadas)")
+            if scheduler is not None:
+                scheduler.add_job(lambda: backfill_order_products_snapshot(app, batch_size, scheduler, attempt + 1),
+                                  'date', run_date=datetime.now() + timedelta(seconds=retry_seconds))
+            return None
+
+        print(f"✅ Copiados los datos del producto en {updated_rows} líneas de pedido")
+        return updated_rows
@@ -0,0 +1,82 @@
+import os
+from datetime import datetime, timedelta
+from app.core.database import db
+from app.models.outbox_event_model import OutboxStatusEnum, INVENTORY_UPDATE_EVENT
+from app.repositories.outbox_repository import OutboxRepository
+from app.websockets.inventory_websocket import notify_inventory_update, coalesce_inventory_updates
+from app.utils.product_info_util import invalidate_products
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+# Días que se conservan los eventos procesados antes de eliminarlos
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+OUTBOX_PURGE_BATCH_SIZE = int(os.getenv("OUTBOX_PURGE_BATCH_SIZE", "1000"))
+
+def handle_inventory_updates(payloads):
+    updates = [update for payload in payloads for update in payload]
+    invalidate_products(update["product_id"] for update in updates)
+    # Cada ejecución del despacho agrupa los eventos acumulados desde la anterior: se envía una sola
+    # notificación con la última cantidad de cada producto. Si falla, los eventos siguen pendientes
+    if not notify_inventory_update(coalesce_inventory_updates(updates)):
+        raise RuntimeError("No se pudo enviar la notificación de inventario a los vendedores")
+
+OUTBOX_HANDLERS = {
+    INVENTORY_UPDATE_EVENT: handle_inventory_updates,
+}
+
+def dispatch_outbox_events(app, batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Despacha por lotes los eventos pendientes del outbox, agrupados por tipo.
+    Si el manejador de un tipo falla, sus eventos se reintentan en la siguiente ejecución
+    hasta OUTBOX_MAX_ATTEMPTS, luego quedan en estado FAILED.
+    """
+    with app.app_context():
+        events = OutboxRepository.get_pending_batch(batch_size)
+        if not events:
+            db.session.commit()
+            return 0
+
+        events_by_type = {}
+        for event in events:
+            events_by_type.setdefault(event.event_type, []).append(event)
+
+        processed = 0
+        for event_type, typed_events in events_by_type.items():
+            handler = OUTBOX_HANDLERS.get(event_type)
+            try:
+                if handler is None:
+                    raise ValueError(f"No hay un manejador para el evento '{event_type}'")
+                handler([event.payload for event in typed_events])
+            except Exception as e:
+                for event in typed_events:
+                    event.attempts += 1
+                    event.last_error = str(e)
+                    if event.attempts >= OUTBOX_MAX_ATTEMPTS:
+                        event.status = OutboxStatusEnum.FAILED
+                print(f"⚠️ Error al despachar {len(typed_events)} eventos '{event_type}': {e}")
+            else:
+                for event in typed_events:
+                    event.status = OutboxStatusEnum.PROCESSED
+                    event.processed_at = datetime.utcnow()
+                processed += len(typed_events)
+
+        db.session.commit()
+        return processed
+
+def purge_processed_outbox_events(app, retention_days=OUTBOX_RETENTION_DAYS, batch_size=OUTBOX_PURGE_BATCH_SIZE):
+    """
+    Elimina los eventos procesados hace más de retention_days, por lotes de batch_size con una
+    transacción por lote para no bloquear la tabla mientras el despacho sigue funcionando.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = 0
+    with app.app_context():
+        while True:
+            batch = OutboxRepository.delete_processed_before(cutoff, batch_size)
+            db.session.commit()
+            deleted += batch
+            if batch < batch_size:
+                break
+    if deleted:
+        print(f"✅ Se eliminaron {deleted} eventos procesados del outbox")
+    return deleted
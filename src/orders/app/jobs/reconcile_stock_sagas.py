@@ -0,0 +1,33 @@
+import os
+from app.core.database import db
+from app.repositories.stock_saga_repository import StockSagaRepository
+from app.utils.product_info_util import release_products_stock
+
+# Una saga pendiente más antigua que esto ya no la terminará la petición que la creó
+STOCK_SAGA_TIMEOUT_SECONDS = int(os.getenv("STOCK_SAGA_TIMEOUT_SECONDS", "300"))
+STOCK_SAGA_BATCH_SIZE = int(os.getenv("STOCK_SAGA_BATCH_SIZE", "100"))
+
+def reconcile_stock_sagas(app, batch_size=STOCK_SAGA_BATCH_SIZE):
+    """
+    Devuelve el stock de los pedidos que no se guardaron: sagas cuya compensación falló y sagas
+    pendientes de un proceso que se detuvo. Se liberan por lotes en una sola petición al servicio
+    de productos, que ignora las referencias ya liberadas. Si la petición falla se reintenta
+    en la siguiente ejecución.
+    """
+    with app.app_context():
+        sagas = StockSagaRepository.get_unfinished_batch(STOCK_SAGA_TIMEOUT_SECONDS, batch_size)
+        if not sagas:
+            db.session.commit()
+            return 0
+
+        saga_ids = [saga.id for saga in sagas]
+        if release_products_stock(saga_ids):
+            StockSagaRepository.delete_compensated(saga_ids)
+            print(f"✅ Stock devuelto para {len(saga_ids)} pedidos que no se guardaron")
+            return len(saga_ids)
+
+        for saga in sagas:
+            saga.attempts += 1
+            saga.last_error = "No se pudo devolver el stock en el servicio de productos"
+        db.session.commit()
+        return 0
@@ -0,0 +1,20 @@
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import db
+
+class IdempotencyKey(db.Model):
+    """
+    Llave Idempotency-Key enviada al crear un pedido y la respuesta que se retornó.
+    Sin respuesta indica que la petición original todavía está en proceso.
+    """
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_id_key'),
+    )
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    user_id = db.Column(UUID(as_uuid=True), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=True)
+    response = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
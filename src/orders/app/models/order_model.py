@@ -12,10 +12,16 @@ class OrderStateEnum(enum.Enum):
 
 class Order(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        # Soporta la paginación por cursor de los pedidos de un cliente
+        db.Index('ix_orders_customer_id_created_at_id', 'customer_id', 'created_at', 'id'),
+        # Soporta la búsqueda de pedidos vencidos del job auto_update_delivered_orders
+        db.Index('ix_orders_state_delivery_date', 'state', 'delivery_date'),
+    )
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=db.text("gen_random_uuid()"), unique=True, nullable=False)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=db.text("gen_random_uuid()"), nullable=False)
     customer_id = db.Column(UUID(as_uuid=True), nullable=False)
-    seller_id = db.Column(UUID(as_uuid=True), nullable=True, default=None)
+    seller_id = db.Column(UUID(as_uuid=True), nullable=True, default=None, index=True)
     state = db.Column(db.Enum(OrderStateEnum), nullable=False, default=OrderStateEnum.PREPARING)
     total_amount = db.Column(db.Float, nullable=False)
     delivery_date = db.Column(db.DateTime, nullable=False)
@@ -7,24 +7,39 @@ from app.utils.product_info_util import get_product_info
 class OrderProducts(db.Model):
     __tablename__ = 'order_products'
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=db.text("gen_random_uuid()"), unique=True, nullable=False)
-    order_id = db.Column(UUID(as_uuid=True),  db.ForeignKey('orders.id'), nullable=False)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=db.text("gen_random_uuid()"), nullable=False)
+    order_id = db.Column(UUID(as_uuid=True),  db.ForeignKey('orders.id'), nullable=False, index=True)
     product_id = db.Column(UUID(as_uuid=True), nullable=False) 
     quantity_ordered = db.Column(db.Integer, nullable=False)
     amount = db.Column(db.Float, nullable=False)
 
+    # Copia de los datos del producto al momento de crear el pedido, evita consultar el servicio de productos
+    product_name = db.Column(db.String(120), nullable=True)
+    product_image_url = db.Column(db.String(255), nullable=True)
+    unit_price = db.Column(db.Float, nullable=True)
+
     def __init__(self,
                 order_id,
                 product_id,
                 quantity_ordered,
-                amount):
+                amount,
+                product_name=None,
+                product_image_url=None,
+                unit_price=None):
         self.order_id = order_id
         self.product_id = product_id
         self.quantity_ordered = quantity_ordered
         self.amount = amount
+        self.product_name = product_name
+        self.product_image_url = product_image_url
+        self.unit_price = unit_price
         
         super().__init__()
 
+    @property
+    def has_snapshot(self):
+        return self.product_name is not None
+
 class OrderProductsSchema(ma.Schema):
     product = fields.Method("get_product")
     class Meta:
@@ -33,8 +48,17 @@ class OrderProductsSchema(ma.Schema):
         fields = ('id', 'order_id', 'product_id', 'quantity_ordered', 'amount')
 
     def get_product(self, obj):
+        if obj.has_snapshot:
+            return {
+                "data": {
+                    "id": str(obj.product_id),
+                    "name": obj.product_name,
+                    "image_url": obj.product_image_url,
+                    "unit_amount": obj.unit_price
+                }
+            }
         product = get_product_info(obj.product_id)
         if product and isinstance(product, dict): 
             return product
         else:
-            return {"error": "No se pudo obtener la información del producto"}
\ No newline at end of file
+            return {"error": "No se pudo obtener la información del producto"}
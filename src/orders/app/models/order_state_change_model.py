@@ -0,0 +1,31 @@
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import db
+from app.models.order_model import OrderStateEnum
+
+class OrderStateChange(db.Model):
+    """
+    Registro de solo inserción con cada cambio de estado de un pedido. El id creciente
+    es el cursor con el que los clientes consultan los cambios posteriores.
+    """
+    __tablename__ = 'order_state_changes'
+    __table_args__ = (
+        db.Index('ix_order_state_changes_customer_id_id', 'customer_id', 'id'),
+        db.Index('ix_order_state_changes_seller_id_id', 'seller_id', 'id'),
+    )
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    order_id = db.Column(UUID(as_uuid=True), db.ForeignKey('orders.id'), nullable=False)
+    customer_id = db.Column(UUID(as_uuid=True), nullable=False)
+    seller_id = db.Column(UUID(as_uuid=True), nullable=True)
+    from_state = db.Column(db.Enum(OrderStateEnum), nullable=True)
+    to_state = db.Column(db.Enum(OrderStateEnum), nullable=False)
+    changed_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+
+    def __init__(self, order_id, customer_id, to_state, from_state=None, seller_id=None):
+        self.order_id = order_id
+        self.customer_id = customer_id
+        self.seller_id = seller_id
+        self.from_state = from_state
+        self.to_state = to_state
+
+        super().__init__()
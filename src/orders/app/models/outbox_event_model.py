@@ -0,0 +1,29 @@
+import enum
+from app.core.database import db
+
+INVENTORY_UPDATE_EVENT = "inventory_update"
+
+class OutboxStatusEnum(enum.Enum):
+    PENDING = "PENDING"
+    PROCESSED = "PROCESSED"
+    FAILED = "FAILED"
+
+class OutboxEvent(db.Model):
+    __tablename__ = 'outbox_events'
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    event_type = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.Enum(OutboxStatusEnum), nullable=False, default=OutboxStatusEnum.PENDING, index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+    def __init__(self, event_type, payload):
+        self.event_type = event_type
+        self.payload = payload
+        self.status = OutboxStatusEnum.PENDING
+        self.attempts = 0
+
+        super().__init__()
@@ -0,0 +1,34 @@
+import enum
+import uuid
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import db
+
+class StockSagaStatusEnum(enum.Enum):
+    # El descuento se envió (o está por enviarse) y el pedido aún no se guarda
+    PENDING = "PENDING"
+    # La creación del pedido falló y falta devolver el stock
+    COMPENSATING = "COMPENSATING"
+
+class StockSaga(db.Model):
+    """
+    Descuento de stock en curso durante la creación de un pedido. Su id es la referencia con la
+    que el servicio de productos identifica el descuento. La fila se borra en la misma transacción
+    que guarda el pedido, o cuando el stock se devuelve; las que quedan las compensa
+    el job reconcile_stock_sagas.
+    """
+    __tablename__ = 'stock_sagas'
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    items = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.Enum(StockSagaStatusEnum), nullable=False, default=StockSagaStatusEnum.PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+
+    def __init__(self, items):
+        self.id = uuid.uuid4()
+        self.items = items
+        self.status = StockSagaStatusEnum.PENDING
+        self.attempts = 0
+
+        super().__init__()
@@ -0,0 +1,62 @@
+from datetime import timedelta
+from sqlalchemy import update, delete, or_, and_, null
+from sqlalchemy.dialects.postgresql import insert
+from app.models.idempotency_key_model import IdempotencyKey
+from app.core.database import db
+
+class IdempotencyKeyRepository:
+
+    @staticmethod
+    def claim(user_id, key, request_hash, ttl_hours, lease_seconds):
+        """
+        Reserva la llave para una petición nueva y retorna el id del registro, o None si la
+        llave ya existe. Se reutiliza una llave vencida o una reserva sin respuesta de más de
+        lease_seconds (la petición original terminó sin completarla ni liberarla).
+        Al reutilizarla el registro recibe un id nuevo, así la petición original ya no puede
+        completarla. Se confirma de inmediato para que un reintento simultáneo encuentre la reserva.
+        """
+        table = IdempotencyKey.__table__
+        statement = insert(IdempotencyKey).values(user_id=user_id, key=key, request_hash=request_hash)
+        statement = statement.on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+            set_={
+                "id": db.func.nextval(db.func.pg_get_serial_sequence(IdempotencyKey.__tablename__, "id")),
+                "request_hash": statement.excluded.request_hash,
+                "status_code": None,
+                "response": null(),
+                "created_at": db.func.now()
+            },
+            where=or_(
+                table.c.created_at < db.func.now() - timedelta(hours=ttl_hours),
+                and_(table.c.response.is_(None), table.c.created_at < db.func.now() - timedelta(seconds=lease_seconds))
+            )
+        ).returning(IdempotencyKey.id)
+        record_id = db.session.execute(statement).scalar()
+        db.session.commit()
+        return record_id
+
+    @staticmethod
+    def get(user_id, key):
+        return IdempotencyKey.query.filter_by(user_id=user_id, key=key).first()
+
+    @staticmethod
+    def complete(record_id, status_code, response):
+        """
+        Guarda la respuesta en la transacción en curso, junto con el pedido creado.
+        Retorna False si la reserva ya no existe porque otra petición la reutilizó.
+        """
+        result = db.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.id == record_id, IdempotencyKey.response.is_(None))
+            .values(status_code=status_code, response=response)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def release(record_id):
+        """
+        Libera la llave cuando la petición falla, para que el cliente pueda reintentar.
+        """
+        db.session.rollback()
+        db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.id == record_id))
+        db.session.commit()
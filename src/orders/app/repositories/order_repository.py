@@ -1,3 +1,5 @@
+from sqlalchemy import tuple_
+from sqlalchemy.orm import selectinload
 from app.models.order_model import Order
 from app.core.database import db
 
@@ -6,6 +8,18 @@ class OrderRepository:
     def get_all():
         return Order.query.all()
 
+    @staticmethod
+    def get_page_by_customer(customer_id, limit, after=None):
+        """
+        Pedidos del cliente del más reciente al más antiguo, paginados por (created_at, id).
+        after es la posición del último pedido de la página anterior. Se lee un registro de más
+        para saber si existe una página siguiente sin contar el total.
+        """
+        query = Order.query.options(selectinload(Order.items)).filter(Order.customer_id == customer_id)
+        if after is not None:
+            query = query.filter(tuple_(Order.created_at, Order.id) < tuple_(*after))
+        return query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1).all()
+
     @staticmethod
     def get_by_id(order_id):
         return Order.query.get(order_id)
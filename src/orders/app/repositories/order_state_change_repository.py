@@ -0,0 +1,40 @@
+from datetime import timedelta
+from sqlalchemy import insert
+from app.models.order_state_change_model import OrderStateChange
+from app.core.database import db
+
+class OrderStateChangeRepository:
+
+    @staticmethod
+    def add_change(change: OrderStateChange):
+        """
+        Agrega el cambio a la sesión actual, se persiste en la misma transacción que el pedido.
+        """
+        db.session.add(change)
+        return change
+
+    @staticmethod
+    def add_changes(changes):
+        """
+        Inserta varios cambios en una sola sentencia. changes es una lista de diccionarios
+        con las columnas de OrderStateChange.
+        """
+        if changes:
+            db.session.execute(insert(OrderStateChange), changes)
+
+    @staticmethod
+    def get_changes_since(since_id, limit, settle_seconds, customer_id=None, seller_id=None):
+        """
+        Cambios con id mayor a since_id en orden de id, leyendo uno de más para saber si hay
+        más páginas. Se omiten los cambios de los últimos settle_seconds: un id menor puede
+        confirmarse después que uno mayor, y sin esa espera el cliente lo saltaría.
+        """
+        query = OrderStateChange.query.filter(
+            OrderStateChange.id > since_id,
+            OrderStateChange.changed_at <= db.func.now() - timedelta(seconds=settle_seconds)
+        )
+        if customer_id is not None:
+            query = query.filter(OrderStateChange.customer_id == customer_id)
+        if seller_id is not None:
+            query = query.filter(OrderStateChange.seller_id == seller_id)
+        return query.order_by(OrderStateChange.id).limit(limit + 1).all()
@@ -0,0 +1,40 @@
+from app.models.outbox_event_model import OutboxEvent, OutboxStatusEnum
+from sqlalchemy import delete, select
+from app.core.database import db
+
+class OutboxRepository:
+
+    @staticmethod
+    def add_event(event: OutboxEvent):
+        """
+        Agrega el evento a la sesión actual, se persiste en la misma transacción que el pedido.
+        """
+        db.session.add(event)
+        return event
+
+    @staticmethod
+    def get_pending_batch(limit):
+        """
+        Bloquea un lote de eventos pendientes. SKIP LOCKED permite que varias réplicas
+        despachen en paralelo sin procesar dos veces el mismo evento.
+        """
+        return OutboxEvent.query \
+            .filter(OutboxEvent.status == OutboxStatusEnum.PENDING) \
+            .order_by(OutboxEvent.id) \
+            .limit(limit) \
+            .with_for_update(skip_locked=True) \
+            .all()
+
+    @staticmethod
+    def delete_processed_before(cutoff, limit):
+        """
+        Elimina hasta limit eventos procesados antes de cutoff, los más antiguos primero, y retorna
+        cuántos eliminó. Los eventos FAILED se conservan para revisarlos.
+        """
+        ids = select(OutboxEvent.id) \
+            .where(OutboxEvent.status == OutboxStatusEnum.PROCESSED, OutboxEvent.processed_at < cutoff) \
+            .order_by(OutboxEvent.id) \
+            .limit(limit) \
+            .with_for_update(skip_locked=True) \
+            .scalar_subquery()
+        return db.session.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids))).rowcount
@@ -0,0 +1,60 @@
+from datetime import timedelta
+from sqlalchemy import delete, update, or_
+from app.models.stock_saga_model import StockSaga, StockSagaStatusEnum
+from app.core.database import db
+
+class StockSagaRepository:
+
+    @staticmethod
+    def start(saga: StockSaga):
+        """
+        Registra la saga antes de descontar el stock. Se confirma de inmediato para que el
+        reconciliador la encuentre si el proceso se detiene a mitad de la creación del pedido.
+        """
+        # El id se lee antes del commit: después la instancia expira y leerlo abriría otra transacción
+        saga_id = saga.id
+        db.session.add(saga)
+        db.session.commit()
+        return saga_id
+
+    @staticmethod
+    def complete(saga_id):
+        """
+        Borra la saga en la transacción que guarda el pedido. Retorna False si ya no estaba
+        pendiente, es decir, si el reconciliador ya devolvió el stock.
+        """
+        result = db.session.execute(
+            delete(StockSaga).where(StockSaga.id == saga_id, StockSaga.status == StockSagaStatusEnum.PENDING)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def mark_compensating(saga_id, error):
+        db.session.execute(
+            update(StockSaga)
+            .where(StockSaga.id == saga_id)
+            .values(status=StockSagaStatusEnum.COMPENSATING, attempts=StockSaga.attempts + 1, last_error=error)
+        )
+        db.session.commit()
+
+    @staticmethod
+    def delete_compensated(saga_ids):
+        db.session.execute(delete(StockSaga).where(StockSaga.id.in_(saga_ids)))
+        db.session.commit()
+
+    @staticmethod
+    def get_unfinished_batch(timeout_seconds, limit):
+        """
+        Bloquea un lote de sagas por compensar: las que fallaron y las pendientes más antiguas
+        que timeout_seconds (el proceso que las creó ya no las terminará). Mientras una saga
+        pendiente está bloqueada, la creación del pedido espera y luego ve que ya no está pendiente.
+        """
+        return StockSaga.query \
+            .filter(or_(
+                StockSaga.status == StockSagaStatusEnum.COMPENSATING,
+                StockSaga.created_at < db.func.now() - timedelta(seconds=timeout_seconds)
+            )) \
+            .order_by(StockSaga.created_at) \
+            .limit(limit) \
+            .with_for_update(skip_locked=True) \
+            .all()
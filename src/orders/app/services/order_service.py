@@ -1,16 +1,35 @@
+import os
+import json
 import uuid
+import hashlib
 from app.repositories.order_repository import OrderRepository
 from app.repositories.order_product_repository import OrderProductRepository
-from app.exceptions.http_exceptions import BadRequestError, NotFoundError
+from app.exceptions.http_exceptions import BadRequestError, NotFoundError, ConflictError
 from app.models.order_model import Order
 from app.models.order_product_model import OrderProducts
 from app.utils.delivery_date_util import get_delivery_date
-from app.utils.product_info_util import get_product_info, update_product_quantity
+from app.utils.product_info_util import get_products_info, decrement_products_stock, release_products_stock, PRODUCT_CACHE_STOCK_CHECK
+from app.utils.pagination_util import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.database import db
-from ..websockets.inventory_websocket import notify_inventory_update
+from app.repositories.outbox_repository import OutboxRepository
+from app.models.outbox_event_model import OutboxEvent, INVENTORY_UPDATE_EVENT
+from app.models.order_state_change_model import OrderStateChange
+from app.repositories.order_state_change_repository import OrderStateChangeRepository
+from app.repositories.idempotency_key_repository import IdempotencyKeyRepository
+from app.models.stock_saga_model import StockSaga
+from app.repositories.stock_saga_repository import StockSagaRepository
 
 
+# Segundos que se espera antes de publicar un cambio en /orders/changes
+CHANGE_FEED_SETTLE_SECONDS = int(os.getenv("CHANGE_FEED_SETTLE_SECONDS", "5"))
+# Horas durante las que un reintento con la misma Idempotency-Key recibe la respuesta guardada
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+# Segundos tras los que una petición sin respuesta se considera abandonada y su llave se puede reutilizar
+IDEMPOTENCY_KEY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_KEY_LEASE_SECONDS", "120"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_KEY_IN_PROGRESS_MESSAGE = "Hay una petición con la misma llave de idempotencia en proceso"
+
 def validate_uuid(id):
     try:
         uuid.UUID(id, version=4)
@@ -18,6 +37,101 @@ def validate_uuid(id):
     except ValueError:
         return False
 
+def apply_stock_decrement(validated_items, saga_id=None):
+    """
+    Descuenta en una sola petición el stock de todos los productos del pedido.
+    Si algún producto no tiene stock suficiente no se descuenta ninguno y se lanza un error.
+    Retorna un diccionario {product_id: nueva cantidad}.
+    """
+    result = decrement_products_stock(validated_items, reference=saga_id)
+    if not result:
+        raise BadRequestError("No fue posible actualizar el inventario de los productos. Inténtalo de nuevo.")
+
+    stock_by_product = {item["product_id"]: item for item in result.get("items", [])}
+    if not result.get("applied"):
+        for item in validated_items:
+            if not stock_by_product.get(str(item["product_id"]).lower(), {}).get("success"):
+                raise BadRequestError(f"No hay suficiente cantidad del producto {item['name']} en stock")
+        raise BadRequestError("No fue posible actualizar el inventario de los productos. Inténtalo de nuevo.")
+
+    return {
+        item["product_id"]: stock_by_product[str(item["product_id"]).lower()]["quantity"]
+        for item in validated_items
+    }
+
+def start_stock_saga(validated_items):
+    """
+    Registra el descuento de stock que se va a enviar, su id es la referencia del descuento
+    en el servicio de productos.
+    """
+    try:
+        return StockSagaRepository.start(StockSaga([
+            {"product_id": str(item["product_id"]), "quantity": item["quantity_ordered"]}
+            for item in validated_items
+        ]))
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise BadRequestError("Ocurrió un error al crear la orden. Inténtalo de nuevo.")
+
+def complete_stock_saga(saga_id):
+    # Se llama dentro de la transacción del pedido: si el reconciliador ya devolvió el stock el pedido no se guarda
+    if not StockSagaRepository.complete(saga_id):
+        raise BadRequestError("La reserva de stock del pedido expiró. Inténtalo de nuevo.")
+
+def compensate_stock_saga(saga_id, error):
+    """
+    Devuelve el stock descontado para un pedido que no se pudo guardar. Si el servicio de productos
+    no responde, la saga queda marcada y el job reconcile_stock_sagas lo reintenta.
+    """
+    try:
+        db.session.rollback()
+        if release_products_stock([saga_id]):
+            StockSagaRepository.delete_compensated([saga_id])
+        else:
+            StockSagaRepository.mark_compensating(saga_id, str(error))
+    except SQLAlchemyError as e:
+        # La saga sigue pendiente, el reconciliador la compensa al vencer
+        db.session.rollback()
+        print(f"⚠️ No se pudo registrar la compensación del descuento {saga_id}: {e}")
+
+def hash_order_request(order_data):
+    return hashlib.sha256(json.dumps(order_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def run_idempotent(user_id, idempotency_key, order_data, create):
+    """
+    Ejecuta create(record_id) una sola vez por llave Idempotency-Key. Un reintento con la misma
+    llave y la misma petición recibe la respuesta guardada sin consultar otros servicios.
+    Sin llave se ejecuta create(None) como antes.
+    """
+    if idempotency_key is None:
+        return create(None)
+    if not idempotency_key.strip() or len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise BadRequestError(f"El encabezado 'Idempotency-Key' debe tener entre 1 y {IDEMPOTENCY_KEY_MAX_LENGTH} caracteres")
+
+    request_hash = hash_order_request(order_data)
+    try:
+        record_id = IdempotencyKeyRepository.claim(user_id, idempotency_key, request_hash, IDEMPOTENCY_KEY_TTL_HOURS,
+                                                   IDEMPOTENCY_KEY_LEASE_SECONDS)
+        if record_id is None:
+            record = IdempotencyKeyRepository.get(user_id, idempotency_key)
+            db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise BadRequestError("Ocurrió un error al crear la orden. Inténtalo de nuevo.")
+
+    if record_id is None:
+        if record is None or record.request_hash != request_hash:
+            raise ConflictError("La llave de idempotencia ya se usó con una petición diferente")
+        if record.response is None:
+            raise ConflictError(IDEMPOTENCY_KEY_IN_PROGRESS_MESSAGE)
+        return record.response
+
+    try:
+        return create(record_id)
+    except Exception:
+        IdempotencyKeyRepository.release(record_id)
+        raise
+
 class OrderService:
     @staticmethod
     def get_all():
@@ -38,7 +152,12 @@ class OrderService:
         return order
 
     @staticmethod
-    def create_order(customer_id, order_data):
+    def create_order(customer_id, order_data, idempotency_key=None):
+        return run_idempotent(customer_id, idempotency_key, order_data,
+                              lambda record_id: OrderService.place_order(customer_id, order_data, record_id))
+
+    @staticmethod
+    def place_order(customer_id, order_data, idempotency_record_id=None):
         if not order_data.get("date"):
              raise BadRequestError("El campo 'date' es obligatorio")
         if not order_data.get("items") or not isinstance(order_data.get("items"), list):
@@ -46,72 +165,113 @@ class OrderService:
         
         validated_items, total_amount, summary = OrderService.validate_products(order_data["items"])
 
+        # El descuento queda registrado como saga: si el pedido no se guarda se devuelve el stock
+        saga_id = start_stock_saga(validated_items)
         try:
+            # El stock se reserva antes de abrir la transacción para no mantenerla abierta durante la llamada remota
+            apply_stock_decrement(validated_items, saga_id)
+
             with db.session.begin():
+                complete_stock_saga(saga_id)
                 order = Order(
                     customer_id=customer_id,
                     total_amount=total_amount,
                     delivery_date=get_delivery_date(order_data["date"])
                 )
                 order_created = OrderRepository.create_order(order)
+                OrderStateChangeRepository.add_change(
+                    OrderStateChange(order_created.id, order_created.customer_id, order_created.state)
+                )
 
                 for item in validated_items:
                     order_product = OrderProducts(
                         order_id=order_created.id,
                         product_id=item["product_id"],
                         quantity_ordered=item["quantity_ordered"],
-                        amount=item["amount"]
+                        amount=item["amount"],
+                        product_name=item["name"],
+                        product_image_url=item["image_url"],
+                        unit_price=item["price"]
                     )
                     OrderProductRepository.create_order_product(order_product)
 
-                    update_product_quantity(item["product_id"], item["quantity"] - item["quantity_ordered"])
+                # La respuesta se guarda con el pedido para retornarla en los reintentos con la misma llave
+                response = {
+                    "order_id": str(order_created.id),
+                    "summary": ", ".join(summary[:3]) + ("..." if len(summary) > 3 else ""),
+                    "date": order_created.delivery_date.strftime("%Y-%m-%d"),
+                    "total": total_amount,
+                    "status": order_created.state.value,
+                    "items": [
+                        {
+                            "title": item["name"],
+                            "quantity": item["quantity_ordered"],
+                            "price": item["amount"],
+                            "image_url": item["image_url"]
+                        }
+                        for item in validated_items
+                    ]
+                }
+                if idempotency_record_id is not None and not IdempotencyKeyRepository.complete(idempotency_record_id, 201, response):
+                    raise ConflictError(IDEMPOTENCY_KEY_IN_PROGRESS_MESSAGE)
 
         except SQLAlchemyError as e:
             db.session.rollback()
+            compensate_stock_saga(saga_id, e)
             raise BadRequestError("Ocurrió un error al crear la orden. Inténtalo de nuevo.")
-        
-        response = {
-            "order_id": str(order_created.id),
-            "summary": ", ".join(summary[:3]) + ("..." if len(summary) > 3 else ""),
-            "date": order_created.delivery_date.strftime("%Y-%m-%d"),
-            "total": total_amount,
-            "status": order_created.state.value,
-            "items": [
-                {
-                    "title": item["name"],
-                    "quantity": item["quantity_ordered"],
-                    "price": item["amount"],
-                    "image_url": item["image_url"]
-                }
-                for item in validated_items
-            ]
-        }
+        except Exception as e:
+            compensate_stock_saga(saga_id, e)
+            raise
 
-        return response        
+        return response
     
     @staticmethod
-    def get_orders_by_customer(customer_id):
+    def get_orders_by_customer(customer_id, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        Retorna una página de pedidos del cliente y el cursor de la página siguiente (None si es la última).
+        """
         if not validate_uuid(customer_id):
             raise BadRequestError("El id del cliente no es válido")
-              
-        orders = Order.query.filter(Order.customer_id == customer_id).all()
+
+        orders = OrderRepository.get_page_by_customer(customer_id, limit, after=decode_cursor(cursor))
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+
+        # Solo se consultan al servicio de productos las líneas creadas antes de guardar la copia del producto
+        # Es una consulta de solo lectura: usa el caché de productos y, si el servicio de productos
+        # no responde, la última información conocida
+        products_info = get_products_info((
+            order_product.product_id
+            for order in orders
+            for order_product in order.items
+            if not order_product.has_snapshot
+        ), allow_stale=True, cached=True)
         result = []
 
         for order in orders:
             items = []
             summary = []
             for order_product in order.items:
-                product_info = get_product_info(order_product.product_id)
-                if product_info and product_info.get("data"):
-                    product_name = product_info["data"].get("name")
-                    if product_name:
-                        summary.append(product_name)
-                    items.append({
-                        "title": product_name,
-                        "quantity": order_product.quantity_ordered,
-                        "price": order_product.amount,
-                        "image_url": product_info["data"].get("image_url")
-                    })
+                if order_product.has_snapshot:
+                    product_name = order_product.product_name
+                    image_url = order_product.product_image_url
+                else:
+                    product_info = products_info.get(str(order_product.product_id))
+                    if not product_info:
+                        continue
+                    product_name = product_info.get("name")
+                    image_url = product_info.get("image_url")
+
+                if product_name:
+                    summary.append(product_name)
+                items.append({
+                    "title": product_name,
+                    "quantity": order_product.quantity_ordered,
+                    "price": order_product.amount,
+                    "image_url": image_url
+                })
 
             result.append({
                 "order_id": str(order.id),
@@ -122,7 +282,47 @@ class OrderService:
                 "items": items
             })
 
-        return result    
+        return result, next_cursor
+
+    @staticmethod
+    def get_state_changes(since, limit, customer_id=None, seller_id=None):
+        """
+        Cambios de estado posteriores al cursor since, agrupados por pedido con su último estado.
+        Retorna los pedidos cambiados y el cursor para la siguiente consulta.
+        """
+        if since is None or since == "":
+            since_id = 0
+        else:
+            try:
+                since_id = int(since)
+            except ValueError:
+                raise BadRequestError("El cursor 'since' no es válido")
+            if since_id < 0:
+                raise BadRequestError("El cursor 'since' no es válido")
+
+        changes = OrderStateChangeRepository.get_changes_since(
+            since_id, limit, CHANGE_FEED_SETTLE_SECONDS, customer_id=customer_id, seller_id=seller_id
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        # Si un pedido cambió varias veces en la página solo se retorna su último estado
+        latest_by_order = {}
+        for change in changes:
+            latest_by_order.pop(change.order_id, None)
+            latest_by_order[change.order_id] = change
+
+        orders = [
+            {
+                "order_id": str(change.order_id),
+                "status": change.to_state.value,
+                "previous_status": change.from_state.value if change.from_state else None,
+                "changed_at": change.changed_at.isoformat()
+            }
+            for change in latest_by_order.values()
+        ]
+        next_since = str(changes[-1].id) if changes else str(since_id)
+        return orders, next_since, has_more
     
     @staticmethod
     def validate_products(items):
@@ -142,15 +342,22 @@ class OrderService:
             if not isinstance(quantity, int) or quantity <= 0:
                 raise BadRequestError("La cantidad debe ser un número entero positivo")
 
-            product_info = get_product_info(str(product_id))
+        # Se consulta la información de todos los productos en una sola petición
+        products_info = get_products_info([product_data["id"] for product_data in items], cached=PRODUCT_CACHE_STOCK_CHECK)
+
+        for product_data in items:
+            product_id = product_data["id"]
+            quantity = product_data["quantity"]
+
+            product_info = products_info.get(str(product_id).lower())
             if not product_info:
                 raise NotFoundError(f"Producto con ID {product_id} no encontrado")
             
-            product_quantity = product_info["data"].get("quantity", 0)
+            product_quantity = product_info.get("quantity", 0)
             if product_quantity - quantity < 0:
-                raise BadRequestError(f"No hay suficiente cantidad del producto {product_info['data'].get('name')} en stock")
+                raise BadRequestError(f"No hay suficiente cantidad del producto {product_info.get('name')} en stock")
 
-            product_price = product_info["data"].get("unit_amount", 0.0)
+            product_price = product_info.get("unit_amount", 0.0)
             amount = product_price * quantity
             total_amount += amount
 
@@ -159,20 +366,25 @@ class OrderService:
                 "quantity": product_quantity,
                 "quantity_ordered": quantity,
                 "amount": amount,
-                "name": product_info["data"].get("name"),
-                "image_url": product_info["data"].get("image_url"),
+                "name": product_info.get("name"),
+                "image_url": product_info.get("image_url"),
                 "price": product_price,
-                "description": product_info["data"].get("description"),
-                "category_id": product_info["data"].get("category_id")
+                "description": product_info.get("description"),
+                "category_id": product_info.get("category_id")
             })
 
-            if product_info["data"].get("name"):
-                summary.append(product_info["data"].get("name"))
+            if product_info.get("name"):
+                summary.append(product_info.get("name"))
 
         return validated_items, total_amount, summary
     
     @staticmethod
-    def create_order_seller(seller_id, order_data):
+    def create_order_seller(seller_id, order_data, idempotency_key=None):
+        return run_idempotent(seller_id, idempotency_key, order_data,
+                              lambda record_id: OrderService.place_order_seller(seller_id, order_data, record_id))
+
+    @staticmethod
+    def place_order_seller(seller_id, order_data, idempotency_record_id=None):
         if not order_data.get("date"):
             raise BadRequestError("El campo 'date' es obligatorio")
         if not order_data.get("customer_id"):
@@ -183,10 +395,15 @@ class OrderService:
             raise BadRequestError("La petición debe contener una lista de productos válida")
         
         validated_items, total_amount, summary = OrderService.validate_products(order_data["items"])
-        notifiable_updates = []
 
+        # El descuento queda registrado como saga: si el pedido no se guarda se devuelve el stock
+        saga_id = start_stock_saga(validated_items)
         try:
+            # El stock se reserva antes de abrir la transacción para no mantenerla abierta durante la llamada remota
+            new_quantities = apply_stock_decrement(validated_items, saga_id)
+
             with db.session.begin():
+                complete_stock_saga(saga_id)
                 order = Order(
                     customer_id=order_data["customer_id"],
                     seller_id=seller_id,
@@ -194,50 +411,61 @@ class OrderService:
                     delivery_date=get_delivery_date(order_data["date"])
                 )
                 order_created = OrderRepository.create_order(order)
+                OrderStateChangeRepository.add_change(
+                    OrderStateChange(order_created.id, order_created.customer_id, order_created.state, seller_id=seller_id)
+                )
 
                 for item in validated_items:
                     order_product = OrderProducts(
                         order_id=order_created.id,
                         product_id=item["product_id"],
                         quantity_ordered=item["quantity_ordered"],
-                        amount=item["amount"]
+                        amount=item["amount"],
+                        product_name=item["name"],
+                        product_image_url=item["image_url"],
+                        unit_price=item["price"]
                     )
                     OrderProductRepository.create_order_product(order_product)
 
-                    new_quantity = item["quantity"] - item["quantity_ordered"]
-                    update_product_quantity(item["product_id"], new_quantity)
-
-                    # Guarda la información de los productos actualizados para notificar después del commit a la BD
-                    notifiable_updates.append({
-                        "product_id": item["product_id"],
+                # La notificación a los vendedores se guarda en el outbox dentro de la misma transacción,
+                # el job dispatch_outbox_events la envía después del commit
+                OutboxRepository.add_event(OutboxEvent(INVENTORY_UPDATE_EVENT, [
+                    {
+                        "product_id": str(item["product_id"]),
                         "name": item["name"],
-                        "new_quantity": new_quantity,
+                        "new_quantity": new_quantities[item["product_id"]],
                         "category": item["category_id"]
-                    })
+                    }
+                    for item in validated_items
+                ]))
+
+                # La respuesta se guarda con el pedido para retornarla en los reintentos con la misma llave
+                response = {
+                    "order_id": str(order_created.id),
+                    "summary": ", ".join(summary[:3]) + ("..." if len(summary) > 3 else ""),
+                    "date": order_created.delivery_date.strftime("%Y-%m-%d"),
+                    "total": total_amount,
+                    "status": order_created.state.value,
+                    "items": [
+                        {
+                            "title": item["name"],
+                            "quantity": item["quantity_ordered"],
+                            "price": item["amount"],
+                            "image_url": item["image_url"],
+                            "description": item["description"]
+                        }
+                        for item in validated_items
+                    ]
+                }
+                if idempotency_record_id is not None and not IdempotencyKeyRepository.complete(idempotency_record_id, 201, response):
+                    raise ConflictError(IDEMPOTENCY_KEY_IN_PROGRESS_MESSAGE)
 
         except SQLAlchemyError as e:
             db.session.rollback()
+            compensate_stock_saga(saga_id, e)
             raise BadRequestError(f"Ocurrió un error al crear la orden. Inténtalo de nuevo. Error: {str(e)}")
-        
-        # Se notifica a los vendedores sobre el cambio en el inventario
-        notify_inventory_update(notifiable_updates)
-
-        response = {
-            "order_id": str(order_created.id),
-            "summary": ", ".join(summary[:3]) + ("..." if len(summary) > 3 else ""),
-            "date": order_created.delivery_date.strftime("%Y-%m-%d"),
-            "total": total_amount,
-            "status": order_created.state.value,
-            "items": [
-                {
-                    "title": item["name"],
-                    "quantity": item["quantity_ordered"],
-                    "price": item["amount"],
-                    "image_url": item["image_url"],
-                    "description": item["description"]
-                }
-                for item in validated_items
-            ]
-        }
+        except Exception as e:
+            compensate_stock_saga(saga_id, e)
+            raise
 
         return response
\ No newline at end of file
@@ -0,0 +1,91 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """El circuito está abierto y la llamada se rechazó sin contactar el servicio."""
+
+class CircuitBreaker:
+    """
+    Corta las llamadas a un servicio que está fallando para no bloquear los workers esperando timeouts.
+
+    - Cerrado: las llamadas pasan; tras failure_threshold fallos consecutivos el circuito se abre.
+    - Abierto: las llamadas fallan de inmediato con CircuitOpenError durante reset_seconds.
+    - Semiabierto: se deja pasar una sola llamada de prueba; si responde se cierra y si falla se vuelve a abrir.
+    """
+
+    def __init__(self, name, failure_threshold, reset_seconds, failure_exceptions=(Exception,)):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failure_exceptions = failure_exceptions
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"✅ Circuito {self.name} cerrado, el servicio volvió a responder")
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"⚠️ Circuito {self.name} abierto tras {self.failures} fallos consecutivos")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def call(self, func, *args, **kwargs):
+        if not self.allow_request():
+            raise CircuitOpenError(f"El circuito {self.name} está abierto")
+        try:
+            result = func(*args, **kwargs)
+        except self.failure_exceptions:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Un error que no es del servicio (por ejemplo de programación) no cuenta como fallo,
+            # pero libera la llamada de prueba para no dejar el circuito semiabierto bloqueado
+            with self._lock:
+                self._probe_in_flight = False
+            raise
+        self.record_success()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.rejected = 0
+            self._probe_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
@@ -0,0 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
+
+def run_concurrently(func, args_list, max_workers):
+    """
+    Ejecuta func sobre cada elemento de args_list con a lo sumo max_workers tareas simultáneas.
+    Bajo gunicorn con eventlet los hilos están parcheados, por lo que cada tarea corre en un greenlet.
+
+    Los resultados se retornan en el mismo orden de args_list. Si alguna tarea falla se espera a que
+    terminen todas y se lanza el error de la primera tarea fallida según ese orden, de modo que el
+    error reportado no depende de cuál terminó primero.
+    """
+    args_list = list(args_list)
+    if max_workers <= 1 or len(args_list) <= 1:
+        return [func(args) for args in args_list]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(args_list))) as executor:
+        futures = [executor.submit(func, args) for args in args_list]
+
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [future.result() for future in futures]
@@ -0,0 +1,111 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_SIZE = int(os.getenv("HTTP_CLIENT_POOL_SIZE", "20"))
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT", "3"))
+READ_TIMEOUT = float(os.getenv("HTTP_CLIENT_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("HTTP_CLIENT_MAX_RETRIES", "2"))
+BACKOFF_SECONDS = float(os.getenv("HTTP_CLIENT_BACKOFF_SECONDS", "0.2"))
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+def get_session():
+    """
+    Retorna la sesión del proceso actual. Se vuelve a crear si el proceso fue bifurcado
+    (por ejemplo por gunicorn) para no compartir sockets entre workers.
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+                _session_pid = os.getpid()
+    return _session
+
+def _backoff(attempt):
+    # Backoff exponencial con "full jitter" para no sincronizar los reintentos de varios clientes
+    return random.uniform(0, BACKOFF_SECONDS * (2 ** attempt))
+
+def _record(upstream, elapsed, failed, retried):
+    with _metrics_lock:
+        metrics = _metrics.setdefault(upstream, {
+            "requests": 0,
+            "errors": 0,
+            "retries": 0,
+            "total_latency_ms": 0.0,
+            "max_latency_ms": 0.0
+        })
+        latency_ms = elapsed * 1000
+        metrics["requests"] += 1
+        metrics["errors"] += int(failed)
+        metrics["retries"] += int(retried)
+        metrics["total_latency_ms"] += latency_ms
+        metrics["max_latency_ms"] = max(metrics["max_latency_ms"], latency_ms)
+
+def get_metrics():
+    with _metrics_lock:
+        return {
+            upstream: {
+                **metrics,
+                "avg_latency_ms": metrics["total_latency_ms"] / metrics["requests"] if metrics["requests"] else 0.0
+            }
+            for upstream, metrics in _metrics.items()
+        }
+
+def reset_metrics():
+    with _metrics_lock:
+        _metrics.clear()
+
+def request(method, url, upstream=None, idempotent=None, timeout=None, **kwargs):
+    """
+    Ejecuta una petición HTTP con la sesión compartida.
+    Solo se reintentan las peticiones idempotentes (por método o indicadas con idempotent=True)
+    ante errores de conexión, timeouts o respuestas 502/503/504.
+    """
+    method = method.upper()
+    upstream = upstream or urlparse(url).netloc
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    retries = MAX_RETRIES if idempotent else 0
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    for attempt in range(retries + 1):
+        start = time.monotonic()
+        try:
+            response = get_session().request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            _record(upstream, time.monotonic() - start, failed=True, retried=attempt > 0)
+            if attempt == retries:
+                raise
+        else:
+            failed = response.status_code >= 500
+            _record(upstream, time.monotonic() - start, failed=failed, retried=attempt > 0)
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == retries:
+                return response
+        time.sleep(_backoff(attempt))
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
@@ -0,0 +1,42 @@
+import base64
+import json
+import os
+import uuid
+from datetime import datetime
+from app.exceptions.http_exceptions import BadRequestError
+
+DEFAULT_PAGE_SIZE = int(os.getenv("ORDERS_PAGE_SIZE", "20"))
+MAX_PAGE_SIZE = int(os.getenv("ORDERS_MAX_PAGE_SIZE", "100"))
+
+def parse_limit(value):
+    """
+    Tamaño de página solicitado, acotado a MAX_PAGE_SIZE. Sin valor se usa DEFAULT_PAGE_SIZE.
+    """
+    if value is None or value == "":
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise BadRequestError("El parámetro 'limit' debe ser un número entero")
+    if limit < 1:
+        raise BadRequestError("El parámetro 'limit' debe ser mayor a 0")
+    return min(limit, MAX_PAGE_SIZE)
+
+def encode_cursor(created_at, id):
+    """
+    Cursor opaco con la posición (created_at, id) del último pedido de la página.
+    """
+    raw = json.dumps({"created_at": created_at.isoformat(), "id": str(id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    """
+    Retorna la tupla (created_at, id) codificada en el cursor, o None si no se envió.
+    """
+    if not cursor:
+        return None
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return datetime.fromisoformat(position["created_at"]), uuid.UUID(position["id"])
+    except (ValueError, KeyError, TypeError):
+        raise BadRequestError("El cursor de paginación no es válido")
@@ -1,22 +1,207 @@
-import requests
 import os
-from flask import request
+import requests
+from app.utils import http_client
+from flask import request, g
+from app.utils.validate_auth_util import get_auth_header
+from app.utils.concurrency_util import run_concurrently
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.ttl_cache import TTLCache
+from app.exceptions.http_exceptions import ServiceUnavailableError
+
+# Cantidad máxima de ids que acepta el endpoint /products/batch por petición
+PRODUCTS_BATCH_SIZE = 100
+# Máximo de peticiones simultáneas al servicio de productos durante una misma consulta
+PRODUCTS_FETCH_CONCURRENCY = int(os.getenv("PRODUCTS_FETCH_CONCURRENCY", "4"))
+
+PRODUCTS_UNAVAILABLE_MESSAGE = "El servicio de productos no está disponible en este momento. Inténtalo de nuevo más tarde."
+
+class BatchEndpointUnavailable(Exception):
+    """El servicio de productos desplegado aún no expone /products/batch."""
+
+class ProductsServiceError(requests.RequestException):
+    """El servicio de productos respondió con un error 5xx."""
+
+# Fallos consecutivos (errores de conexión, timeouts o 5xx) que abren el circuito y segundos que
+# permanece abierto antes de dejar pasar una petición de prueba
+products_breaker = CircuitBreaker(
+    "products",
+    failure_threshold=int(os.getenv("PRODUCTS_BREAKER_FAILURE_THRESHOLD", "5")),
+    reset_seconds=float(os.getenv("PRODUCTS_BREAKER_RESET_SECONDS", "30")),
+    failure_exceptions=(requests.RequestException,)
+)
+
+# Última información conocida de cada producto. Las consultas de solo lectura (historial de pedidos)
+# la usan mientras el servicio de productos no responde
+last_known_products = TTLCache(
+    max_size=int(os.getenv("PRODUCTS_STALE_CACHE_MAX_SIZE", "10000")),
+    ttl_seconds=int(os.getenv("PRODUCTS_STALE_CACHE_TTL_SECONDS", "86400"))
+)
+
+# Caché de lectura de la información de los productos (nombre, precio, imagen, categoría).
+# Se descarta la entrada de un producto cuando se despacha un evento de inventario suyo
+products_cache = TTLCache(
+    max_size=int(os.getenv("PRODUCT_CACHE_MAX_SIZE", "5000")),
+    ttl_seconds=int(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "60"))
+)
+# La validación de stock al crear un pedido consulta siempre el servicio de productos, salvo que se habilite aquí
+PRODUCT_CACHE_STOCK_CHECK = os.getenv("PRODUCT_CACHE_STOCK_CHECK", "false").lower() == "true"
+
+def remember_products(products):
+    for product_id, product in products.items():
+        products_cache.set(product_id, product)
+        last_known_products.set(product_id, product)
+
+def invalidate_products(product_ids):
+    """
+    Descarta del caché los productos cuyo inventario cambió. Las demás réplicas conservan
+    su copia hasta que vence PRODUCT_CACHE_TTL_SECONDS.
+    """
+    for product_id in product_ids:
+        products_cache.delete(str(product_id).lower())
+
+def products_request(send, path, **kwargs):
+    """
+    Petición al servicio de productos (send es http_client.get o http_client.post) a través del
+    circuit breaker. Con el circuito abierto falla de inmediato con CircuitOpenError; las respuestas
+    5xx cuentan como fallo.
+    """
+    def call():
+        response = send(f"{os.getenv('PATH_API_BASE')}{path}", upstream="products", **kwargs)
+        if response.status_code >= 500:
+            raise ProductsServiceError(f"El servicio de productos respondió HTTP {response.status_code}")
+        return response
+    return products_breaker.call(call)
 
 def get_product_info(id):
-    token = request.headers.get("Authorization")
-    response = requests.get(f"{os.getenv('PATH_API_BASE')}/products/{id}", headers={"Authorization": token})
+    product = products_cache.get(str(id).lower())
+    if product is not None:
+        return {"data": product}
+    try:
+        response = products_request(http_client.get, f"/products/{id}", headers={"Authorization": request.headers.get("Authorization")})
+    except (requests.RequestException, CircuitOpenError) as e:
+        product = last_known_products.get(str(id).lower())
+        if product is None:
+            print(f"⚠️ No se pudo obtener el producto {id}: {e}")
+            return None
+        return {"data": product}
     if response.status_code == 200:
-        return response.json()
+        body = response.json()
+        if body.get("data"):
+            remember_products({str(id).lower(): body["data"]})
+        return body
     return None
 
-def update_product_quantity(id, quantity):
-    token = request.headers.get("Authorization")
-    headers = {"Authorization": token, "Content-Type": "application/json"}
-    body = {"quantity": quantity}
-    response = requests.put(
-        f"{os.getenv('PATH_API_BASE')}/products/{id}/quantity",
-        headers=headers,
-        json=body)
+def fetch_products_batch(ids, token):
+    response = products_request(
+        http_client.post,
+        "/products/batch",
+        idempotent=True,
+        headers={"Authorization": token, "Content-Type": "application/json"},
+        json={"ids": ids})
+    if response.status_code in (404, 405):
+        raise BatchEndpointUnavailable()
     if response.status_code == 200:
-        return response.json()
-    return None
\ No newline at end of file
+        return {str(product["id"]): product for product in response.json().get("data", [])}
+    return {}
+
+def fetch_product(id, token):
+    response = products_request(http_client.get, f"/products/{id}", headers={"Authorization": token})
+    if response.status_code == 200:
+        return response.json().get("data")
+    return None
+
+def get_products_info(ids, allow_stale=False, cached=False):
+    """
+    Obtiene en bloque la información de varios productos y la indexa por id.
+    Los productos ya consultados durante la petición actual se reutilizan (memo en flask.g)
+    y los que no existen simplemente no aparecen en el resultado.
+
+    Los lotes de PRODUCTS_BATCH_SIZE ids se consultan en paralelo (PRODUCTS_FETCH_CONCURRENCY).
+    Si el servicio de productos no expone /products/batch se consulta cada producto por separado,
+    también en paralelo.
+
+    Si el servicio de productos no responde (o el circuito está abierto) se lanza ServiceUnavailableError,
+    salvo con allow_stale=True: las consultas de solo lectura reciben la última información conocida.
+
+    Con cached=True primero se buscan los productos en products_cache; sin él siempre se consulta
+    el servicio de productos (por ejemplo para validar el stock).
+    """
+    product_ids = list(dict.fromkeys(str(id).lower() for id in ids))
+    if not product_ids:
+        return {}
+
+    memo = g.setdefault("products_info", {})
+    found = {product_id: memo[product_id] for product_id in product_ids if product_id in memo}
+    if cached:
+        for product_id in product_ids:
+            if product_id not in found:
+                product = products_cache.get(product_id)
+                if product is not None:
+                    found[product_id] = product
+
+    missing_ids = [product_id for product_id in product_ids if product_id not in found]
+    if missing_ids:
+        # El contexto de la petición no está disponible en los hilos, el token se resuelve antes
+        token = get_auth_header()
+        chunks = [missing_ids[start:start + PRODUCTS_BATCH_SIZE] for start in range(0, len(missing_ids), PRODUCTS_BATCH_SIZE)]
+        try:
+            fetched = {}
+            try:
+                for products in run_concurrently(lambda chunk: fetch_products_batch(chunk, token), chunks, PRODUCTS_FETCH_CONCURRENCY):
+                    fetched.update(products)
+            except BatchEndpointUnavailable:
+                products = run_concurrently(lambda product_id: fetch_product(product_id, token), missing_ids, PRODUCTS_FETCH_CONCURRENCY)
+                fetched.update({product_id: product for product_id, product in zip(missing_ids, products) if product})
+        except (requests.RequestException, CircuitOpenError) as e:
+            if not allow_stale:
+                raise ServiceUnavailableError(PRODUCTS_UNAVAILABLE_MESSAGE)
+            print(f"⚠️ Se usa la última información conocida de {len(missing_ids)} productos: {e}")
+            fetched = {}
+            for product_id in missing_ids:
+                product = last_known_products.get(product_id)
+                if product is not None:
+                    fetched[product_id] = product
+        else:
+            remember_products(fetched)
+        memo.update(fetched)
+        found.update(fetched)
+
+    return {product_id: found[product_id] for product_id in product_ids if product_id in found}
+
+def decrement_products_stock(items, reference=None):
+    """
+    Descuenta de forma atómica el stock de varios productos en el servicio de productos.
+    Con una referencia el descuento es idempotente y se reintenta ante errores de red.
+    Retorna el resultado por producto ({"applied": bool, "items": [...]}) o None si no fue posible contactar el servicio.
+    """
+    headers = {"Authorization": get_auth_header(), "Content-Type": "application/json"}
+    body = {"items": [{"id": str(item["product_id"]), "quantity": item["quantity_ordered"]} for item in items]}
+    if reference is not None:
+        body["reference"] = str(reference)
+    try:
+        response = products_request(http_client.post, "/products/stock/decrement", headers=headers, json=body,
+                                    idempotent=reference is not None)
+    except CircuitOpenError:
+        raise ServiceUnavailableError(PRODUCTS_UNAVAILABLE_MESSAGE)
+    except requests.RequestException:
+        return None
+    if response.status_code in (200, 409):
+        return response.json().get("data")
+    return None
+
+def release_products_stock(references):
+    """
+    Devuelve el stock de los descuentos con esas referencias, en una sola petición.
+    Repetirla no vuelve a sumar el stock. Retorna True si el servicio de productos la confirmó.
+    """
+    try:
+        response = products_request(
+            http_client.post,
+            "/products/stock/release",
+            idempotent=True,
+            headers={"Authorization": get_auth_header(), "Content-Type": "application/json"},
+            json={"references": [str(reference) for reference in references]})
+    except (requests.RequestException, CircuitOpenError) as e:
+        print(f"⚠️ No se pudo devolver el stock de {len(references)} descuentos: {e}")
+        return False
+    return response.status_code == 200
@@ -1,15 +1,37 @@
-import requests
 import os
 from functools import wraps
-from flask import request
+from flask import request, has_request_context
+from flask_jwt_extended import get_jwt, create_access_token
 from app.exceptions.http_exceptions import UnauthorizedError, NotFoundError, ForbiddenError
 from app.utils.response_util import format_response
+from app.utils import http_client
+from app.utils.ttl_cache import TTLCache
 
 PATH_API_USER = f"{os.getenv('PATH_API_USER')}"
 AUTH_SERVICE_URL = PATH_API_USER.replace("/users", "/verify")
+BLOCKED_USERS_URL = f"{PATH_API_USER}/blocked"
+
+BLOCKED_USER_MESSAGE = "Tu cuenta ha sido bloqueada. Contacta al soporte del G18 para más información."
+
+# Usuarios ya verificados contra el servicio de usuarios, indexados por el jti del token
+verified_users = TTLCache(
+    max_size=int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000")),
+    ttl_seconds=int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+)
+# Lista de usuarios bloqueados, se actualiza periódicamente desde el servicio de usuarios
+blocked_users = frozenset()
+
+def get_auth_header():
+    """
+    Retorna el token de la petición en curso. Fuera de una petición (jobs en segundo plano)
+    se firma un token de servicio con la clave JWT compartida entre los microservicios.
+    """
+    if has_request_context():
+        return request.headers.get("Authorization")
+    return f"Bearer {create_access_token(identity='orders-service', additional_claims={'role': 'service'})}"
 
 def check_auth(token):
-    response = requests.get(AUTH_SERVICE_URL, headers={"Authorization": token})
+    response = http_client.get(AUTH_SERVICE_URL, upstream="users", headers={"Authorization": token})
     if response.status_code == 401:
         raise UnauthorizedError(response.json()["error"])
     if response.status_code == 403:
@@ -18,12 +40,45 @@ def check_auth(token):
         raise NotFoundError(response.json()["error"])
     return response.json().get("data")
 
+def refresh_blocked_users(app):
+    """
+    Descarga la lista de usuarios bloqueados. Si el servicio de usuarios no responde
+    se conserva la última lista conocida.
+    """
+    global blocked_users
+    with app.app_context():
+        try:
+            response = http_client.get(BLOCKED_USERS_URL, upstream="users", headers={"Authorization": get_auth_header()})
+        except Exception as e:
+            print(f"⚠️ No se pudo actualizar la lista de usuarios bloqueados: {e}")
+            return
+        if response.status_code != 200:
+            print(f"⚠️ No se pudo actualizar la lista de usuarios bloqueados: HTTP {response.status_code}")
+            return
+        blocked_users = frozenset(str(user_id) for user_id in response.json().get("data", []))
+
 def get_authenticated_user_id():
+    """
+    La firma del token ya fue validada por @jwt_required. Solo se consulta /verify la primera vez
+    que se ve un token (o cuando expira su entrada en caché); la revocación de usuarios
+    bloqueados se valida localmente contra la lista sincronizada.
+    """
     try:
         token = request.headers.get("Authorization")
         if not token:
             raise UnauthorizedError("Token no enviado")
-        user = check_auth(token)
-        return user.get("id")
+
+        claims = get_jwt()
+        cache_key = claims.get("jti") or claims.get("sub") or token
+        if claims.get("sub") and str(claims["sub"]) in blocked_users:
+            verified_users.delete(cache_key)
+            raise ForbiddenError(BLOCKED_USER_MESSAGE)
+
+        user_id = verified_users.get(cache_key)
+        if user_id is None:
+            user = check_auth(token)
+            user_id = user.get("id")
+            verified_users.set(cache_key, user_id)
+        return user_id
     except (UnauthorizedError, NotFoundError, ForbiddenError) as e:
-        raise e
\ No newline at end of file
+        raise e
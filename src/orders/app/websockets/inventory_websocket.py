@@ -1,49 +1,88 @@
+from collections import OrderedDict
 from flask import has_request_context, request
-from flask_socketio import emit
+from flask_socketio import join_room
 from app.extensions import socketio
 
+# Sala con todos los vendedores que reciben las actualizaciones de cualquier categoría
+SELLERS_ROOM = "sellers"
 
 connected_sellers = {}
+# Índice inverso sid -> vendedor para resolver la desconexión sin recorrer connected_sellers
+sellers_by_sid = {}
+
+def category_room(category_id):
+    return f"category:{category_id}"
 
 @socketio.on('connect')
 def handle_connect():
     seller_id = request.args.get('seller_id')
     if seller_id:
         connected_sellers[seller_id] = request.sid
+        sellers_by_sid[request.sid] = seller_id
+
+        # Un vendedor puede suscribirse solo a algunas categorías con ?categories=id1,id2
+        categories = [category.strip() for category in request.args.get('categories', '').split(',') if category.strip()]
+        if categories:
+            for category in categories:
+                join_room(category_room(category))
+        else:
+            join_room(SELLERS_ROOM)
         print(f"Vendedor {seller_id} conectado.")
 
 @socketio.on('disconnect')
 def handle_disconnect():
-    seller_id = None
-    for key, value in connected_sellers.items():
-        if value == request.sid:
-            seller_id = key
-            break
-    if seller_id:
+    seller_id = sellers_by_sid.pop(request.sid, None)
+    # Si el vendedor ya se reconectó con otro sid se conserva la conexión nueva
+    if seller_id and connected_sellers.get(seller_id) == request.sid:
         del connected_sellers[seller_id]
         print(f"Vendedor {seller_id} desconectado.")
 
 @socketio.on('update_inventory')
 def notify_inventory_update(notifiable_updates):
+    """
+    Envía las actualizaciones de inventario a las salas de vendedores.
+    Retorna False si no fue posible enviarlas.
+    """
     if not notifiable_updates:
-        return
-        
-    message = {
-        "type": "inventory_update",
-        "products": notifiable_updates         
-    }
-    for sid in connected_sellers.values():
-        try:
-            socketio.emit('inventory_update', message, to=sid)
-            print(f"Notificación enviada a vendedor {sid}: {message}")
-        except Exception as e:
-            if has_request_context():
-                try:
-                    socketio.emit('inventory_error', {
-                        "error": "No se pudo enviar la notificación a uno o más vendedores.",
-                        "products": notifiable_updates,
-
-                    }, to=request.sid)
-                except RuntimeError:
-                    pass
-            break
\ No newline at end of file
+        return True
+
+    updates_by_category = {}
+    for update in notifiable_updates:
+        if update.get("category"):
+            updates_by_category.setdefault(update["category"], []).append(update)
+
+    try:
+        # Un solo emit por sala: todos los vendedores y cada categoría con sus productos
+        socketio.emit('inventory_update', {
+            "type": "inventory_update",
+            "products": notifiable_updates
+        }, to=SELLERS_ROOM)
+        for category, updates in updates_by_category.items():
+            socketio.emit('inventory_update', {
+                "type": "inventory_update",
+                "products": updates
+            }, to=category_room(category))
+        print(f"Notificación de inventario enviada ({len(notifiable_updates)} productos).")
+        return True
+    except Exception as e:
+        if has_request_context():
+            try:
+                socketio.emit('inventory_error', {
+                    "error": "No se pudo enviar la notificación a uno o más vendedores.",
+                    "products": notifiable_updates,
+
+                }, to=request.sid)
+            except RuntimeError:
+                pass
+        return False
+
+def coalesce_inventory_updates(updates):
+    """
+    Deja solo la última actualización de cada producto, en el orden en que llegaron.
+    """
+    latest = OrderedDict()
+    for update in updates:
+        product_id = str(update["product_id"])
+        latest.pop(product_id, None)
+        latest[product_id] = update
+    return list(latest.values())
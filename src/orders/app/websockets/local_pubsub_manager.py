@@ -0,0 +1,56 @@
+import threading
+import socketio
+
+class LocalPubSubManager(socketio.Manager):
+    """
+    Cola de mensajes en memoria para Socket.IO (SOCKETIO_MESSAGE_QUEUE=local).
+    Conecta varios servidores Socket.IO dentro del mismo proceso como si fueran workers
+    distintos: cada emit se entrega a los clientes locales y se reenvía de forma síncrona
+    a los demás servidores del mismo canal. Se usa en pruebas y desarrollo local; con
+    varios workers o réplicas reales se debe usar Redis.
+    """
+    name = 'local'
+
+    _channels = {}
+    _channels_lock = threading.Lock()
+
+    def __init__(self, channel='socketio'):
+        super().__init__()
+        self.channel = channel
+
+    def initialize(self):
+        super().initialize()
+        with self._channels_lock:
+            subscribers = self._channels.setdefault(self.channel, [])
+            if self not in subscribers:
+                subscribers.append(self)
+
+    def close(self):
+        with self._channels_lock:
+            subscribers = self._channels.get(self.channel, [])
+            if self in subscribers:
+                subscribers.remove(self)
+
+    @classmethod
+    def reset(cls):
+        with cls._channels_lock:
+            cls._channels.clear()
+
+    def _peers(self):
+        with self._channels_lock:
+            return [subscriber for subscriber in self._channels.get(self.channel, []) if subscriber is not self]
+
+    def emit(self, event, data, namespace=None, room=None, skip_sid=None, callback=None, to=None, **kwargs):
+        room = to or room
+        super().emit(event, data, namespace=namespace, room=room, skip_sid=skip_sid, callback=callback, **kwargs)
+        if kwargs.get('ignore_queue'):
+            return
+        # Los callbacks solo tienen sentido en el servidor que tiene al cliente conectado
+        for peer in self._peers():
+            peer.emit(event, data, namespace=namespace, room=room, skip_sid=skip_sid, ignore_queue=True)
+
+    def close_room(self, room, namespace=None, **kwargs):
+        super().close_room(room, namespace)
+        if not kwargs.get('ignore_queue'):
+            for peer in self._peers():
+                peer.close_room(room, namespace, ignore_queue=True)
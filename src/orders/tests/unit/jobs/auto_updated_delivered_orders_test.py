@@ -1,32 +1,84 @@
-from unittest.mock import patch, MagicMock, ANY
-from datetime import datetime
+from unittest.mock import patch, MagicMock
 from flask import Flask
+from app.jobs import auto_update_delivered_orders as job
 from app.jobs.auto_update_delivered_orders import auto_update_delivered_orders
 from app.models.order_model import OrderStateEnum
 
+def build_lock_connection(mock_db, dialect="postgresql", acquired=True):
+    lock_connection = MagicMock()
+    lock_connection.dialect.name = dialect
+    lock_connection.execute.return_value.scalar.return_value = acquired
+    mock_db.engine.connect.return_value.__enter__.return_value = lock_connection
+    return lock_connection
+
+def overdue_orders(count):
+    return [
+        MagicMock(id=f"order-{index}", customer_id="customer-1", seller_id=None, state=OrderStateEnum.ON_ROUTE)
+        for index in range(count)
+    ]
+
+def select_result(orders):
+    result = MagicMock()
+    result.all.return_value = orders
+    return result
+
+@patch("app.jobs.auto_update_delivered_orders.OrderStateChangeRepository.add_changes")
 @patch("app.jobs.auto_update_delivered_orders.db")
-@patch("app.jobs.auto_update_delivered_orders.datetime")
-def test_auto_update_delivered_orders_updates_orders(mock_datetime, mock_db):
-    # Simular datetime.utcnow().date() → 2025-05-17
-    fake_now = datetime(2025, 5, 17, 15, 30, 0)
-    mock_datetime.utcnow.return_value = fake_now
-    mock_datetime.combine.side_effect = datetime.combine
-    mock_datetime.date = datetime.date
-    mock_datetime.time = datetime.time
-
-    # Simular query
-    mock_session = mock_db.session
-    mock_session.query.return_value.filter.return_value.update.return_value = 3
-
-    # Crear app Flask mínima para el contexto
+def test_auto_update_delivered_orders_updates_in_chunks(mock_db, mock_add_changes):
+    lock_connection = build_lock_connection(mock_db)
+    chunks = [overdue_orders(2), overdue_orders(2), overdue_orders(1)]
+    # Cada bloque ejecuta la selección de pedidos y la actualización
+    mock_db.session.execute.side_effect = [
+        result for orders in chunks for result in (select_result(orders), MagicMock())
+    ]
+
     app = Flask(__name__)
-    with app.app_context():
-        auto_update_delivered_orders(app)
-
-    # Validaciones
-    mock_session.query.assert_called_once()
-    mock_session.query.return_value.filter.assert_called_once()
-    mock_session.query.return_value.filter.return_value.update.assert_called_once_with(
-        ANY, synchronize_session=False
-    )
-    mock_session.commit.assert_called_once()
+    updated = auto_update_delivered_orders(app, chunk_size=2)
+
+    assert updated == 5
+    assert mock_db.session.execute.call_count == 6
+    assert mock_db.session.commit.call_count == 3
+    assert mock_add_changes.call_count == 3
+    assert mock_add_changes.call_args_list[0][0][0][0] == {
+        "order_id": "order-0",
+        "customer_id": "customer-1",
+        "seller_id": None,
+        "from_state": OrderStateEnum.ON_ROUTE,
+        "to_state": OrderStateEnum.DELIVERED
+    }
+    assert job.last_run["updated"] == 5
+    assert job.last_run["chunks"] == 3
+    # Se toma y se libera el bloqueo de la réplica que ejecuta el job
+    statements = [str(call[0][0]) for call in lock_connection.execute.call_args_list]
+    assert "pg_try_advisory_lock" in statements[0]
+    assert "pg_advisory_unlock" in statements[-1]
+
+@patch("app.jobs.auto_update_delivered_orders.db")
+def test_auto_update_delivered_orders_stops_after_partial_chunk(mock_db):
+    build_lock_connection(mock_db)
+    mock_db.session.execute.return_value = select_result([])
+
+    updated = auto_update_delivered_orders(Flask(__name__), chunk_size=500)
+
+    assert updated == 0
+    mock_db.session.execute.assert_called_once()
+
+@patch("app.jobs.auto_update_delivered_orders.db")
+def test_auto_update_delivered_orders_skips_when_other_replica_has_lock(mock_db):
+    lock_connection = build_lock_connection(mock_db, acquired=False)
+
+    updated = auto_update_delivered_orders(Flask(__name__))
+
+    assert updated is None
+    mock_db.session.execute.assert_not_called()
+    lock_connection.execute.assert_called_once()
+
+@patch("app.jobs.auto_update_delivered_orders.db")
+def test_auto_update_delivered_orders_without_postgres_does_not_lock(mock_db):
+    lock_connection = build_lock_connection(mock_db, dialect="sqlite")
+    mock_db.session.execute.return_value = select_result([])
+
+    auto_update_delivered_orders(Flask(__name__))
+
+    lock_connection.execute.assert_not_called()
+    mock_db.session.execute.assert_called_once()
@@ -0,0 +1,64 @@
+from unittest.mock import patch, MagicMock
+from flask import Flask
+from app.jobs.backfill_order_products_snapshot import backfill_order_products_snapshot, backfill_retry_delay
+from app.exceptions.http_exceptions import ServiceUnavailableError
+
+@patch("app.jobs.backfill_order_products_snapshot.db")
+@patch("app.jobs.backfill_order_products_snapshot.get_products_info")
+@patch("app.jobs.backfill_order_products_snapshot.OrderProducts")
+def test_backfill_order_products_snapshot_copies_product_data(mock_order_products, mock_get_products_info, mock_db):
+    found = MagicMock(id=1, product_id="product-a", product_name=None)
+    missing = MagicMock(id=2, product_id="product-b", product_name=None)
+
+    mock_order_products.id.__gt__.return_value = MagicMock()
+    query = mock_order_products.query.filter.return_value
+    query.order_by.return_value.limit.return_value.all.return_value = [found, missing]
+    query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = []
+    mock_get_products_info.return_value = {
+        "product-a": {"name": "Producto A", "image_url": "http://example.com/a.png", "unit_amount": 100.0}
+    }
+
+    app = Flask(__name__)
+    backfill_order_products_snapshot(app, batch_size=2)
+
+    assert found.product_name == "Producto A"
+    assert found.product_image_url == "http://example.com/a.png"
+    assert found.unit_price == 100.0
+    assert missing.product_name is None
+    mock_get_products_info.assert_called_once()
+    mock_db.session.commit.assert_called_once()
+
+@patch("app.jobs.backfill_order_products_snapshot.db")
+@patch("app.jobs.backfill_order_products_snapshot.OrderProducts")
+def test_backfill_skipped_when_another_replica_holds_the_lock(mock_order_products, mock_db):
+    lock_connection = mock_db.engine.connect.return_value.__enter__.return_value
+    lock_connection.dialect.name = "postgresql"
+    lock_connection.execute.return_value.scalar.return_value = False
+
+    assert backfill_order_products_snapshot(Flask(__name__)) is None
+    mock_order_products.query.filter.assert_not_called()
+
+@patch("app.jobs.backfill_order_products_snapshot.db")
+@patch("app.jobs.backfill_order_products_snapshot.get_products_info")
+@patch("app.jobs.backfill_order_products_snapshot.OrderProducts")
+def test_backfill_rescheduled_when_products_unavailable(mock_order_products, mock_get_products_info, mock_db):
+    lock_connection = mock_db.engine.connect.return_value.__enter__.return_value
+    lock_connection.dialect.name = "postgresql"
+    lock_connection.execute.return_value.scalar.return_value = True
+    query = mock_order_products.query.filter.return_value
+    query.order_by.return_value.limit.return_value.all.return_value = [MagicMock(id=1, product_id="product-a")]
+    mock_get_products_info.side_effect = ServiceUnavailableError()
+    scheduler = MagicMock()
+
+    assert backfill_order_products_snapshot(Flask(__name__), scheduler=scheduler, attempt=1) is None
+
+    mock_db.session.rollback.assert_called_once()
+    unlock_statement = lock_connection.execute.call_args_list[-1][0][0]
+    assert "pg_advisory_unlock" in str(unlock_statement)
+    scheduler.add_job.assert_called_once()
+    assert scheduler.add_job.call_args[0][1] == "date"
+
+def test_backfill_retry_delay_doubles_up_to_max():
+    assert backfill_retry_delay(0) == 30
+    assert backfill_retry_delay(2) == 120
+    assert backfill_retry_delay(20) == 1800
@@ -0,0 +1,104 @@
+from unittest.mock import patch, MagicMock
+from flask import Flask
+from app.jobs.dispatch_outbox_events import dispatch_outbox_events, purge_processed_outbox_events
+from app.models.outbox_event_model import OutboxStatusEnum
+
+def make_event(event_type, payload, attempts=0):
+    return MagicMock(event_type=event_type, payload=payload, attempts=attempts, status=OutboxStatusEnum.PENDING)
+
+@patch("app.jobs.dispatch_outbox_events.db")
+@patch("app.jobs.dispatch_outbox_events.notify_inventory_update")
+@patch("app.jobs.dispatch_outbox_events.OutboxRepository.get_pending_batch")
+def test_dispatch_merges_inventory_updates_in_one_notification(mock_get_pending, mock_notify, mock_db):
+    first = make_event("inventory_update", [{"product_id": "a", "new_quantity": 5}])
+    second = make_event("inventory_update", [{"product_id": "b", "new_quantity": 1}, {"product_id": "a", "new_quantity": 4}])
+    mock_get_pending.return_value = [first, second]
+    mock_notify.return_value = True
+
+    processed = dispatch_outbox_events(Flask(__name__), batch_size=10)
+
+    assert processed == 2
+    mock_notify.assert_called_once_with([
+        {"product_id": "b", "new_quantity": 1},
+        {"product_id": "a", "new_quantity": 4}
+    ])
+    assert first.status == OutboxStatusEnum.PROCESSED
+    assert second.status == OutboxStatusEnum.PROCESSED
+    mock_db.session.commit.assert_called_once()
+
+@patch("app.jobs.dispatch_outbox_events.OUTBOX_MAX_ATTEMPTS", 2)
+@patch("app.jobs.dispatch_outbox_events.db")
+@patch("app.jobs.dispatch_outbox_events.notify_inventory_update")
+@patch("app.jobs.dispatch_outbox_events.OutboxRepository.get_pending_batch")
+def test_dispatch_failure_is_retried_then_marked_failed(mock_get_pending, mock_notify, mock_db):
+    retry = make_event("inventory_update", [{"product_id": "a"}], attempts=0)
+    exhausted = make_event("inventory_update", [{"product_id": "b"}], attempts=1)
+    unknown = make_event("unknown_event", {}, attempts=0)
+    mock_get_pending.return_value = [retry, exhausted, unknown]
+    mock_notify.return_value = False
+
+    processed = dispatch_outbox_events(Flask(__name__), batch_size=10)
+
+    assert processed == 0
+    assert retry.status == OutboxStatusEnum.PENDING
+    assert retry.attempts == 1
+    assert retry.last_error == "No se pudo enviar la notificación de inventario a los vendedores"
+    assert exhausted.status == OutboxStatusEnum.FAILED
+    assert unknown.attempts == 1
+    mock_db.session.commit.assert_called_once()
+
+@patch("app.jobs.dispatch_outbox_events.db")
+@patch("app.jobs.dispatch_outbox_events.OutboxRepository.get_pending_batch")
+def test_dispatch_without_pending_events(mock_get_pending, mock_db):
+    mock_get_pending.return_value = []
+
+    assert dispatch_outbox_events(Flask(__name__)) == 0
+
+@patch("app.jobs.dispatch_outbox_events.db")
+@patch("app.jobs.dispatch_outbox_events.invalidate_products")
+@patch("app.jobs.dispatch_outbox_events.notify_inventory_update")
+@patch("app.jobs.dispatch_outbox_events.OutboxRepository.get_pending_batch")
+def test_dispatch_invalidates_cached_products(mock_get_pending, mock_notify, mock_invalidate, mock_db):
+    mock_get_pending.return_value = [
+        make_event("inventory_update", [{"product_id": "a", "new_quantity": 5}, {"product_id": "b", "new_quantity": 1}])
+    ]
+    mock_notify.return_value = True
+
+    dispatch_outbox_events(Flask(__name__), batch_size=10)
+
+    assert list(mock_invalidate.call_args[0][0]) == ["a", "b"]
+
+@patch("app.jobs.dispatch_outbox_events.db")
+@patch("app.jobs.dispatch_outbox_events.notify_inventory_update")
+@patch("app.jobs.dispatch_outbox_events.OutboxRepository.get_pending_batch")
+def test_dispatch_keeps_events_pending_when_notification_fails(mock_get_pending, mock_notify, mock_db):
+    event = make_event("inventory_update", [{"product_id": "a", "new_quantity": 5}])
+    mock_get_pending.return_value = [event]
+    mock_notify.return_value = False
+
+    processed = dispatch_outbox_events(Flask(__name__), batch_size=10)
+
+    assert processed == 0
+    assert event.status == OutboxStatusEnum.PENDING
+    assert event.attempts == 1
+    mock_db.session.commit.assert_called_once()
+
+@patch("app.jobs.dispatch_outbox_events.db")
+@patch("app.jobs.dispatch_outbox_events.OutboxRepository.delete_processed_before")
+def test_purge_deletes_processed_events_in_batches(mock_delete, mock_db):
+    mock_delete.side_effect = [100, 100, 30]
+
+    deleted = purge_processed_outbox_events(Flask(__name__), retention_days=7, batch_size=100)
+
+    assert deleted == 230
+    assert mock_delete.call_count == 3
+    assert all(call[0][1] == 100 for call in mock_delete.call_args_list)
+    assert mock_db.session.commit.call_count == 3
+
+@patch("app.jobs.dispatch_outbox_events.db")
+@patch("app.jobs.dispatch_outbox_events.OutboxRepository.delete_processed_before")
+def test_purge_without_old_events(mock_delete, mock_db):
+    mock_delete.return_value = 0
+
+    assert purge_processed_outbox_events(Flask(__name__), retention_days=7, batch_size=100) == 0
+    mock_delete.assert_called_once()
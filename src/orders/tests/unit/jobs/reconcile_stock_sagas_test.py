@@ -0,0 +1,46 @@
+import uuid
+from unittest.mock import patch, MagicMock
+from flask import Flask
+from app.jobs.reconcile_stock_sagas import reconcile_stock_sagas
+
+def make_saga(attempts=0):
+    return MagicMock(id=uuid.uuid4(), attempts=attempts, last_error=None)
+
+@patch("app.jobs.reconcile_stock_sagas.db")
+@patch("app.jobs.reconcile_stock_sagas.release_products_stock")
+@patch("app.jobs.reconcile_stock_sagas.StockSagaRepository")
+def test_reconcile_releases_batch_in_one_request(mock_sagas, mock_release, mock_db):
+    first, second = make_saga(), make_saga(attempts=2)
+    mock_sagas.get_unfinished_batch.return_value = [first, second]
+    mock_release.return_value = True
+
+    released = reconcile_stock_sagas(Flask(__name__), batch_size=10)
+
+    assert released == 2
+    mock_release.assert_called_once_with([first.id, second.id])
+    mock_sagas.delete_compensated.assert_called_once_with([first.id, second.id])
+
+@patch("app.jobs.reconcile_stock_sagas.db")
+@patch("app.jobs.reconcile_stock_sagas.release_products_stock")
+@patch("app.jobs.reconcile_stock_sagas.StockSagaRepository")
+def test_reconcile_failure_keeps_sagas_for_next_run(mock_sagas, mock_release, mock_db):
+    saga = make_saga(attempts=1)
+    mock_sagas.get_unfinished_batch.return_value = [saga]
+    mock_release.return_value = False
+
+    released = reconcile_stock_sagas(Flask(__name__), batch_size=10)
+
+    assert released == 0
+    assert saga.attempts == 2
+    assert saga.last_error
+    mock_sagas.delete_compensated.assert_not_called()
+    mock_db.session.commit.assert_called_once()
+
+@patch("app.jobs.reconcile_stock_sagas.db")
+@patch("app.jobs.reconcile_stock_sagas.release_products_stock")
+@patch("app.jobs.reconcile_stock_sagas.StockSagaRepository")
+def test_reconcile_without_sagas(mock_sagas, mock_release, mock_db):
+    mock_sagas.get_unfinished_batch.return_value = []
+
+    assert reconcile_stock_sagas(Flask(__name__), batch_size=10) == 0
+    mock_release.assert_not_called()
@@ -1,9 +1,13 @@
 from flask import json
+from datetime import datetime
+import uuid
 import pytest
 import os
 from unittest.mock import patch, MagicMock
-from app.services.order_service import OrderService
-from app.exceptions.http_exceptions import BadRequestError, NotFoundError
+from sqlalchemy.exc import SQLAlchemyError
+from app.services.order_service import OrderService, apply_stock_decrement, hash_order_request
+from app.exceptions.http_exceptions import BadRequestError, NotFoundError, ConflictError
+from app.utils.pagination_util import decode_cursor
 
 @pytest.fixture
 def order_service():
@@ -107,9 +111,9 @@ def test_create_order_missing_items_list(mock_create_order):
     with pytest.raises(BadRequestError, match="a petición debe contener una lista de productos válida"):
         OrderService.create_order(customer_id, order_data)
 
-@patch("app.services.order_service.get_product_info")
-def test_validate_products_product_not_found(mock_get_product_info):
-    mock_get_product_info.return_value = None
+@patch("app.services.order_service.get_products_info")
+def test_validate_products_product_not_found(mock_get_products_info):
+    mock_get_products_info.return_value = {}
 
     items = [
         {
@@ -134,9 +138,9 @@ def test_validate_products_invalid_product_id(mock_validate_uuid):
 
     mock_validate_uuid.assert_called_once_with("invalid-uuid")
 
-@patch("app.services.order_service.get_product_info")
-def test_validate_products_without_product_id(mock_get_product_info):
-    mock_get_product_info.return_value = None
+@patch("app.services.order_service.get_products_info")
+def test_validate_products_without_product_id(mock_get_products_info):
+    mock_get_products_info.return_value = {}
 
     items = [
         {"quantity": 2}
@@ -145,9 +149,9 @@ def test_validate_products_without_product_id(mock_get_product_info):
     with pytest.raises(BadRequestError, match="Cada producto debe incluir 'id' y 'quantity'"):
         OrderService.validate_products(items)
 
-@patch("app.services.order_service.get_product_info")
-def test_validate_products_without_quantity(mock_get_product_info):
-    mock_get_product_info.return_value = None
+@patch("app.services.order_service.get_products_info")
+def test_validate_products_without_quantity(mock_get_products_info):
+    mock_get_products_info.return_value = {}
 
     items = [
         {"id": "123e4567-e89b-12d3-a456-426614174000"}
@@ -156,9 +160,9 @@ def test_validate_products_without_quantity(mock_get_product_info):
     with pytest.raises(BadRequestError, match="Cada producto debe incluir 'id' y 'quantity'"):
         OrderService.validate_products(items)
 
-@patch("app.services.order_service.get_product_info")
-def test_validate_products_negative_quantity(mock_get_product_info):
-    mock_get_product_info.return_value = None
+@patch("app.services.order_service.get_products_info")
+def test_validate_products_negative_quantity(mock_get_products_info):
+    mock_get_products_info.return_value = {}
 
     items = [
         {
@@ -169,9 +173,9 @@ def test_validate_products_negative_quantity(mock_get_product_info):
     with pytest.raises(BadRequestError, match="La cantidad debe ser un número entero positivo"):
         OrderService.validate_products(items)
 
-@patch("app.services.order_service.get_product_info")
-def test_validate_products_invalid_quantity(mock_get_product_info):
-    mock_get_product_info.return_value = None
+@patch("app.services.order_service.get_products_info")
+def test_validate_products_invalid_quantity(mock_get_products_info):
+    mock_get_products_info.return_value = {}
 
     items = [
         {
@@ -182,26 +186,22 @@ def test_validate_products_invalid_quantity(mock_get_product_info):
     with pytest.raises(BadRequestError, match="La cantidad debe ser un número entero positivo"):
         OrderService.validate_products(items)
 
-@patch("app.services.order_service.get_product_info")
-def test_validate_products_success(mock_get_product_info):
-    mock_get_product_info.side_effect = [
-        {
-            "data": {
-                "name": "Producto A",
-                "quantity": 10,
-                "unit_amount": 5000.0,
-                "image_url": "https://example.com/producto_a.jpg"
-            }
+@patch("app.services.order_service.get_products_info")
+def test_validate_products_success(mock_get_products_info):
+    mock_get_products_info.return_value = {
+        "123e4567-e89b-12d3-a456-426614174000": {
+            "name": "Producto A",
+            "quantity": 10,
+            "unit_amount": 5000.0,
+            "image_url": "https://example.com/producto_a.jpg"
         },
-        {
-            "data": {
-                "name": "Producto B",
-                "quantity": 20,
-                "unit_amount": 3000.0,
-                "image_url": "https://example.com/producto_b.jpg"
-            }
+        "123e4567-e89b-12d3-a456-426614174001": {
+            "name": "Producto B",
+            "quantity": 20,
+            "unit_amount": 3000.0,
+            "image_url": "https://example.com/producto_b.jpg"
         }
-    ]
+    }
 
     items = [
         {"id": "123e4567-e89b-12d3-a456-426614174000", "quantity": 2},
@@ -227,22 +227,38 @@ def test_validate_products_success(mock_get_product_info):
     assert validated_items[1]["image_url"] == "https://example.com/producto_b.jpg"
     assert validated_items[1]["price"] == 3000.0
 
-    mock_get_product_info.assert_any_call("123e4567-e89b-12d3-a456-426614174000")
-    mock_get_product_info.assert_any_call("123e4567-e89b-12d3-a456-426614174001")
-    assert mock_get_product_info.call_count == 2
+    # La validación de stock no usa el caché de productos por defecto
+    mock_get_products_info.assert_called_once_with([
+        "123e4567-e89b-12d3-a456-426614174000",
+        "123e4567-e89b-12d3-a456-426614174001"
+    ], cached=False)
+
+@patch("app.services.order_service.get_products_info")
+def test_validate_products_uppercase_id(mock_get_products_info):
+    mock_get_products_info.return_value = {
+        "123e4567-e89b-12d3-a456-426614174000": {
+            "name": "Producto A",
+            "quantity": 10,
+            "unit_amount": 5000.0
+        }
+    }
+
+    items = [{"id": "123E4567-E89B-12D3-A456-426614174000", "quantity": 2}]
+    validated_items, total_amount, _ = OrderService.validate_products(items)
 
-@patch("app.services.order_service.get_product_info")
-def test_validate_products_insufficient_stock(mock_get_product_info):
-    mock_get_product_info.side_effect = [
-        {
-            "data": {
-                "name": "Producto A",
-                "quantity": 1,
-                "unit_amount": 5000.0,
-                "image_url": "https://example.com/producto_a.jpg"
-            }
+    assert len(validated_items) == 1
+    assert total_amount == 10000.0
+
+@patch("app.services.order_service.get_products_info")
+def test_validate_products_insufficient_stock(mock_get_products_info):
+    mock_get_products_info.return_value = {
+        "123e4567-e89b-12d3-a456-426614174000": {
+            "name": "Producto A",
+            "quantity": 1,
+            "unit_amount": 5000.0,
+            "image_url": "https://example.com/producto_a.jpg"
         }
-    ]
+    }
     items = [
         {"id": "123e4567-e89b-12d3-a456-426614174000", "quantity": 2}
     ]
@@ -250,8 +266,8 @@ def test_validate_products_insufficient_stock(mock_get_product_info):
     with pytest.raises(BadRequestError, match="No hay suficiente cantidad del producto Producto A en stock"):
         OrderService.validate_products(items)
 
-@patch("app.services.order_service.get_product_info")
-def test_validate_products_empty_items(mock_get_product_info):
+@patch("app.services.order_service.get_products_info")
+def test_validate_products_empty_items(mock_get_products_info):
     items = []
 
     validated_items, total_amount, summary = OrderService.validate_products(items)
@@ -363,9 +379,10 @@ def test_create_order_seller_missing_items(mock_validate_products):
     mock_validate_products.assert_not_called()
 
 @patch("app.services.order_service.db.session")
-@patch("app.services.order_service.get_product_info")
-@patch("app.services.order_service.update_product_quantity")
-def test_create_order_success(mock_update_stock, mock_get_info, mock_session, order_service):
+@patch("app.services.order_service.get_products_info")
+@patch("app.services.order_service.decrement_products_stock")
+@patch("app.services.order_service.StockSagaRepository")
+def test_create_order_success(mock_sagas, mock_decrement_stock, mock_get_info, mock_session, order_service):
     customer_id = "123e4567-e89b-12d3-a456-426614174000"
     order_data = {        
         "date": "2023-01-01",
@@ -376,28 +393,38 @@ def test_create_order_success(mock_update_stock, mock_get_info, mock_session, or
     }
 
     mock_product_response = {
-        "data": {
-            "product_id": "dummy-id",
-            "name": "Test Product",
-            "quantity": 10,
-            "unit_amount": 100.0,
-            "image_url": "http://example.com/image.png",
-            "description": "Descripción del producto"
-        }
+        "name": "Test Product",
+        "quantity": 10,
+        "unit_amount": 100.0,
+        "image_url": "http://example.com/image.png",
+        "description": "Descripción del producto"
     }
 
-    mock_get_info.side_effect = [mock_product_response, mock_product_response]
+    mock_get_info.return_value = {
+        "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d": mock_product_response,
+        "1d2561f3-9f43-46c9-9af7-b2a43edc1956": mock_product_response
+    }
+    mock_decrement_stock.return_value = {
+        "applied": True,
+        "items": [
+            {"product_id": "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d", "success": True, "quantity": 8},
+            {"product_id": "1d2561f3-9f43-46c9-9af7-b2a43edc1956", "success": True, "quantity": 9}
+        ]
+    }
     created_order = order_service.create_order(customer_id, order_data)
     assert created_order["date"] == "2023-01-03"
     assert len(created_order["items"]) == 2
-    assert mock_update_stock.call_count == 2
+    assert mock_decrement_stock.call_count == 1
+    assert mock_decrement_stock.call_args.kwargs["reference"] == mock_sagas.start.return_value
+    mock_sagas.complete.assert_called_once_with(mock_sagas.start.return_value)
     assert mock_session.begin.called
 
 @patch("app.services.order_service.db.session")
-@patch("app.services.order_service.get_product_info")
-@patch("app.services.order_service.update_product_quantity")
-@patch("app.services.order_service.notify_inventory_update")
-def test_create_order_seller_success(mock_notify, mock_update_stock, mock_get_info, mock_session, order_service):
+@patch("app.services.order_service.get_products_info")
+@patch("app.services.order_service.decrement_products_stock")
+@patch("app.services.order_service.OutboxRepository.add_event")
+@patch("app.services.order_service.StockSagaRepository")
+def test_create_order_seller_success(mock_sagas, mock_add_event, mock_decrement_stock, mock_get_info, mock_session, order_service):
     seller_id = "223e4567-e89b-12d3-a456-426614174111"
     customer_id = "123e4567-e89b-12d3-a456-426614174000"
     order_data = {        
@@ -410,20 +437,335 @@ def test_create_order_seller_success(mock_notify, mock_update_stock, mock_get_in
     }
 
     mock_product_response = {
-        "data": {
-            "product_id": "dummy-id",
-            "name": "Test Product",
-            "quantity": 10,
-            "unit_amount": 100.0,
-            "image_url": "http://example.com/image.png",
-            "description": "Descripción del producto"
-        }
+        "name": "Test Product",
+        "quantity": 10,
+        "unit_amount": 100.0,
+        "image_url": "http://example.com/image.png",
+        "description": "Descripción del producto"
     }
 
-    mock_get_info.side_effect = [mock_product_response, mock_product_response]
+    mock_get_info.return_value = {
+        "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d": mock_product_response,
+        "1d2561f3-9f43-46c9-9af7-b2a43edc1956": mock_product_response
+    }
+    mock_decrement_stock.return_value = {
+        "applied": True,
+        "items": [
+            {"product_id": "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d", "success": True, "quantity": 8},
+            {"product_id": "1d2561f3-9f43-46c9-9af7-b2a43edc1956", "success": True, "quantity": 9}
+        ]
+    }
     created_order = order_service.create_order_seller(seller_id, order_data)
     assert created_order["date"] == "2023-01-03"
     assert len(created_order["items"]) == 2
-    assert mock_update_stock.call_count == 2
-    assert mock_notify.call_count == 1
-    assert mock_session.begin.called
\ No newline at end of file
+    assert mock_decrement_stock.call_count == 1
+    assert mock_add_event.call_count == 1
+    event = mock_add_event.call_args[0][0]
+    assert event.event_type == "inventory_update"
+    assert [update["new_quantity"] for update in event.payload] == [8, 9]
+    assert mock_session.begin.called
+
+@patch("app.services.order_service.decrement_products_stock")
+def test_apply_stock_decrement_insufficient_stock(mock_decrement_stock):
+    validated_items = [
+        {"product_id": "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d", "quantity_ordered": 2, "name": "Producto A"},
+        {"product_id": "1d2561f3-9f43-46c9-9af7-b2a43edc1956", "quantity_ordered": 5, "name": "Producto B"}
+    ]
+    mock_decrement_stock.return_value = {
+        "applied": False,
+        "items": [
+            {"product_id": "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d", "success": True, "quantity": None},
+            {"product_id": "1d2561f3-9f43-46c9-9af7-b2a43edc1956", "success": False, "quantity": None}
+        ]
+    }
+
+    with pytest.raises(BadRequestError, match="No hay suficiente cantidad del producto Producto B en stock"):
+        apply_stock_decrement(validated_items)
+
+@patch("app.services.order_service.decrement_products_stock")
+def test_apply_stock_decrement_service_unavailable(mock_decrement_stock):
+    mock_decrement_stock.return_value = None
+    validated_items = [
+        {"product_id": "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d", "quantity_ordered": 2, "name": "Producto A"}
+    ]
+
+    with pytest.raises(BadRequestError, match="No fue posible actualizar el inventario de los productos"):
+        apply_stock_decrement(validated_items)
+
+@patch("app.services.order_service.get_products_info")
+@patch("app.repositories.order_repository.OrderRepository.get_page_by_customer")
+def test_get_orders_by_customer_resolves_products_in_one_call(mock_get_page, mock_get_products_info):
+    product_a = "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d"
+    product_b = "1d2561f3-9f43-46c9-9af7-b2a43edc1956"
+    orders = [
+        MagicMock(
+            id="order-1", total_amount=300.0, state=MagicMock(value="PREPARING"),
+            delivery_date=datetime(2025, 5, 20),
+            items=[MagicMock(product_id=product_a, quantity_ordered=1, amount=100.0, has_snapshot=False),
+                   MagicMock(product_id=product_b, quantity_ordered=1, amount=200.0, has_snapshot=False)]
+        ),
+        MagicMock(
+            id="order-2", total_amount=100.0, state=MagicMock(value="DELIVERED"),
+            delivery_date=datetime(2025, 5, 21),
+            items=[MagicMock(product_id=product_a, quantity_ordered=1, amount=100.0, has_snapshot=False)]
+        )
+    ]
+    mock_get_page.return_value = orders
+    mock_get_products_info.return_value = {
+        product_a: {"name": "Producto A", "image_url": "http://example.com/a.png"},
+        product_b: {"name": "Producto B", "image_url": "http://example.com/b.png"}
+    }
+
+    result, next_cursor = OrderService.get_orders_by_customer("123e4567-e89b-12d3-a456-426614174000")
+
+    mock_get_products_info.assert_called_once()
+    assert next_cursor is None
+    assert len(result) == 2
+    assert result[0]["summary"] == "Producto A, Producto B"
+    assert result[1]["items"] == [
+        {"title": "Producto A", "quantity": 1, "price": 100.0, "image_url": "http://example.com/a.png"}
+    ]
+
+@patch("app.services.order_service.get_products_info")
+@patch("app.repositories.order_repository.OrderRepository.get_page_by_customer")
+def test_get_orders_by_customer_uses_product_snapshot(mock_get_page, mock_get_products_info):
+    product_a = "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d"
+    product_b = "1d2561f3-9f43-46c9-9af7-b2a43edc1956"
+    snapshot_item = MagicMock(
+        product_id=product_a, quantity_ordered=2, amount=200.0, has_snapshot=True,
+        product_name="Producto A", product_image_url="http://example.com/a.png"
+    )
+    legacy_item = MagicMock(product_id=product_b, quantity_ordered=1, amount=50.0, has_snapshot=False)
+    mock_get_page.return_value = [
+        MagicMock(
+            id="order-1", total_amount=250.0, state=MagicMock(value="PREPARING"),
+            delivery_date=datetime(2025, 5, 20), items=[snapshot_item, legacy_item]
+        )
+    ]
+    mock_get_products_info.return_value = {
+        product_b: {"name": "Producto B", "image_url": "http://example.com/b.png"}
+    }
+
+    result, _ = OrderService.get_orders_by_customer("123e4567-e89b-12d3-a456-426614174000")
+
+    assert list(mock_get_products_info.call_args[0][0]) == [product_b]
+    assert result[0]["summary"] == "Producto A, Producto B"
+    assert result[0]["items"][0] == {
+        "title": "Producto A", "quantity": 2, "price": 200.0, "image_url": "http://example.com/a.png"
+    }
+
+@patch("app.services.order_service.get_products_info")
+@patch("app.repositories.order_repository.OrderRepository.get_page_by_customer")
+def test_get_orders_by_customer_returns_next_cursor(mock_get_page, mock_get_products_info):
+    mock_get_products_info.return_value = {}
+    orders = [
+        MagicMock(
+            id=f"00000000-0000-4000-8000-00000000000{index}", total_amount=10.0, state=MagicMock(value="PREPARING"),
+            created_at=datetime(2025, 5, 20 - index), delivery_date=datetime(2025, 5, 22), items=[]
+        )
+        for index in range(3)
+    ]
+    mock_get_page.return_value = orders
+
+    result, next_cursor = OrderService.get_orders_by_customer("123e4567-e89b-12d3-a456-426614174000", limit=2)
+
+    assert [order["order_id"] for order in result] == [orders[0].id, orders[1].id]
+    assert decode_cursor(next_cursor) == (orders[1].created_at, uuid.UUID(orders[1].id))
+    assert mock_get_page.call_args[0][1] == 2
+
+    OrderService.get_orders_by_customer("123e4567-e89b-12d3-a456-426614174000", limit=2, cursor=next_cursor)
+    assert mock_get_page.call_args[1]["after"] == (orders[1].created_at, uuid.UUID(orders[1].id))
+
+def test_get_orders_by_customer_invalid_cursor():
+    with pytest.raises(BadRequestError, match="El cursor de paginación no es válido"):
+        OrderService.get_orders_by_customer("123e4567-e89b-12d3-a456-426614174000", cursor="no-es-un-cursor")
+
+@patch("app.services.order_service.OrderStateChangeRepository.get_changes_since")
+def test_get_state_changes_returns_latest_state_per_order(mock_get_changes):
+    from app.models.order_model import OrderStateEnum
+    order_a = uuid.uuid4()
+    order_b = uuid.uuid4()
+    mock_get_changes.return_value = [
+        MagicMock(id=11, order_id=order_a, from_state=None, to_state=OrderStateEnum.PREPARING, changed_at=datetime(2025, 5, 20, 8)),
+        MagicMock(id=12, order_id=order_b, from_state=OrderStateEnum.PREPARING, to_state=OrderStateEnum.ON_ROUTE, changed_at=datetime(2025, 5, 20, 9)),
+        MagicMock(id=13, order_id=order_a, from_state=OrderStateEnum.PREPARING, to_state=OrderStateEnum.DELIVERED, changed_at=datetime(2025, 5, 20, 10)),
+    ]
+
+    orders, next_since, has_more = OrderService.get_state_changes("10", 20, customer_id="customer-1")
+
+    assert mock_get_changes.call_args[0][:2] == (10, 20)
+    assert mock_get_changes.call_args[1] == {"customer_id": "customer-1", "seller_id": None}
+    assert [order["order_id"] for order in orders] == [str(order_b), str(order_a)]
+    assert orders[1]["status"] == "DELIVERED"
+    assert orders[1]["previous_status"] == "PREPARING"
+    assert next_since == "13"
+    assert has_more is False
+
+@patch("app.services.order_service.OrderStateChangeRepository.get_changes_since")
+def test_get_state_changes_without_changes_keeps_cursor(mock_get_changes):
+    mock_get_changes.return_value = []
+
+    orders, next_since, has_more = OrderService.get_state_changes("42", 20, seller_id="seller-1")
+
+    assert orders == []
+    assert next_since == "42"
+    assert has_more is False
+
+@pytest.mark.parametrize("since", ["abc", "-1"])
+def test_get_state_changes_invalid_cursor(since):
+    with pytest.raises(BadRequestError, match="El cursor 'since' no es válido"):
+        OrderService.get_state_changes(since, 20, customer_id="customer-1")
+
+@patch("app.services.order_service.db.session")
+@patch("app.services.order_service.get_products_info")
+@patch("app.services.order_service.IdempotencyKeyRepository")
+def test_create_order_idempotency_key_replays_saved_response(mock_keys, mock_get_info, mock_session):
+    customer_id = "123e4567-e89b-12d3-a456-426614174000"
+    order_data = {"date": "2023-01-01", "items": [{"id": "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d", "quantity": 2}]}
+    saved_response = {"order_id": "abc", "status": "PREPARING"}
+    mock_keys.claim.return_value = None
+    mock_keys.get.return_value = MagicMock(request_hash=hash_order_request(order_data), response=saved_response)
+
+    result = OrderService.create_order(customer_id, order_data, "llave-1")
+
+    assert result == saved_response
+    mock_keys.claim.assert_called_once()
+    mock_get_info.assert_not_called()
+    mock_session.begin.assert_not_called()
+
+@patch("app.services.order_service.db.session")
+@patch("app.services.order_service.IdempotencyKeyRepository")
+def test_create_order_idempotency_key_with_different_request(mock_keys, mock_session):
+    customer_id = "123e4567-e89b-12d3-a456-426614174000"
+    mock_keys.claim.return_value = None
+    mock_keys.get.return_value = MagicMock(request_hash=hash_order_request({"date": "2023-01-02"}), response={})
+
+    with pytest.raises(ConflictError, match="petición diferente"):
+        OrderService.create_order(customer_id, {"date": "2023-01-01"}, "llave-1")
+
+@patch("app.services.order_service.db.session")
+@patch("app.services.order_service.IdempotencyKeyRepository")
+def test_create_order_seller_idempotency_key_in_progress(mock_keys, mock_session):
+    seller_id = "223e4567-e89b-12d3-a456-426614174111"
+    order_data = {"date": "2023-01-01"}
+    mock_keys.claim.return_value = None
+    mock_keys.get.return_value = MagicMock(request_hash=hash_order_request(order_data), response=None)
+
+    with pytest.raises(ConflictError, match="en proceso"):
+        OrderService.create_order_seller(seller_id, order_data, "llave-1")
+
+@patch("app.services.order_service.IdempotencyKeyRepository")
+def test_create_order_idempotency_key_released_on_error(mock_keys):
+    customer_id = "123e4567-e89b-12d3-a456-426614174000"
+    mock_keys.claim.return_value = 7
+
+    with pytest.raises(BadRequestError):
+        OrderService.create_order(customer_id, {"items": []}, "llave-1")
+
+    mock_keys.release.assert_called_once_with(7)
+
+@patch("app.services.order_service.IdempotencyKeyRepository")
+def test_create_order_idempotency_key_too_long(mock_keys):
+    with pytest.raises(BadRequestError):
+        OrderService.create_order("123e4567-e89b-12d3-a456-426614174000", {}, "x" * 256)
+
+    mock_keys.claim.assert_not_called()
+
+@patch("app.services.order_service.db.session")
+@patch("app.services.order_service.get_products_info")
+@patch("app.services.order_service.decrement_products_stock")
+@patch("app.services.order_service.IdempotencyKeyRepository")
+@patch("app.services.order_service.StockSagaRepository")
+def test_create_order_saves_response_with_idempotency_key(mock_sagas, mock_keys, mock_decrement_stock, mock_get_info, mock_session):
+    customer_id = "123e4567-e89b-12d3-a456-426614174000"
+    product_id = "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d"
+    order_data = {"date": "2023-01-01", "items": [{"id": product_id, "quantity": 2}]}
+    mock_keys.claim.return_value = 7
+    mock_get_info.return_value = {product_id: {"name": "Test Product", "quantity": 10, "unit_amount": 100.0}}
+    mock_decrement_stock.return_value = {"applied": True, "items": [{"product_id": product_id, "success": True, "quantity": 8}]}
+
+    result = OrderService.create_order(customer_id, order_data, "llave-1")
+
+    mock_keys.complete.assert_called_once_with(7, 201, result)
+    mock_keys.release.assert_not_called()
+
+@patch("app.services.order_service.compensate_stock_saga")
+@patch("app.services.order_service.db.session")
+@patch("app.services.order_service.get_products_info")
+@patch("app.services.order_service.decrement_products_stock")
+@patch("app.services.order_service.IdempotencyKeyRepository")
+@patch("app.services.order_service.StockSagaRepository")
+def test_create_order_with_reclaimed_idempotency_key(mock_sagas, mock_keys, mock_decrement_stock, mock_get_info, mock_session, mock_compensate):
+    customer_id = "123e4567-e89b-12d3-a456-426614174000"
+    product_id = "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d"
+    order_data = {"date": "2023-01-01", "items": [{"id": product_id, "quantity": 2}]}
+    mock_keys.claim.return_value = 7
+    mock_keys.complete.return_value = False
+    mock_get_info.return_value = {product_id: {"name": "Test Product", "quantity": 10, "unit_amount": 100.0}}
+    mock_decrement_stock.return_value = {"applied": True, "items": [{"product_id": product_id, "success": True, "quantity": 8}]}
+
+    with pytest.raises(ConflictError, match="en proceso"):
+        OrderService.create_order(customer_id, order_data, "llave-1")
+
+    mock_compensate.assert_called_once()
+    mock_keys.release.assert_called_once_with(7)
+
+def saga_order_data():
+    product_id = "6b7c8d99-3e4f-5a6b-7c8d-9e1f2a3b4c5d"
+    products_info = {product_id: {"name": "Test Product", "quantity": 10, "unit_amount": 100.0}}
+    decrement_result = {"applied": True, "items": [{"product_id": product_id, "success": True, "quantity": 8}]}
+    return {"date": "2023-01-01", "items": [{"id": product_id, "quantity": 2}]}, products_info, decrement_result
+
+@patch("app.services.order_service.db.session")
+@patch("app.services.order_service.get_products_info")
+@patch("app.services.order_service.decrement_products_stock")
+@patch("app.services.order_service.release_products_stock")
+@patch("app.services.order_service.StockSagaRepository")
+@patch("app.services.order_service.OrderRepository.create_order")
+def test_create_order_failure_releases_stock(mock_create, mock_sagas, mock_release, mock_decrement_stock, mock_get_info, mock_session):
+    order_data, mock_get_info.return_value, mock_decrement_stock.return_value = saga_order_data()
+    mock_create.side_effect = SQLAlchemyError("error")
+    mock_release.return_value = True
+
+    with pytest.raises(BadRequestError):
+        OrderService.create_order("123e4567-e89b-12d3-a456-426614174000", order_data)
+
+    saga_id = mock_sagas.start.return_value
+    mock_release.assert_called_once_with([saga_id])
+    mock_sagas.delete_compensated.assert_called_once_with([saga_id])
+    mock_sagas.mark_compensating.assert_not_called()
+
+@patch("app.services.order_service.db.session")
+@patch("app.services.order_service.get_products_info")
+@patch("app.services.order_service.decrement_products_stock")
+@patch("app.services.order_service.release_products_stock")
+@patch("app.services.order_service.StockSagaRepository")
+def test_create_order_failed_release_is_left_to_reconciler(mock_sagas, mock_release, mock_decrement_stock, mock_get_info, mock_session):
+    order_data, mock_get_info.return_value, _ = saga_order_data()
+    mock_decrement_stock.return_value = None
+    mock_release.return_value = False
+
+    with pytest.raises(BadRequestError):
+        OrderService.create_order("123e4567-e89b-12d3-a456-426614174000", order_data)
+
+    saga_id = mock_sagas.start.return_value
+    mock_sagas.mark_compensating.assert_called_once()
+    assert mock_sagas.mark_compensating.call_args[0][0] == saga_id
+    mock_sagas.delete_compensated.assert_not_called()
+
+@patch("app.services.order_service.db.session")
+@patch("app.services.order_service.get_products_info")
+@patch("app.services.order_service.decrement_products_stock")
+@patch("app.services.order_service.release_products_stock")
+@patch("app.services.order_service.StockSagaRepository")
+@patch("app.services.order_service.OrderRepository.create_order")
+def test_create_order_expired_saga_is_not_saved(mock_create, mock_sagas, mock_release, mock_decrement_stock, mock_get_info, mock_session):
+    order_data, mock_get_info.return_value, mock_decrement_stock.return_value = saga_order_data()
+    mock_sagas.complete.return_value = False
+    mock_release.return_value = True
+
+    with pytest.raises(BadRequestError, match="expiró"):
+        OrderService.create_order("123e4567-e89b-12d3-a456-426614174000", order_data)
+
+    mock_create.assert_not_called()
+    mock_release.assert_called_once()
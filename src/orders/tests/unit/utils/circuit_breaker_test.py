@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+def failing():
+    raise ConnectionError("sin conexión")
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("products", failure_threshold=3, reset_seconds=30)
+    open_breaker(breaker)
+
+    assert breaker.state == OPEN
+    func = MagicMock()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(func)
+    func.assert_not_called()
+    assert breaker.stats() == {"state": OPEN, "failures": 3, "rejected": 1}
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("products", failure_threshold=2, reset_seconds=30)
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.call(lambda: "ok") == "ok"
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+
+    assert breaker.state == CLOSED
+
+def test_exceptions_outside_failure_exceptions_do_not_count():
+    breaker = CircuitBreaker("products", failure_threshold=1, reset_seconds=30, failure_exceptions=(ConnectionError,))
+    with pytest.raises(ValueError):
+        breaker.call(MagicMock(side_effect=ValueError()))
+
+    assert breaker.state == CLOSED
+
+@patch("app.utils.circuit_breaker.time.monotonic")
+def test_half_open_allows_a_single_probe(mock_monotonic):
+    mock_monotonic.return_value = 100
+    breaker = CircuitBreaker("products", failure_threshold=1, reset_seconds=30)
+    open_breaker(breaker)
+
+    mock_monotonic.return_value = 131
+    assert breaker.allow_request() is True
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+@patch("app.utils.circuit_breaker.time.monotonic")
+def test_failed_probe_opens_again(mock_monotonic):
+    mock_monotonic.return_value = 100
+    breaker = CircuitBreaker("products", failure_threshold=1, reset_seconds=30)
+    open_breaker(breaker)
+
+    mock_monotonic.return_value = 131
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+
+    assert breaker.state == OPEN
+    mock_monotonic.return_value = 140
+    with pytest.raises(CircuitOpenError):
+        breaker.call(failing)
@@ -0,0 +1,44 @@
+import threading
+import time
+import pytest
+from app.utils.concurrency_util import run_concurrently
+
+def test_run_concurrently_keeps_input_order():
+    def slow_double(value):
+        time.sleep(0.01 * (5 - value))
+        return value * 2
+
+    assert run_concurrently(slow_double, [1, 2, 3, 4], max_workers=4) == [2, 4, 6, 8]
+
+def test_run_concurrently_respects_max_workers():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def task(value):
+        with lock:
+            running.append(value)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(value)
+        return value
+
+    run_concurrently(task, range(8), max_workers=3)
+
+    assert max(peak) <= 3
+
+def test_run_concurrently_raises_first_error_in_input_order():
+    def task(value):
+        if value == 1:
+            time.sleep(0.05)
+            raise ValueError("error en 1")
+        if value == 3:
+            raise KeyError("error en 3")
+        return value
+
+    with pytest.raises(ValueError, match="error en 1"):
+        run_concurrently(task, [0, 1, 2, 3], max_workers=4)
+
+def test_run_concurrently_sequential_mode():
+    assert run_concurrently(lambda value: value + 1, [1, 2], max_workers=1) == [2, 3]
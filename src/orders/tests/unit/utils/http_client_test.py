@@ -0,0 +1,77 @@
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+from app.utils import http_client
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    http_client.reset_metrics()
+    yield
+    http_client.reset_metrics()
+
+@pytest.fixture
+def mock_session():
+    session = MagicMock()
+    with patch("app.utils.http_client.get_session", return_value=session), \
+         patch("app.utils.http_client.time.sleep") as mock_sleep:
+        session.sleep = mock_sleep
+        yield session
+
+def test_get_session_is_reused():
+    assert http_client.get_session() is http_client.get_session()
+
+def test_request_uses_default_timeout(mock_session):
+    mock_session.request.return_value = MagicMock(status_code=200)
+
+    http_client.get("http://products/products/1", upstream="products")
+
+    mock_session.request.assert_called_once_with(
+        "GET", "http://products/products/1",
+        timeout=(http_client.CONNECT_TIMEOUT, http_client.READ_TIMEOUT)
+    )
+
+def test_idempotent_request_retries_on_unavailable(mock_session):
+    mock_session.request.side_effect = [MagicMock(status_code=503), MagicMock(status_code=200)]
+
+    response = http_client.get("http://products/products/1", upstream="products")
+
+    assert response.status_code == 200
+    assert mock_session.request.call_count == 2
+    mock_session.sleep.assert_called_once()
+    metrics = http_client.get_metrics()["products"]
+    assert metrics["requests"] == 2
+    assert metrics["errors"] == 1
+    assert metrics["retries"] == 1
+
+def test_idempotent_request_raises_after_max_retries(mock_session):
+    mock_session.request.side_effect = requests.ConnectionError("sin conexión")
+
+    with pytest.raises(requests.ConnectionError):
+        http_client.get("http://users/verify", upstream="users")
+
+    assert mock_session.request.call_count == http_client.MAX_RETRIES + 1
+    assert http_client.get_metrics()["users"]["errors"] == http_client.MAX_RETRIES + 1
+
+def test_post_is_not_retried_by_default(mock_session):
+    mock_session.request.return_value = MagicMock(status_code=503)
+
+    response = http_client.post("http://products/products/stock/decrement", upstream="products")
+
+    assert response.status_code == 503
+    mock_session.request.assert_called_once()
+    mock_session.sleep.assert_not_called()
+
+def test_post_marked_idempotent_is_retried(mock_session):
+    mock_session.request.side_effect = [requests.Timeout("lento"), MagicMock(status_code=200)]
+
+    response = http_client.post("http://products/products/batch", upstream="products", idempotent=True)
+
+    assert response.status_code == 200
+    assert mock_session.request.call_count == 2
+
+def test_upstream_defaults_to_host(mock_session):
+    mock_session.request.return_value = MagicMock(status_code=200)
+
+    http_client.get("http://product_app:5003/products/1")
+
+    assert "product_app:5003" in http_client.get_metrics()
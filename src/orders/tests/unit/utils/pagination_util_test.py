@@ -0,0 +1,25 @@
+import uuid
+import pytest
+from datetime import datetime
+from app.exceptions.http_exceptions import BadRequestError
+from app.utils.pagination_util import parse_limit, encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+def test_parse_limit_defaults_and_caps():
+    assert parse_limit(None) == DEFAULT_PAGE_SIZE
+    assert parse_limit("5") == 5
+    assert parse_limit(str(MAX_PAGE_SIZE + 1)) == MAX_PAGE_SIZE
+
+@pytest.mark.parametrize("value", ["abc", "0", "-3"])
+def test_parse_limit_invalid(value):
+    with pytest.raises(BadRequestError):
+        parse_limit(value)
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 5, 20, 10, 30, 15, 123456)
+    order_id = uuid.uuid4()
+
+    assert decode_cursor(encode_cursor(created_at, order_id)) == (created_at, order_id)
+
+def test_decode_empty_cursor():
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
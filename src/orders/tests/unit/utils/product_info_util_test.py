@@ -0,0 +1,184 @@
+import os
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+from flask import Flask
+from app.utils import product_info_util
+from app.utils.product_info_util import get_products_info, get_product_info, decrement_products_stock, invalidate_products, products_breaker, products_cache, last_known_products
+from app.utils.circuit_breaker import OPEN
+from app.exceptions.http_exceptions import ServiceUnavailableError
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    return app
+
+@pytest.fixture(autouse=True)
+def reset_products_breaker():
+    products_breaker.reset()
+    products_cache.clear()
+    last_known_products.clear()
+    yield
+    products_breaker.reset()
+    products_cache.clear()
+    last_known_products.clear()
+
+def batch_response(ids):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"data": [{"id": id, "name": f"Producto {id}"} for id in ids]}
+    return response
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.post")
+def test_get_products_info_single_batch_call(mock_post, app):
+    mock_post.side_effect = lambda url, **kwargs: batch_response(kwargs["json"]["ids"])
+
+    with app.test_request_context(headers={"Authorization": "Bearer token"}):
+        result = get_products_info(["A", "b", "a"])
+
+    assert list(result.keys()) == ["a", "b"]
+    mock_post.assert_called_once()
+    assert mock_post.call_args.kwargs["json"] == {"ids": ["a", "b"]}
+    assert mock_post.call_args.kwargs["headers"]["Authorization"] == "Bearer token"
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.post")
+def test_get_products_info_reuses_request_memo(mock_post, app):
+    mock_post.side_effect = lambda url, **kwargs: batch_response(kwargs["json"]["ids"])
+
+    with app.test_request_context():
+        get_products_info(["a", "b"])
+        result = get_products_info(["b", "c"])
+
+    assert list(result.keys()) == ["b", "c"]
+    assert mock_post.call_count == 2
+    assert mock_post.call_args.kwargs["json"] == {"ids": ["c"]}
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.post")
+def test_get_products_info_splits_in_chunks(mock_post, app):
+    mock_post.side_effect = lambda url, **kwargs: batch_response(kwargs["json"]["ids"])
+    ids = [str(i) for i in range(product_info_util.PRODUCTS_BATCH_SIZE + 1)]
+
+    with app.test_request_context():
+        result = get_products_info(ids)
+
+    assert len(result) == len(ids)
+    assert mock_post.call_count == 2
+
+@patch("app.utils.product_info_util.http_client.post")
+def test_get_products_info_empty_ids(mock_post, app):
+    with app.test_request_context():
+        assert get_products_info([]) == {}
+    mock_post.assert_not_called()
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.get")
+@patch("app.utils.product_info_util.http_client.post")
+def test_get_products_info_falls_back_to_single_lookups(mock_post, mock_get, app):
+    mock_post.return_value = MagicMock(status_code=405)
+
+    def single_response(url, **kwargs):
+        product_id = url.rsplit("/", 1)[-1]
+        if product_id == "missing":
+            return MagicMock(status_code=400)
+        return MagicMock(status_code=200, json=lambda: {"data": {"id": product_id}})
+    mock_get.side_effect = single_response
+
+    with app.test_request_context():
+        result = get_products_info(["a", "missing", "b"])
+
+    assert result == {"a": {"id": "a"}, "b": {"id": "b"}}
+    assert mock_get.call_count == 3
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.post")
+def test_get_products_info_unavailable_raises_503(mock_post, app):
+    mock_post.side_effect = requests.ConnectionError()
+
+    with app.test_request_context():
+        with pytest.raises(ServiceUnavailableError):
+            get_products_info(["a"])
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.post")
+def test_get_products_info_allow_stale_uses_last_known(mock_post, app):
+    mock_post.side_effect = lambda url, **kwargs: batch_response(kwargs["json"]["ids"])
+    with app.test_request_context():
+        get_products_info(["a"])
+
+    mock_post.side_effect = None
+    mock_post.return_value = MagicMock(status_code=503)
+    with app.test_request_context():
+        result = get_products_info(["a", "b"], allow_stale=True)
+
+    assert result == {"a": {"id": "a", "name": "Producto a"}}
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.post")
+def test_open_breaker_fails_fast(mock_post, app):
+    mock_post.side_effect = requests.Timeout()
+    for _ in range(products_breaker.failure_threshold):
+        with app.test_request_context():
+            get_products_info(["a"], allow_stale=True)
+
+    assert products_breaker.state == OPEN
+    mock_post.reset_mock()
+    with app.test_request_context():
+        assert get_products_info(["a"], allow_stale=True) == {}
+        with pytest.raises(ServiceUnavailableError):
+            decrement_products_stock([{"product_id": "a", "quantity_ordered": 1}])
+    mock_post.assert_not_called()
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.get")
+def test_get_product_info_falls_back_to_last_known(mock_get, app):
+    mock_get.return_value = MagicMock(status_code=200, json=lambda: {"data": {"id": "a"}})
+    with app.test_request_context():
+        assert get_product_info("A") == {"data": {"id": "a"}}
+
+    invalidate_products(["a"])
+    mock_get.side_effect = requests.ConnectionError()
+    with app.test_request_context():
+        assert get_product_info("a") == {"data": {"id": "a"}}
+        assert get_product_info("b") is None
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.post")
+def test_get_products_info_cached_skips_known_products(mock_post, app):
+    mock_post.side_effect = lambda url, **kwargs: batch_response(kwargs["json"]["ids"])
+    with app.test_request_context():
+        get_products_info(["a"])
+
+    with app.test_request_context():
+        result = get_products_info(["a", "b"], cached=True)
+
+    assert list(result.keys()) == ["a", "b"]
+    assert mock_post.call_args.kwargs["json"] == {"ids": ["b"]}
+    assert products_cache.stats()["hits"] == 1
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.post")
+def test_get_products_info_without_cache_always_fetches(mock_post, app):
+    mock_post.side_effect = lambda url, **kwargs: batch_response(kwargs["json"]["ids"])
+    with app.test_request_context():
+        get_products_info(["a"])
+    with app.test_request_context():
+        get_products_info(["a"])
+
+    assert mock_post.call_count == 2
+
+@patch.dict(os.environ, {"PATH_API_BASE": "http://products"})
+@patch("app.utils.product_info_util.http_client.post")
+def test_invalidate_products_forces_refetch(mock_post, app):
+    mock_post.side_effect = lambda url, **kwargs: batch_response(kwargs["json"]["ids"])
+    with app.test_request_context():
+        get_products_info(["a", "b"])
+
+    invalidate_products(["A"])
+    with app.test_request_context():
+        get_products_info(["a", "b"], cached=True)
+
+    assert mock_post.call_args.kwargs["json"] == {"ids": ["a"]}
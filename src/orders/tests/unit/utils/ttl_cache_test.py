@@ -0,0 +1,40 @@
+from unittest.mock import patch
+from app.utils.ttl_cache import TTLCache
+
+def test_get_returns_value_before_expiration():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 0}
+
+@patch("app.utils.ttl_cache.time.monotonic")
+def test_get_expired_entry_is_a_miss(mock_monotonic):
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    mock_monotonic.return_value = 100
+    cache.set("a", 1)
+
+    mock_monotonic.return_value = 161
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_delete_and_clear():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
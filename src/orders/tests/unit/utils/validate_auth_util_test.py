@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from flask import Flask
+from app.utils import validate_auth_util
+from app.utils.validate_auth_util import get_authenticated_user_id, refresh_blocked_users
+from app.exceptions.http_exceptions import ForbiddenError, UnauthorizedError
+
+USER_ID = "4e49e816-e4b0-4d94-974b-8b35d905ae21"
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    return app
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    validate_auth_util.verified_users.clear()
+    validate_auth_util.blocked_users = frozenset()
+    yield
+    validate_auth_util.verified_users.clear()
+    validate_auth_util.blocked_users = frozenset()
+
+@patch("app.utils.validate_auth_util.check_auth")
+@patch("app.utils.validate_auth_util.get_jwt")
+def test_get_authenticated_user_id_verifies_once_per_token(mock_get_jwt, mock_check_auth, app):
+    mock_get_jwt.return_value = {"jti": "token-1", "sub": USER_ID}
+    mock_check_auth.return_value = {"id": USER_ID}
+
+    with app.test_request_context(headers={"Authorization": "Bearer token"}):
+        assert get_authenticated_user_id() == USER_ID
+        assert get_authenticated_user_id() == USER_ID
+
+    mock_check_auth.assert_called_once_with("Bearer token")
+
+@patch("app.utils.validate_auth_util.check_auth")
+@patch("app.utils.validate_auth_util.get_jwt")
+def test_get_authenticated_user_id_rejects_blocked_user(mock_get_jwt, mock_check_auth, app):
+    mock_get_jwt.return_value = {"jti": "token-1", "sub": USER_ID}
+    validate_auth_util.verified_users.set("token-1", USER_ID)
+    validate_auth_util.blocked_users = frozenset([USER_ID])
+
+    with app.test_request_context(headers={"Authorization": "Bearer token"}):
+        with pytest.raises(ForbiddenError, match="Tu cuenta ha sido bloqueada"):
+            get_authenticated_user_id()
+
+    mock_check_auth.assert_not_called()
+    assert validate_auth_util.verified_users.get("token-1") is None
+
+def test_get_authenticated_user_id_without_token(app):
+    with app.test_request_context():
+        with pytest.raises(UnauthorizedError, match="Token no enviado"):
+            get_authenticated_user_id()
+
+@patch("app.utils.validate_auth_util.get_auth_header", return_value="Bearer service")
+@patch("app.utils.validate_auth_util.http_client.get")
+def test_refresh_blocked_users(mock_get, mock_auth_header, app):
+    mock_get.return_value = MagicMock(status_code=200, json=lambda: {"data": [USER_ID]})
+
+    refresh_blocked_users(app)
+
+    assert validate_auth_util.blocked_users == frozenset([USER_ID])
+
+@patch("app.utils.validate_auth_util.get_auth_header", return_value="Bearer service")
+@patch("app.utils.validate_auth_util.http_client.get")
+def test_refresh_blocked_users_keeps_last_list_on_failure(mock_get, mock_auth_header, app):
+    validate_auth_util.blocked_users = frozenset([USER_ID])
+    mock_get.side_effect = Exception("sin conexión")
+
+    refresh_blocked_users(app)
+
+    assert validate_auth_util.blocked_users == frozenset([USER_ID])
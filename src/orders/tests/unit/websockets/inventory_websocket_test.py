@@ -1,7 +1,10 @@
 import pytest
 from flask import Flask
 from app.extensions import socketio
-from app.websockets.inventory_websocket import connected_sellers, notify_inventory_update
+from app.websockets import inventory_websocket
+from app.websockets.inventory_websocket import (
+    connected_sellers, sellers_by_sid, notify_inventory_update, coalesce_inventory_updates
+)
 
 @pytest.fixture
 def app():
@@ -10,14 +13,31 @@ def app():
     socketio.init_app(app, cors_allowed_origins="*")
     return app
 
+def inventory_messages(client):
+    return [message["args"][0] for message in client.get_received() if message["name"] == "inventory_update"]
+
 def test_connect_and_disconnect(app):
     client = socketio.test_client(app, query_string='seller_id=seller123')
     
     assert client.is_connected()
     assert 'seller123' in connected_sellers
+    assert connected_sellers['seller123'] in sellers_by_sid
 
+    sid = connected_sellers['seller123']
     client.disconnect()
     assert 'seller123' not in connected_sellers
+    assert sid not in sellers_by_sid
+
+def test_reconnect_keeps_latest_connection(app):
+    first = socketio.test_client(app, query_string='seller_id=seller456')
+    second = socketio.test_client(app, query_string='seller_id=seller456')
+    latest_sid = connected_sellers['seller456']
+
+    first.disconnect()
+    assert connected_sellers['seller456'] == latest_sid
+
+    second.disconnect()
+    assert 'seller456' not in connected_sellers
 
 def test_inventory_update_emits_to_all(app, mocker):
     client1 = socketio.test_client(app, query_string='seller_id=1')
@@ -29,14 +49,35 @@ def test_inventory_update_emits_to_all(app, mocker):
 
     emit_spy = mocker.spy(socketio, 'emit')
     
-    notify_inventory_update(products)
+    assert notify_inventory_update(products) is True
 
     calls = [call for call in emit_spy.call_args_list if call[0][0] == 'inventory_update']
-    assert len(calls) == 2
+    assert len(calls) == 1
+    assert inventory_messages(client1)[0]["products"] == products
+    assert inventory_messages(client2)[0]["products"] == products
 
     client1.disconnect()
     client2.disconnect()
 
+def test_inventory_update_reaches_category_rooms(app):
+    all_categories = socketio.test_client(app, query_string='seller_id=10')
+    dairy = socketio.test_client(app, query_string='seller_id=11&categories=dairy')
+    grains = socketio.test_client(app, query_string='seller_id=12&categories=grains,bakery')
+    products = [
+        {'product_id': 'p1', 'name': 'Leche', 'new_quantity': 5, 'category': 'dairy'},
+        {'product_id': 'p2', 'name': 'Avena', 'new_quantity': 4, 'category': 'grains'}
+    ]
+
+    notify_inventory_update(products)
+
+    assert inventory_messages(all_categories)[0]["products"] == products
+    assert inventory_messages(dairy)[0]["products"] == [products[0]]
+    assert inventory_messages(grains)[0]["products"] == [products[1]]
+
+    all_categories.disconnect()
+    dairy.disconnect()
+    grains.disconnect()
+
 def test_emit_fails_and_sends_error(app, mocker):
     client = socketio.test_client(app, query_string='seller_id=error_test')
     products = [
@@ -51,6 +92,21 @@ def test_emit_fails_and_sends_error(app, mocker):
         return emit_original(event, data, to=to)
 
     mocker.patch('app.extensions.socketio.emit', side_effect=faulty_emit)
-    notify_inventory_update(products)
+    assert notify_inventory_update(products) is False
+
+    client.disconnect()
+
+def test_coalesce_keeps_last_update_per_product():
+    updates = [
+        {'product_id': 'p1', 'name': 'Avena', 'new_quantity': 10},
+        {'product_id': 'p2', 'name': 'Leche', 'new_quantity': 3},
+        {'product_id': 'p1', 'name': 'Avena', 'new_quantity': 8}
+    ]
+
+    assert coalesce_inventory_updates(updates) == [
+        {'product_id': 'p2', 'name': 'Leche', 'new_quantity': 3},
+        {'product_id': 'p1', 'name': 'Avena', 'new_quantity': 8}
+    ]
 
-    client.disconnect()
\ No newline at end of file
+def test_coalesce_without_updates():
+    assert coalesce_inventory_updates([]) == []
@@ -0,0 +1,64 @@
+import pytest
+from flask import Flask
+from flask_socketio import SocketIO
+from app.extensions import socketio, socketio_queue_options
+from app.websockets.inventory_websocket import handle_connect, handle_disconnect, notify_inventory_update
+from app.websockets.local_pubsub_manager import LocalPubSubManager
+
+@pytest.fixture
+def workers():
+    """
+    Dos servidores Socket.IO conectados por la cola local, como dos workers de gunicorn.
+    El primero es el servidor de la aplicación, que es el que emite las notificaciones.
+    """
+    app_a = Flask(__name__)
+    app_b = Flask(__name__)
+    socketio.init_app(app_a, **socketio_queue_options({"SOCKETIO_MESSAGE_QUEUE": "local", "SOCKETIO_CHANNEL": "test"}))
+
+    worker_b = SocketIO(async_mode="eventlet")
+    worker_b.on_event('connect', handle_connect)
+    worker_b.on_event('disconnect', handle_disconnect)
+    worker_b.init_app(app_b, client_manager=LocalPubSubManager(channel="test"))
+
+    yield (app_a, socketio), (app_b, worker_b)
+
+    socketio.server_options.pop('client_manager', None)
+    LocalPubSubManager.reset()
+
+def inventory_messages(client):
+    return [message["args"][0] for message in client.get_received() if message["name"] == "inventory_update"]
+
+def test_queue_options_without_queue_keeps_single_process():
+    assert socketio_queue_options({"SOCKETIO_MESSAGE_QUEUE": None, "SOCKETIO_CHANNEL": "test"}) == {}
+
+def test_queue_options_for_external_queue():
+    options = socketio_queue_options({"SOCKETIO_MESSAGE_QUEUE": "redis://redis:6379/0", "SOCKETIO_CHANNEL": "test"})
+
+    assert options == {"message_queue": "redis://redis:6379/0", "channel": "test"}
+
+def test_inventory_update_reaches_sellers_on_every_worker(workers):
+    (app_a, worker_a), (app_b, worker_b) = workers
+    seller_a = worker_a.test_client(app_a, query_string='seller_id=a')
+    seller_b = worker_b.test_client(app_b, query_string='seller_id=b')
+    dairy_b = worker_b.test_client(app_b, query_string='seller_id=c&categories=dairy')
+    products = [{'product_id': 'p1', 'name': 'Leche', 'new_quantity': 5, 'category': 'dairy'}]
+
+    assert notify_inventory_update(products) is True
+
+    assert inventory_messages(seller_a)[0]["products"] == products
+    assert inventory_messages(seller_b)[0]["products"] == products
+    assert inventory_messages(dairy_b)[0]["products"] == products
+
+    seller_a.disconnect()
+    seller_b.disconnect()
+    dairy_b.disconnect()
+
+def test_removed_subscriber_stops_receiving(workers):
+    (app_a, worker_a), (app_b, worker_b) = workers
+    seller_b = worker_b.test_client(app_b, query_string='seller_id=b')
+    worker_b.server.manager.close()
+
+    notify_inventory_update([{'product_id': 'p1', 'name': 'Leche', 'new_quantity': 5}])
+
+    assert inventory_messages(seller_b) == []
+    seller_b.disconnect()
@@ -5,6 +5,7 @@ from app.core.config import Config
 from app.core.routes import register_routes
 from app.core.database import init_db
 from app.core.jwt import init_jwt
+from app.jobs.product_import_job import recover_product_imports
 
 def create_app(config = Config):
     allowed_origins = os.getenv("ALLOWED_ORIGINS").split(",")
@@ -14,5 +15,6 @@ def create_app(config = Config):
     init_db(app)
     init_jwt(app)    
     register_routes(app)
+    recover_product_imports(app)
     
     return app
\ No newline at end of file
@@ -1,8 +1,11 @@
-from flask import Blueprint, request
+from flask import Blueprint, request, current_app
 from app.models.category_model import CategorySchema
 from app.models.product_model import ProductSchema
-from app.services.product_service import ProductService
-from app.exceptions.http_exceptions import BadRequestError
+from app.models.product_import_model import ProductImportSchema, ProductImportErrorSchema
+from app.services.product_service import ProductService, IMPORT_ERRORS_PAGE_SIZE, IMPORT_ERRORS_MAX_PAGE_SIZE, parse_catalog_fields
+from app.utils.pagination_util import parse_limit
+from app.jobs.product_import_job import start_product_import
+from app.exceptions.http_exceptions import BadRequestError, NotFoundError
 from app.utils.response_util import format_response
 from flask_jwt_extended import jwt_required
 from app.utils.validate_role import validate_role
@@ -11,6 +14,10 @@ product_bp = Blueprint('product', __name__, url_prefix='/products')
 product_schema = ProductSchema()
 products_schema = ProductSchema(many=True)
 categories_schema = CategorySchema(many=True)
+# Cualquiera de estos parámetros activa la paginación del catálogo; sin ellos se retorna la lista completa
+CATALOG_QUERY_PARAMS = ('limit', 'cursor', 'fields', 'category_id', 'manufacturer_id', 'in_stock', 'min_price', 'max_price')
+product_import_schema = ProductImportSchema()
+product_import_errors_schema = ProductImportErrorSchema(many=True)
 
 
 @product_bp.route('', methods=['POST'])
@@ -29,8 +36,25 @@ def create_product():
 @validate_role(["admin", "seller", "customer"])
 def get_products():
   try:
-    products = ProductService.get_all()
-    return format_response("success", 200, "Productos obtenidos con éxito", products_schema.dump(products))
+    if not any(param in request.args for param in CATALOG_QUERY_PARAMS):
+      products = ProductService.get_all()
+      return format_response("success", 200, "Productos obtenidos con éxito", products_schema.dump(products))
+
+    limit = parse_limit(request.args.get('limit'))
+    fields = parse_catalog_fields(request.args.get('fields'))
+    products, next_cursor = ProductService.get_catalog_page(
+      limit,
+      request.args.get('cursor'),
+      fields,
+      category_id=request.args.get('category_id'),
+      manufacturer_id=request.args.get('manufacturer_id'),
+      in_stock=request.args.get('in_stock'),
+      min_price=request.args.get('min_price'),
+      max_price=request.args.get('max_price')
+    )
+    schema = ProductSchema(many=True, only=fields) if fields else products_schema
+    return format_response("success", 200, "Productos obtenidos con éxito", schema.dump(products),
+                           meta={"limit": limit, "next_cursor": next_cursor})
   except BadRequestError as e:
     return format_response("error", e.code, error=e.description)
   
@@ -43,6 +67,16 @@ def get_product_by_id(product_id):
     except BadRequestError as e:
         return format_response("error", e.code, error=e.description)        
 
+@product_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def get_products_by_ids():
+    try:
+        request_data = request.get_json() or {}
+        products = ProductService.get_products_by_ids(request_data.get("ids"))
+        return format_response("success", 200, "Productos obtenidos con éxito", products_schema.dump(products))
+    except BadRequestError as e:
+        return format_response("error", e.code, error=e.description)
+
 @product_bp.route('/ping', methods=['GET'])
 def ping():
   return format_response("success", 200, "pong")
@@ -62,6 +96,28 @@ def update_product_quantity(product_id):
     except BadRequestError as e:
         return format_response("error", e.code, error=e.description)
     
+@product_bp.route('/stock/decrement', methods=['POST'])
+@jwt_required()
+def decrement_products_stock():
+    try:
+        request_data = request.get_json() or {}
+        result = ProductService.decrement_stock(request_data)
+        if not result["applied"]:
+            return format_response("error", 409, error="No hay suficiente stock para uno o más productos", data=result)
+        return format_response("success", 200, "Stock de los productos actualizado con éxito", result)
+    except BadRequestError as e:
+        return format_response("error", e.code, error=e.description)
+    
+@product_bp.route('/stock/release', methods=['POST'])
+@jwt_required()
+def release_products_stock():
+    try:
+        request_data = request.get_json() or {}
+        result = ProductService.release_stock(request_data)
+        return format_response("success", 200, "Stock de los productos liberado con éxito", result)
+    except BadRequestError as e:
+        return format_response("error", e.code, error=e.description)
+
 @product_bp.route('/category/<string:category_id>', methods=['GET'])
 @jwt_required()
 @validate_role(["admin", "seller"])
@@ -97,11 +153,44 @@ def save_products_bulk():
     return format_response("error", 400, "Debe enviar una lista de productos válida")
    
   try:
-    quantity = ProductService.bulk_save_products(data['products'])
-    return format_response("sucess", 201, f"{quantity} productos guardados exitosamente.")
+    inserted, updated = ProductService.bulk_save_products(data['products'], data.get('upsert') is True)
+    return format_response("sucess", 201, f"{inserted + updated} productos guardados exitosamente.",
+                           {"inserted": inserted, "updated": updated})
   except BadRequestError as e:
     return BadRequestError(f"Error al guardar los productos: {str(e)}")
   
+@product_bp.route('/imports', methods=['POST'])
+@jwt_required()
+@validate_role(["admin"])
+def create_products_import():
+  file = request.files.get('file')
+  if not file:
+    return format_response("error", 400, "Debe cargar un archivo válido")
+  try:
+    upsert_by_name = request.form.get('upsert', '').strip().lower() in ('true', '1')
+    product_import, path = ProductService.create_import(file, upsert_by_name)
+    start_product_import(current_app._get_current_object(), product_import.id, path, upsert_by_name)
+    return format_response("success", 202, "Carga de productos iniciada", product_import_schema.dump(product_import))
+  except BadRequestError as e:
+    return format_response("error", e.code, error=e.description)
+
+@product_bp.route('/imports/<string:import_id>', methods=['GET'])
+@jwt_required()
+@validate_role(["admin"])
+def get_products_import(import_id):
+  try:
+    limit = request.args.get('limit', IMPORT_ERRORS_PAGE_SIZE, type=int)
+    after = request.args.get('after', type=int)
+    if limit < 1 or limit > IMPORT_ERRORS_MAX_PAGE_SIZE:
+      raise BadRequestError(f"limit debe estar entre 1 y {IMPORT_ERRORS_MAX_PAGE_SIZE}")
+    product_import, errors, next_after = ProductService.get_import(import_id, limit, after)
+    data = product_import_schema.dump(product_import)
+    data["errors"] = product_import_errors_schema.dump(errors)
+    return format_response("success", 200, "Carga de productos obtenida con éxito", data,
+                           meta={"limit": limit, "next_after": next_after})
+  except (BadRequestError, NotFoundError) as e:
+    return format_response("error", e.code, error=e.description)
+
 @product_bp.route('/categories', methods=['GET'])
 @jwt_required()
 @validate_role(["seller"])
@@ -0,0 +1,34 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from app.core.database import db
+from app.services.product_service import ProductService
+
+# Cargas de productos que se procesan a la vez; las demás esperan en la cola del executor
+PRODUCT_IMPORT_WORKERS = int(os.getenv("PRODUCT_IMPORT_WORKERS", "1"))
+
+import_executor = ThreadPoolExecutor(max_workers=PRODUCT_IMPORT_WORKERS, thread_name_prefix="product-import")
+
+def run_product_import(app, import_id, path, upsert_by_name):
+  with app.app_context():
+    ProductService.process_import(import_id, path, upsert_by_name)
+
+def start_product_import(app, import_id, path, upsert_by_name=False):
+  """
+  Procesa la carga en un hilo del executor para responder la petición sin esperar el archivo completo.
+  Si el proceso se reinicia antes de terminar, recover_product_imports la marca como fallida.
+  """
+  return import_executor.submit(run_product_import, app, import_id, path, upsert_by_name)
+
+def recover_product_imports(app):
+  """
+  Se ejecuta al iniciar: marca FAILED las cargas que dejó sin terminar un proceso anterior.
+  Solo toma las que llevan PRODUCT_IMPORT_STALE_SECONDS sin avance, así no afecta las cargas
+  en curso de otros workers o réplicas.
+  """
+  with app.app_context():
+    try:
+      return ProductService.fail_stale_imports()
+    except Exception as e:
+      db.session.rollback()
+      print(f"⚠️ No fue posible revisar las cargas de productos interrumpidas: {e}")
+      return []
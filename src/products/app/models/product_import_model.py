@@ -0,0 +1,89 @@
+import enum
+import uuid
+from app.core.database import db, ma
+from sqlalchemy.dialects.postgresql import UUID
+from marshmallow import fields
+
+class ProductImportStatusEnum(enum.Enum):
+  PENDING = "PENDING"
+  PROCESSING = "PROCESSING"
+  COMPLETED = "COMPLETED"
+  FAILED = "FAILED"
+
+class ProductImport(db.Model):
+  """
+  Carga masiva de productos procesada en segundo plano. Los contadores se actualizan al
+  terminar cada bloque del archivo, en la misma transacción que inserta sus productos.
+  """
+  __tablename__ = 'product_imports'
+
+  id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+  filename = db.Column(db.String(255), nullable=False)
+  status = db.Column(db.Enum(ProductImportStatusEnum), nullable=False)
+  # Los productos cuyo nombre ya existe se actualizan en lugar de insertarse de nuevo
+  upsert_by_name = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+  processed_rows = db.Column(db.Integer, nullable=False, default=0)
+  inserted_rows = db.Column(db.Integer, nullable=False, default=0)
+  updated_rows = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+  error_rows = db.Column(db.Integer, nullable=False, default=0)
+  error = db.Column(db.Text, nullable=True)
+
+  created_at = db.Column(db.DateTime, server_default=db.func.now())
+  updated_at = db.Column(db.DateTime, server_default=db.func.now(), server_onupdate=db.func.now())
+  finished_at = db.Column(db.DateTime, nullable=True)
+
+  def __init__(self, filename, upsert_by_name=False):
+    self.id = uuid.uuid4()
+    self.filename = filename
+    self.status = ProductImportStatusEnum.PENDING
+    self.upsert_by_name = upsert_by_name
+    self.processed_rows = 0
+    self.inserted_rows = 0
+    self.updated_rows = 0
+    self.error_rows = 0
+
+    super().__init__()
+
+class ProductImportError(db.Model):
+  """
+  Fila del archivo que no pasó la validación, con sus valores y los mensajes de error.
+  """
+  __tablename__ = 'product_import_errors'
+  __table_args__ = (
+    db.Index('ix_product_import_errors_import_id_row_number', 'import_id', 'row_number'),
+  )
+
+  id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+  import_id = db.Column(UUID(as_uuid=True), db.ForeignKey('product_imports.id'), nullable=False)
+  row_number = db.Column(db.Integer, nullable=False)
+  row = db.Column(db.JSON, nullable=False)
+  errors = db.Column(db.JSON, nullable=False)
+
+class ProductImportSchema(ma.Schema):
+  status = fields.Function(lambda obj: obj.status.value)
+
+  class Meta:
+    model = ProductImport
+    fields = (
+      'id',
+      'filename',
+      'status',
+      'upsert_by_name',
+      'processed_rows',
+      'inserted_rows',
+      'updated_rows',
+      'error_rows',
+      'error',
+      'created_at',
+      'updated_at',
+      'finished_at'
+    )
+
+class ProductImportErrorSchema(ma.Schema):
+  class Meta:
+    model = ProductImportError
+    fields = (
+      'row_number',
+      'row',
+      'errors'
+    )
@@ -5,6 +5,10 @@ from sqlalchemy.dialects.postgresql import UUID
 
 class Product(db.Model):
   __tablename__ = 'products'
+  __table_args__ = (
+    # Orden y cursor de la paginación del catálogo; también lo usa el upsert por nombre
+    db.Index('ix_products_name_id', 'name', 'id'),
+  )
     
   id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
   name = db.Column(db.String(120), nullable=False)
@@ -14,7 +18,7 @@ class Product(db.Model):
   image_url = db.Column(db.String(255), nullable=True)
   
   manufacturer_id = db.Column(UUID(as_uuid=True), nullable=False)
-  category_id = db.Column(UUID(as_uuid=True), nullable=False)
+  category_id = db.Column(UUID(as_uuid=True), nullable=False, index=True)
   
   created_at = db.Column(db.DateTime, server_default=db.func.now())
   updated_at = db.Column(db.DateTime, server_default=db.func.now(), server_onupdate=db.func.now())
@@ -0,0 +1,22 @@
+import enum
+from app.core.database import db
+from sqlalchemy.dialects.postgresql import UUID
+
+class StockReservationStatusEnum(enum.Enum):
+  APPLIED = "APPLIED"
+  RELEASED = "RELEASED"
+
+class StockReservation(db.Model):
+  """
+  Descuento de stock identificado por la referencia que envía el servicio de pedidos.
+  Permite repetir un descuento o su liberación sin aplicarlos dos veces.
+  """
+  __tablename__ = 'stock_reservations'
+
+  reference = db.Column(UUID(as_uuid=True), primary_key=True)
+  # {product_id: cantidad descontada}
+  items = db.Column(db.JSON, nullable=False)
+  status = db.Column(db.Enum(StockReservationStatusEnum), nullable=False)
+
+  created_at = db.Column(db.DateTime, server_default=db.func.now())
+  updated_at = db.Column(db.DateTime, server_default=db.func.now(), server_onupdate=db.func.now())
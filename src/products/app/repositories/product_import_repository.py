@@ -0,0 +1,99 @@
+from app.models.product_import_model import ProductImport, ProductImportError, ProductImportStatusEnum
+from app.core.database import db
+from datetime import timedelta
+from sqlalchemy import insert, update
+
+class ProductImportRepository:
+
+  @staticmethod
+  def create(product_import: ProductImport):
+    db.session.add(product_import)
+    db.session.commit()
+
+    return product_import
+
+  @staticmethod
+  def get_by_id(import_id):
+    return db.session.get(ProductImport, import_id)
+
+  @staticmethod
+  def set_status(import_id, status, error=None):
+    values = {"status": status, "error": error, "updated_at": db.func.now()}
+    if status in (ProductImportStatusEnum.COMPLETED, ProductImportStatusEnum.FAILED):
+      values["finished_at"] = db.func.now()
+    db.session.execute(update(ProductImport).where(ProductImport.id == import_id).values(**values))
+    db.session.commit()
+
+  @staticmethod
+  def claim(import_id):
+    """
+    Pasa la carga de PENDING a PROCESSING. Retorna False si ya no estaba pendiente (por ejemplo,
+    si se marcó como interrumpida mientras esperaba en la cola).
+    """
+    result = db.session.execute(
+      update(ProductImport)
+      .where(ProductImport.id == import_id, ProductImport.status == ProductImportStatusEnum.PENDING)
+      .values(status=ProductImportStatusEnum.PROCESSING, updated_at=db.func.now())
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+  @staticmethod
+  def fail_stale(stale_seconds, error):
+    """
+    Marca FAILED las cargas PENDING o PROCESSING sin avance en los últimos stale_seconds: el
+    proceso que las tenía se detuvo. Una carga en curso actualiza updated_at en cada bloque.
+    Retorna los ids de las cargas marcadas.
+    """
+    result = db.session.execute(
+      update(ProductImport)
+      .where(
+        ProductImport.status.in_([ProductImportStatusEnum.PENDING, ProductImportStatusEnum.PROCESSING]),
+        ProductImport.updated_at < db.func.now() - timedelta(seconds=stale_seconds)
+      )
+      .values(status=ProductImportStatusEnum.FAILED, error=error, updated_at=db.func.now(), finished_at=db.func.now())
+      .returning(ProductImport.id)
+    )
+    import_ids = [row.id for row in result]
+    db.session.commit()
+    return import_ids
+
+  @staticmethod
+  def add_errors(import_id, errors):
+    """
+    Inserta en una sola sentencia las filas con errores de un bloque, dentro de la transacción en curso.
+    errors es una lista de (número de fila, valores de la fila, mensajes).
+    """
+    if errors:
+      db.session.execute(insert(ProductImportError), [
+        {"import_id": import_id, "row_number": row_number, "row": row, "errors": messages}
+        for row_number, row, messages in errors
+      ])
+
+  @staticmethod
+  def add_progress(import_id, processed_rows, inserted_rows, updated_rows, error_rows):
+    """
+    Suma el avance de un bloque y confirma la transacción junto con sus productos y errores.
+    """
+    db.session.execute(
+      update(ProductImport)
+      .where(ProductImport.id == import_id)
+      .values(
+        processed_rows=ProductImport.processed_rows + processed_rows,
+        inserted_rows=ProductImport.inserted_rows + inserted_rows,
+        updated_rows=ProductImport.updated_rows + updated_rows,
+        error_rows=ProductImport.error_rows + error_rows,
+        updated_at=db.func.now()
+      )
+    )
+    db.session.commit()
+
+  @staticmethod
+  def get_errors_page(import_id, limit, after_row=None):
+    """
+    Errores en orden de fila a partir de after_row, leyendo uno de más para saber si hay otra página.
+    """
+    query = ProductImportError.query.filter(ProductImportError.import_id == import_id)
+    if after_row is not None:
+      query = query.filter(ProductImportError.row_number > after_row)
+    return query.order_by(ProductImportError.row_number).limit(limit + 1).all()
@@ -1,6 +1,47 @@
 from app.models.product_model import Product
 from app.models.category_model import Category
 from app.core.database import db
+import io
+from sqlalchemy import text, update, values, column, tuple_
+from sqlalchemy.orm import load_only
+from sqlalchemy.dialects.postgresql import UUID
+
+# Columnas que recibe COPY en las cargas masivas; created_at y updated_at toman su valor por defecto
+BULK_INSERT_COLUMNS = ['id', 'name', 'description', 'unit_amount', 'quantity', 'image_url', 'manufacturer_id', 'category_id']
+# Tabla temporal de la sesión donde se copian las filas antes del upsert por nombre
+BULK_STAGING_TABLE = 'products_bulk_staging'
+# Candado de transacción que serializa los upsert por nombre entre procesos y réplicas
+BULK_UPSERT_LOCK = 'products_bulk_upsert'
+
+def copy_value(value):
+  """
+  Valor en el formato de texto de COPY: NULL como \\N y escapando los caracteres especiales.
+  """
+  if value is None:
+    return '\\N'
+  return (
+    str(value)
+    .replace('\\', '\\\\')
+    .replace('\t', '\\t')
+    .replace('\n', '\\n')
+    .replace('\r', '\\r')
+  )
+
+def copy_rows(table, rows):
+  """
+  Envía las filas con COPY ... FROM STDIN por la conexión de la sesión, dentro de la transacción en curso.
+  """
+  buffer = io.StringIO()
+  for row in rows:
+    buffer.write('\t'.join(copy_value(row[name]) for name in BULK_INSERT_COLUMNS))
+    buffer.write('\n')
+  buffer.seek(0)
+
+  cursor = db.session.connection().connection.cursor()
+  try:
+    cursor.copy_expert(f"COPY {table} ({', '.join(BULK_INSERT_COLUMNS)}) FROM STDIN", buffer)
+  finally:
+    cursor.close()
 
 class ProductRepository:
   
@@ -9,6 +50,31 @@ class ProductRepository:
     products = Product.query.all()    
     return products
   
+  @staticmethod
+  def get_page(limit, after=None, fields=None, category_id=None, manufacturer_id=None,
+               in_stock=False, min_price=None, max_price=None):
+    """
+    Productos del catálogo ordenados por (name, id) y filtrados en SQL. after es la posición del
+    último producto de la página anterior; con fields solo se leen esas columnas (más name e id,
+    que forman el cursor). Se lee un registro de más para saber si existe una página siguiente.
+    """
+    query = Product.query
+    if fields:
+      query = query.options(load_only(*[getattr(Product, field) for field in {*fields, 'id', 'name'}]))
+    if category_id is not None:
+      query = query.filter(Product.category_id == category_id)
+    if manufacturer_id is not None:
+      query = query.filter(Product.manufacturer_id == manufacturer_id)
+    if in_stock:
+      query = query.filter(Product.quantity > 0)
+    if min_price is not None:
+      query = query.filter(Product.unit_amount >= min_price)
+    if max_price is not None:
+      query = query.filter(Product.unit_amount <= max_price)
+    if after is not None:
+      query = query.filter(tuple_(Product.name, Product.id) > tuple_(*after))
+    return query.order_by(Product.name, Product.id).limit(limit + 1).all()
+
   @staticmethod
   def create(product: Product):
     db.session.add(product)
@@ -20,22 +86,128 @@ class ProductRepository:
   def get_product_by_id(product_id):
     return Product.query.get(product_id)
   
+  @staticmethod
+  def get_products_by_ids(product_ids):
+    return Product.query.filter(Product.id.in_(product_ids)).all()
+  
   @staticmethod
   def update(product: Product):
     db.session.commit()
     return product
   
+  @staticmethod
+  def decrement_stock(quantities, atomic=True):
+    """
+    Descuenta el stock de varios productos en una sola sentencia UPDATE condicional
+    (solo se actualizan las filas con quantity >= cantidad solicitada).
+    Si atomic es True y algún producto no tiene stock suficiente, no se aplica ningún descuento.
+    Retorna un diccionario {id: nueva cantidad} con los productos descontados y si el cambio se aplicó.
+    """
+    products = Product.__table__
+    requested = values(
+      column("id", UUID(as_uuid=True)),
+      column("quantity", db.Integer),
+      name="requested"
+    ).data(list(quantities.items()))
+
+    statement = (
+      update(products)
+      .where(
+        products.c.id == requested.c.id,
+        products.c.quantity >= requested.c.quantity
+      )
+      .values(quantity=products.c.quantity - requested.c.quantity)
+      .returning(products.c.id, products.c.quantity)
+    )
+    updated = {str(row.id): row.quantity for row in db.session.execute(statement)}
+
+    if atomic and len(updated) < len(quantities):
+      db.session.rollback()
+      return updated, False
+
+    db.session.commit()
+    return updated, True
+
+  @staticmethod
+  def increment_stock(quantities):
+    """
+    Suma el stock de varios productos en una sola sentencia UPDATE, dentro de la transacción en curso.
+    Retorna un diccionario {id: nueva cantidad}.
+    """
+    products = Product.__table__
+    released = values(
+      column("id", UUID(as_uuid=True)),
+      column("quantity", db.Integer),
+      name="released"
+    ).data(list(quantities.items()))
+
+    statement = (
+      update(products)
+      .where(products.c.id == released.c.id)
+      .values(quantity=products.c.quantity + released.c.quantity)
+      .returning(products.c.id, products.c.quantity)
+    )
+    return {str(row.id): row.quantity for row in db.session.execute(statement)}
+  
   @staticmethod
   def get_products_by_category(category_id):
     products = Product.query.filter_by(category_id=category_id).all()  
     return products
   
   @staticmethod
-  def save_bulk_products(products):
-    db.session.bulk_save_objects(products)
+  def bulk_insert(rows, upsert_by_name=False):
+    """
+    Inserta productos a partir de diccionarios con sus columnas usando COPY, sin construir objetos
+    del ORM, dentro de la transacción en curso.
+    Con upsert_by_name las filas se copian a una tabla temporal y un producto cuyo nombre ya existe
+    se actualiza en lugar de duplicarse, así volver a cargar el mismo archivo no repite el catálogo;
+    si el nombre se repite en las filas queda la última. products.name no es único, por eso el
+    UPDATE y el INSERT se hacen con un candado de transacción: dos cargas simultáneas no insertan
+    el mismo nombre dos veces. La imagen del archivo reemplaza la actual solo si viene informada.
+    Retorna (insertados, actualizados).
+    """
+    if not rows:
+      return 0, 0
+
+    if not upsert_by_name:
+      copy_rows('products', rows)
+      return len(rows), 0
+
+    rows = list({row["name"]: row for row in rows}.values())
+    columns = ', '.join(BULK_INSERT_COLUMNS)
+    db.session.execute(text(
+      f"CREATE TEMP TABLE IF NOT EXISTS {BULK_STAGING_TABLE} "
+      f"(LIKE products INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+    ))
+    db.session.execute(text(f"TRUNCATE {BULK_STAGING_TABLE}"))
+    copy_rows(BULK_STAGING_TABLE, rows)
+
+    db.session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": BULK_UPSERT_LOCK})
+    updated = db.session.execute(text(f"""
+      UPDATE products p
+      SET description = s.description, unit_amount = s.unit_amount, quantity = s.quantity,
+          image_url = COALESCE(s.image_url, p.image_url),
+          manufacturer_id = s.manufacturer_id, category_id = s.category_id, updated_at = now()
+      FROM {BULK_STAGING_TABLE} s
+      WHERE p.name = s.name
+      RETURNING p.name
+    """))
+    updated = len({row.name for row in updated})
+
+    inserted = db.session.execute(text(f"""
+      INSERT INTO products ({columns})
+      SELECT {columns} FROM {BULK_STAGING_TABLE} s
+      WHERE NOT EXISTS (SELECT 1 FROM products p WHERE p.name = s.name)
+    """)).rowcount
+
+    return inserted, updated
+
+  @staticmethod
+  def save_bulk_products(rows, upsert_by_name=False):
+    inserted, updated = ProductRepository.bulk_insert(rows, upsert_by_name)
     db.session.commit()
 
-    return len(products)
+    return inserted, updated
   
   @staticmethod
   def get_categories():
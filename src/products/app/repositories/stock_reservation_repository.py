@@ -0,0 +1,50 @@
+from app.models.stock_reservation_model import StockReservation, StockReservationStatusEnum
+from app.core.database import db
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+
+class StockReservationRepository:
+
+  @staticmethod
+  def reserve(reference, quantities):
+    """
+    Registra la referencia de un descuento en la transacción en curso.
+    Retorna False si la referencia ya existía (el descuento ya se aplicó o se liberó).
+    """
+    statement = insert(StockReservation).values(
+      reference=reference,
+      items=quantities,
+      status=StockReservationStatusEnum.APPLIED
+    ).on_conflict_do_nothing().returning(StockReservation.reference)
+    return db.session.execute(statement).scalar() is not None
+
+  @staticmethod
+  def get(reference):
+    return db.session.get(StockReservation, reference)
+
+  @staticmethod
+  def release(references):
+    """
+    Marca como liberados los descuentos aplicados de las referencias y retorna sus productos.
+    Las referencias desconocidas quedan registradas como liberadas, así un descuento que llegue
+    tarde con esa referencia ya no se aplica. No confirma la transacción.
+    """
+    released = db.session.execute(
+      update(StockReservation)
+      .where(
+        StockReservation.reference.in_(references),
+        StockReservation.status == StockReservationStatusEnum.APPLIED
+      )
+      .values(status=StockReservationStatusEnum.RELEASED, updated_at=db.func.now())
+      .returning(StockReservation.reference, StockReservation.items)
+    ).all()
+
+    db.session.execute(
+      insert(StockReservation)
+      .values([
+        {"reference": reference, "items": {}, "status": StockReservationStatusEnum.RELEASED}
+        for reference in references
+      ])
+      .on_conflict_do_nothing()
+    )
+    return {str(row.reference): row.items for row in released}
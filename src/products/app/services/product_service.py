@@ -1,10 +1,23 @@
+import os
+import json
+import itertools
 import uuid
+import tempfile
 from app.repositories.product_repository import ProductRepository, Product
-from app.exceptions.http_exceptions import BadRequestError
+from app.models.product_model import ProductSchema
+from app.utils.pagination_util import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor
+from app.repositories.product_import_repository import ProductImportRepository
+from app.models.product_import_model import ProductImport, ProductImportStatusEnum
+from app.repositories.stock_reservation_repository import StockReservationRepository
+from app.models.stock_reservation_model import StockReservationStatusEnum
+from app.core.database import db
+from app.exceptions.http_exceptions import BadRequestError, NotFoundError
 from typing import IO
 from app.models.manufacturer_model import Manufacturer
 from app.models.category_model import Category
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
 
 REQUIRED_COLUMNS = [
     "Nombre del producto",
@@ -15,6 +28,25 @@ REQUIRED_COLUMNS = [
     "Nombre de la categoría"
 ]
 
+MAX_BATCH_SIZE = 100
+MAX_RELEASE_REFERENCES = 100
+UPLOAD_EXTENSIONS = ['csv', 'xlsx']
+UPLOAD_CHUNK_SIZE = 100
+# Filas que se validan juntas en la vista previa: acota la memoria sin perder la validación por columnas
+UPLOAD_VALIDATION_BATCH_SIZE = 5000
+
+# Los archivos de las cargas en segundo plano se guardan aquí mientras se procesan
+PRODUCT_IMPORTS_DIR = os.getenv("PRODUCT_IMPORTS_DIR", os.path.join(tempfile.gettempdir(), "product_imports"))
+# Filas que se validan e insertan por transacción en una carga en segundo plano
+PRODUCT_IMPORT_CHUNK_SIZE = int(os.getenv("PRODUCT_IMPORT_CHUNK_SIZE", "500"))
+# Una carga pendiente o en proceso sin avance durante este tiempo quedó huérfana tras un reinicio
+PRODUCT_IMPORT_STALE_SECONDS = int(os.getenv("PRODUCT_IMPORT_STALE_SECONDS", "900"))
+IMPORT_ERRORS_PAGE_SIZE = 50
+IMPORT_ERRORS_MAX_PAGE_SIZE = 500
+
+# Campos que se pueden pedir con ?fields en el catálogo paginado
+CATALOG_FIELDS = ProductSchema.Meta.fields
+
 def validate_uuid(id):
   try:
     uuid.UUID(id, version=4)
@@ -22,6 +54,252 @@ def validate_uuid(id):
   except ValueError:
     return False
     
+def get_upload_extension(filename):
+  extension_file = (filename or '').split('.')[-1].lower()
+  if extension_file not in UPLOAD_EXTENSIONS:
+    raise BadRequestError("Formato no soportado. Solo se permite CSV o Excel")
+  return extension_file
+
+def get_upload_maps():
+  """
+  Fabricantes y categorías indexados por nombre normalizado, para validar las filas del archivo.
+  """
+  manufacturer_map = {
+    m.name.strip().lower(): m.id for m in Manufacturer.query.all()
+  }
+
+  category_map = {
+    c.name.strip().lower(): c.id for c in Category.query.all()
+  }
+  return manufacturer_map, category_map
+
+def excel_data_rows(rows, width):
+  """
+  Ajusta cada fila al largo del encabezado y, como pd.read_excel, descarta las filas vacías del
+  final de la hoja. Las vacías intermedias se conservan: solo se cuentan hasta que aparece otra
+  fila con datos, para no acumularlas en memoria.
+  """
+  empty_row = (None,) * width
+  pending_empty = 0
+  for row in rows:
+    row = tuple(row[:width]) + (None,) * (width - len(row))
+    if row == empty_row:
+      pending_empty += 1
+      continue
+    yield from itertools.repeat(empty_row, pending_empty)
+    pending_empty = 0
+    yield row
+
+def read_excel_chunks(source, chunksize):
+  """
+  Lee la primera hoja con openpyxl en modo de solo lectura, que recorre el archivo fila por fila
+  sin cargar la hoja completa, y arma un DataFrame por cada chunksize filas.
+  """
+  workbook = load_workbook(source, read_only=True, data_only=True)
+  try:
+    rows = workbook.worksheets[0].iter_rows(values_only=True)
+    header = next(rows, None)
+    if not header:
+      return
+    columns = [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+    data_rows = excel_data_rows(rows, len(columns))
+
+    start = 0
+    while True:
+      block = list(itertools.islice(data_rows, chunksize))
+      if not block:
+        return
+      yield pd.DataFrame.from_records(block, columns=columns, index=pd.RangeIndex(start, start + len(block)))
+      start += len(block)
+  finally:
+    workbook.close()
+
+def read_upload_chunks(source, extension_file, chunksize=UPLOAD_CHUNK_SIZE):
+  """
+  Lee el archivo por bloques de chunksize filas, con las celdas vacías como ''. El índice de
+  cada bloque continúa el del anterior, así que es la posición de la fila en el archivo.
+  Solo el bloque en curso se mantiene en memoria, también para los archivos Excel.
+  """
+  if extension_file == 'csv':
+    reader = pd.read_csv(source, chunksize=chunksize)
+  else:
+    reader = read_excel_chunks(source, chunksize)
+  for chunk in reader:
+    yield chunk.fillna('').astype(object)
+
+def batch_upload_chunks(chunks, batch_size=UPLOAD_VALIDATION_BATCH_SIZE):
+  """
+  Une bloques consecutivos hasta reunir batch_size filas. Cada bloque conserva los tipos que
+  pandas infirió al leerlo.
+  """
+  batch = []
+  rows = 0
+  for chunk in chunks:
+    batch.append(chunk)
+    rows += len(chunk)
+    if rows >= batch_size:
+      yield pd.concat(batch)
+      batch = []
+      rows = 0
+  if batch:
+    yield pd.concat(batch)
+
+def upload_column_as_text(frame, column):
+  # Igual que str(row.get(column)): una columna que no viene en el archivo se lee como 'None'
+  if column not in frame.columns:
+    return pd.Series('None', index=frame.index)
+  return frame[column].astype(str)
+
+def upload_column_as_number(frame, column):
+  # Las celdas que no son un número finito quedan como NaN
+  if column not in frame.columns:
+    return pd.Series(np.nan, index=frame.index)
+  numbers = pd.to_numeric(frame[column], errors='coerce').astype(float)
+  return numbers.where(np.isfinite(numbers))
+
+def check_upload_columns(columns):
+  """
+  Rechaza el archivo si en el encabezado falta alguna columna requerida.
+  """
+  missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+  if missing:
+    raise BadRequestError(f"Faltan columnas requeridas en el archivo: {', '.join(missing)}")
+
+def read_upload_columns(source, extension_file):
+  """
+  Columnas del encabezado del archivo, sin leer sus filas.
+  """
+  if extension_file == 'csv':
+    return list(pd.read_csv(source, nrows=0).columns)
+  workbook = load_workbook(source, read_only=True, data_only=True)
+  try:
+    header = next(workbook.worksheets[0].iter_rows(values_only=True, max_row=1), None) or ()
+    return [str(name) for name in header if name is not None]
+  finally:
+    workbook.close()
+
+def validate_upload_frame(frame, manufacturer_map, category_map):
+  """
+  Valida por columnas las filas de un archivo de carga masiva. Cada validación es una máscara
+  booleana sobre todo el DataFrame; solo se recorren en Python las filas con errores para
+  armar su lista de mensajes.
+  Retorna (validos, errores, error_rows) con el mismo formato de la validación fila por fila;
+  error_rows es el índice de cada fila de errores.
+  """
+  empty = {col: upload_column_as_text(frame, col).str.strip() == '' for col in REQUIRED_COLUMNS}
+  checks = [(empty[col], f"Columna '{col}' vacía") for col in REQUIRED_COLUMNS]
+  quantities = upload_column_as_number(frame, "Cantidad inicial")
+  amounts = upload_column_as_number(frame, "Precio unitario")
+  checks.append((quantities.isna() & ~empty["Cantidad inicial"], "Columna 'Cantidad inicial' no es un número válido"))
+  checks.append((amounts.isna() & ~empty["Precio unitario"], "Columna 'Precio unitario' no es un número válido"))
+  manufacturer_ids = upload_column_as_text(frame, "Nombre del fabricante").str.strip().str.lower().map(manufacturer_map)
+  category_ids = upload_column_as_text(frame, "Nombre de la categoría").str.strip().str.lower().map(category_map)
+  checks.append((manufacturer_ids.isna(), "Fabricante no encontrado"))
+  checks.append((category_ids.isna(), "Categoría no encontrada"))
+
+  error_mask = pd.Series(False, index=frame.index)
+  for mask, _ in checks:
+    error_mask |= mask
+
+  validos = []
+  valid_mask = ~error_mask
+  if valid_mask.any():
+    valid = frame[valid_mask]
+    validos = [
+      {
+        "name": name,
+        "description": description,
+        "quantity": int(quantity),
+        "amount_unit": float(amount),
+        "manufacturer_id": manufacturer_id,
+        "manufacturer_name": manufacturer_name,
+        "category_id": category_id,
+      }
+      for name, description, quantity, amount, manufacturer_name, manufacturer_id, category_id in zip(
+        valid["Nombre del producto"].tolist(),
+        valid["Descripción"].tolist(),
+        quantities[valid_mask].tolist(),
+        amounts[valid_mask].tolist(),
+        valid["Nombre del fabricante"].tolist(),
+        manufacturer_ids[valid_mask].tolist(),
+        category_ids[valid_mask].tolist()
+      )
+    ]
+
+  errores = frame[error_mask].to_dict('records')
+  error_rows = error_mask.to_numpy().nonzero()[0]
+  for item in errores:
+    item['errores'] = []
+  for mask, message in checks:
+    for position in mask.to_numpy()[error_rows].nonzero()[0]:
+      errores[position]['errores'].append(message)
+  for item, manufacturer_id, category_id in zip(errores, manufacturer_ids[error_mask].tolist(), category_ids[error_mask].tolist()):
+    if not pd.isna(manufacturer_id):
+      item['manufacturer_id'] = manufacturer_id
+    if not pd.isna(category_id):
+      item['category_id'] = category_id
+
+  return validos, errores, frame.index[error_mask].tolist()
+
+def build_product_rows(validos):
+  """
+  Columnas de cada producto válido para ProductRepository.bulk_insert.
+  """
+  return [
+    {
+      "id": uuid.uuid4(),
+      "name": p["name"],
+      "description": p["description"],
+      "unit_amount": p["amount_unit"],
+      "quantity": p["quantity"],
+      "image_url": None,
+      "manufacturer_id": p["manufacturer_id"],
+      "category_id": p["category_id"]
+    }
+    for p in validos
+  ]
+
+def parse_catalog_fields(value):
+  """
+  Campos pedidos con ?fields=id,name,... en el orden en que se enviaron, o None para todos.
+  """
+  if value is None or value.strip() == "":
+    return None
+  fields = list(dict.fromkeys(field.strip() for field in value.split(",") if field.strip()))
+  invalid = [field for field in fields if field not in CATALOG_FIELDS]
+  if invalid:
+    raise BadRequestError(f"Campos no válidos: {', '.join(invalid)}. Campos disponibles: {', '.join(CATALOG_FIELDS)}")
+  return fields
+
+def parse_uuid_filter(value, name):
+  if value is None or value == "":
+    return None
+  if not validate_uuid(value):
+    raise BadRequestError(f"El parámetro '{name}' no es válido")
+  return value
+
+def parse_price_filter(value, name):
+  if value is None or value == "":
+    return None
+  try:
+    price = float(value)
+  except ValueError:
+    raise BadRequestError(f"El parámetro '{name}' debe ser un número")
+  if not np.isfinite(price):
+    raise BadRequestError(f"El parámetro '{name}' debe ser un número")
+  if price < 0:
+    raise BadRequestError(f"El parámetro '{name}' no puede ser negativo")
+  return price
+
+def parse_bool_filter(value, name):
+  if value is None or value == "":
+    return False
+  if value.strip().lower() in ("true", "1"):
+    return True
+  if value.strip().lower() in ("false", "0"):
+    return False
+  raise BadRequestError(f"El parámetro '{name}' debe ser true o false")
+
 class ProductService:
     
   @staticmethod
@@ -29,6 +307,35 @@ class ProductService:
     products = ProductRepository.get_all()
     
     return products
+
+  @staticmethod
+  def get_catalog_page(limit=DEFAULT_PAGE_SIZE, cursor=None, fields=None, category_id=None, manufacturer_id=None,
+                       in_stock=None, min_price=None, max_price=None):
+    """
+    Página del catálogo con los filtros de la consulta aplicados en SQL. Los filtros llegan como
+    texto desde los parámetros de la URL.
+    Retorna los productos y el cursor de la página siguiente (None si es la última).
+    """
+    min_price = parse_price_filter(min_price, "min_price")
+    max_price = parse_price_filter(max_price, "max_price")
+    if min_price is not None and max_price is not None and min_price > max_price:
+      raise BadRequestError("El parámetro 'min_price' no puede ser mayor que 'max_price'")
+
+    products = ProductRepository.get_page(
+      limit,
+      after=decode_cursor(cursor),
+      fields=fields,
+      category_id=parse_uuid_filter(category_id, "category_id"),
+      manufacturer_id=parse_uuid_filter(manufacturer_id, "manufacturer_id"),
+      in_stock=parse_bool_filter(in_stock, "in_stock"),
+      min_price=min_price,
+      max_price=max_price
+    )
+    next_cursor = None
+    if len(products) > limit:
+      products = products[:limit]
+      next_cursor = encode_cursor(products[-1].name, products[-1].id)
+    return products, next_cursor
     
   @staticmethod
   def create(product_data):
@@ -72,6 +379,17 @@ class ProductService:
       raise BadRequestError("El producto no existe")    
     return product
   
+  @staticmethod
+  def get_products_by_ids(product_ids):
+    if not isinstance(product_ids, list) or not product_ids:
+      raise BadRequestError("Debe enviar una lista de ids de productos")
+    if len(product_ids) > MAX_BATCH_SIZE:
+      raise BadRequestError(f"No se pueden consultar más de {MAX_BATCH_SIZE} productos por petición")
+    if not all(isinstance(product_id, str) and validate_uuid(product_id) for product_id in product_ids):
+      raise BadRequestError("Uno o más ids de productos no son válidos")
+
+    return ProductRepository.get_products_by_ids(list(dict.fromkeys(product_ids)))
+  
   @staticmethod
   def update_quantity(product_id, product_data):
     if not validate_uuid(product_id):
@@ -91,6 +409,97 @@ class ProductService:
     
     return updated_product
   
+  @staticmethod
+  def decrement_stock(request_data):
+    items = request_data.get("items")
+    if not isinstance(items, list) or not items:
+      raise BadRequestError("Debe enviar una lista de productos válida")
+
+    quantities = {}
+    for item in items:
+      if not isinstance(item, dict) or not isinstance(item.get("id"), str) or not validate_uuid(item.get("id")):
+        raise BadRequestError("El ID del producto no es válido")
+      if not isinstance(item.get("quantity"), int) or item.get("quantity") <= 0:
+        raise BadRequestError("La cantidad debe ser un número entero positivo")
+      product_id = str(uuid.UUID(item["id"]))
+      quantities[product_id] = quantities.get(product_id, 0) + item["quantity"]
+
+    # Con una referencia el descuento es idempotente: se registra en la misma transacción y
+    # si la referencia ya existía se retorna el resultado sin volver a descontar
+    reference = request_data.get("reference")
+    if reference is not None:
+      if not isinstance(reference, str) or not validate_uuid(reference):
+        raise BadRequestError("La referencia del descuento no es válida")
+      if not request_data.get("atomic", True):
+        raise BadRequestError("Un descuento con referencia debe ser atómico")
+      if not StockReservationRepository.reserve(reference, quantities):
+        return ProductService.get_reservation_result(reference, quantities)
+
+    updated, applied = ProductRepository.decrement_stock(quantities, atomic=request_data.get("atomic", True))
+
+    return {
+      "applied": applied,
+      "items": [
+        {
+          "product_id": product_id,
+          "success": product_id in updated,
+          "quantity": updated.get(product_id) if applied else None
+        }
+        for product_id in quantities
+      ]
+    }
+  
+  @staticmethod
+  def get_reservation_result(reference, quantities):
+    """
+    Resultado de un descuento repetido: aplicado con el stock actual si la reserva sigue vigente,
+    o no aplicado si ya se liberó.
+    """
+    reservation = StockReservationRepository.get(reference)
+    applied = reservation.status == StockReservationStatusEnum.APPLIED
+    current = {str(product.id): product.quantity for product in ProductRepository.get_products_by_ids(list(quantities))}
+    db.session.commit()
+
+    return {
+      "applied": applied,
+      "items": [
+        {
+          "product_id": product_id,
+          "success": applied,
+          "quantity": current.get(product_id) if applied else None
+        }
+        for product_id in quantities
+      ]
+    }
+
+  @staticmethod
+  def release_stock(request_data):
+    """
+    Compensa los descuentos de las referencias: devuelve el stock de las reservas aplicadas en una
+    sola sentencia y las marca como liberadas. Repetir la liberación no vuelve a sumar el stock.
+    """
+    references = request_data.get("references")
+    if not isinstance(references, list) or not references:
+      raise BadRequestError("Debe enviar una lista de referencias válida")
+    if len(references) > MAX_RELEASE_REFERENCES:
+      raise BadRequestError(f"Se pueden liberar máximo {MAX_RELEASE_REFERENCES} referencias por petición")
+    if not all(isinstance(reference, str) and validate_uuid(reference) for reference in references):
+      raise BadRequestError("La referencia del descuento no es válida")
+    references = list(dict.fromkeys(str(uuid.UUID(reference)) for reference in references))
+
+    released = StockReservationRepository.release(references)
+    quantities = {}
+    for items in released.values():
+      for product_id, quantity in items.items():
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    updated = ProductRepository.increment_stock(quantities) if quantities else {}
+    db.session.commit()
+
+    return {
+      "released": list(released),
+      "items": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in updated.items()]
+    }
+
   @staticmethod
   def get_products_by_category(category_id):
     if not validate_uuid(category_id):
@@ -101,60 +510,19 @@ class ProductService:
   
   @staticmethod
   def parse_and_validate_file(file):
-    extension_file = file.filename.split('.')[-1].lower()
-    if extension_file not in ['csv', 'xlsx']:
-      raise BadRequestError("Formato no soportado. Solo se permite CSV o Excel")
-    
-    manufacturer_map = {
-      m.name.strip().lower(): m.id for m in Manufacturer.query.all()
-    }
+    extension_file = get_upload_extension(file.filename)
+    manufacturer_map, category_map = get_upload_maps()
 
-    category_map = {
-      c.name.strip().lower(): c.id for c in Category.query.all()
-    }
+    # Los bloques se validan por lotes a medida que se leen; en memoria solo quedan el lote en
+    # curso y los resultados
+    validos, errores = [], []
+    for position, batch in enumerate(batch_upload_chunks(read_upload_chunks(file, extension_file), UPLOAD_VALIDATION_BATCH_SIZE)):
+      if position == 0:
+        check_upload_columns(batch.columns)
+      batch_validos, batch_errores, _ = validate_upload_frame(batch, manufacturer_map, category_map)
+      validos.extend(batch_validos)
+      errores.extend(batch_errores)
 
-    chunksize = 100
-    reader = pd.read_csv(file, chunksize=chunksize) if extension_file == 'csv' else pd.read_excel(file, chunksize=chunksize)
-
-    validos = []
-    errores = []
-
-    for chunk in reader:
-      chunk.fillna('', inplace=True)
-      for _, row in chunk.iterrows():
-        item = row.to_dict()
-        item['errores'] = []
-        for col in REQUIRED_COLUMNS:
-          if str(row.get(col)).strip() == '':
-            item['errores'].append(f"Columna '{col}' vacía")
-
-        name_manufacturer = str(row.get("Nombre del fabricante")).strip().lower()
-        manufacturer_id = manufacturer_map.get(name_manufacturer)
-        if not manufacturer_id:
-          item['errores'].append("Fabricante no encontrado")
-        else:
-          item['manufacturer_id'] = manufacturer_id
-
-        name_category = str(row.get("Nombre de la categoría")).strip().lower()
-        category_id = category_map.get(name_category)
-
-        if not category_id:
-          item['errores'].append("Categoría no encontrada")
-        else:
-          item['category_id'] = category_id
-
-        if not item['errores']:
-          validos.append({
-            "name": row["Nombre del producto"],
-            "description": row["Descripción"],
-            "quantity": int(row["Cantidad inicial"]),
-            "amount_unit": float(row["Precio unitario"]),
-            "manufacturer_id": manufacturer_id,
-            "manufacturer_name": row["Nombre del fabricante"],
-            "category_id": category_id,
-          })
-        else:
-          errores.append(item)
     return {
       "validos": validos,
       "errores": errores,
@@ -163,20 +531,104 @@ class ProductService:
     }
   
   @staticmethod
-  def bulk_save_products(products):
-    products_objects = [
-      Product(
-        name=p["name"],
-        quantity=p["quantity"],
-        category_id=p["category_id"],
-        description=p["description"],
-        image_url=None,
-        manufacturer_id=p["manufacturer_id"],
-        unit_amount=p["amount_unit"]
-      )
-      for p in products
-    ]
-    return ProductRepository.save_bulk_products(products_objects)
+  def bulk_save_products(products, upsert_by_name=False):
+    """
+    Guarda los productos validados en la vista previa. Retorna (insertados, actualizados).
+    """
+    return ProductRepository.save_bulk_products(build_product_rows(products), upsert_by_name)
+
+  @staticmethod
+  def create_import(file, upsert_by_name=False):
+    """
+    Guarda el archivo en disco y registra la carga; el job product_import_job la procesa después.
+    """
+    extension_file = get_upload_extension(file.filename)
+    product_import = ProductImport(filename=file.filename, upsert_by_name=upsert_by_name)
+    os.makedirs(PRODUCT_IMPORTS_DIR, exist_ok=True)
+    path = os.path.join(PRODUCT_IMPORTS_DIR, f"{product_import.id}.{extension_file}")
+    file.save(path)
+    try:
+      check_upload_columns(read_upload_columns(path, extension_file))
+    except Exception as e:
+      os.remove(path)
+      if isinstance(e, BadRequestError):
+        raise
+      raise BadRequestError("No fue posible leer el archivo")
+    ProductImportRepository.create(product_import)
+    return product_import, path
+
+  @staticmethod
+  def process_import(import_id, path, upsert_by_name=False, chunksize=PRODUCT_IMPORT_CHUNK_SIZE):
+    """
+    Valida el archivo por bloques y en cada bloque inserta (o con upsert_by_name actualiza por
+    nombre) los productos válidos, guarda las filas con errores y suma el avance, todo en una
+    transacción. Las filas con valores inválidos quedan como errores de la carga; si falta una
+    columna requerida se rechaza el archivo antes de escribir el primer bloque. Si un bloque falla
+    la carga queda FAILED conservando los bloques ya confirmados. El archivo se borra al terminar.
+    """
+    try:
+      if not ProductImportRepository.claim(import_id):
+        print(f"⚠️ La carga de productos {import_id} ya no está pendiente, no se procesa")
+        return
+      manufacturer_map, category_map = get_upload_maps()
+
+      for position, chunk in enumerate(read_upload_chunks(path, get_upload_extension(path), chunksize)):
+        if position == 0:
+          check_upload_columns(chunk.columns)
+        validos, errores, error_rows = validate_upload_frame(chunk, manufacturer_map, category_map)
+        inserted, updated = ProductRepository.bulk_insert(build_product_rows(validos), upsert_by_name)
+        ProductImportRepository.add_errors(import_id, [
+          # Número de fila en el archivo sin contar el encabezado; los ids se guardan como texto
+          (row + 1, json.loads(json.dumps({k: v for k, v in item.items() if k != 'errores'}, default=str)), item['errores'])
+          for row, item in zip(error_rows, errores)
+        ])
+        ProductImportRepository.add_progress(import_id, len(chunk), inserted, updated, len(errores))
+
+      ProductImportRepository.set_status(import_id, ProductImportStatusEnum.COMPLETED)
+    except Exception as e:
+      db.session.rollback()
+      print(f"⚠️ La carga de productos {import_id} falló: {e}")
+      ProductImportRepository.set_status(import_id, ProductImportStatusEnum.FAILED, str(e))
+    finally:
+      if os.path.exists(path):
+        os.remove(path)
+
+  @staticmethod
+  def fail_stale_imports(stale_seconds=PRODUCT_IMPORT_STALE_SECONDS):
+    """
+    Las cargas se procesan en un hilo del proceso que las recibió; si ese proceso se reinicia
+    quedan en PENDING o PROCESSING. Se marcan FAILED (con el avance ya confirmado) y se borra
+    su archivo para que el administrador pueda volver a cargarlo.
+    """
+    import_ids = ProductImportRepository.fail_stale(
+      stale_seconds, "La carga se interrumpió antes de terminar. Vuelva a cargar el archivo"
+    )
+    for import_id in import_ids:
+      for extension_file in UPLOAD_EXTENSIONS:
+        path = os.path.join(PRODUCT_IMPORTS_DIR, f"{import_id}.{extension_file}")
+        if os.path.exists(path):
+          os.remove(path)
+    if import_ids:
+      print(f"⚠️ {len(import_ids)} cargas de productos interrumpidas marcadas como fallidas")
+    return import_ids
+
+  @staticmethod
+  def get_import(import_id, limit=IMPORT_ERRORS_PAGE_SIZE, after_row=None):
+    """
+    Estado de la carga y una página de sus filas con errores. Retorna (carga, errores, siguiente after_row).
+    """
+    if not validate_uuid(import_id):
+      raise BadRequestError("El id de la carga no es válido")
+    product_import = ProductImportRepository.get_by_id(import_id)
+    if not product_import:
+      raise NotFoundError("La carga de productos no existe")
+
+    errors = ProductImportRepository.get_errors_page(import_id, limit, after_row)
+    next_after_row = None
+    if len(errors) > limit:
+      errors = errors[:limit]
+      next_after_row = errors[-1].row_number
+    return product_import, errors, next_after_row
 
   @staticmethod
   def get_categories():
@@ -0,0 +1,43 @@
+import base64
+import json
+import os
+import uuid
+from app.exceptions.http_exceptions import BadRequestError
+
+DEFAULT_PAGE_SIZE = int(os.getenv("PRODUCTS_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("PRODUCTS_MAX_PAGE_SIZE", "200"))
+
+def parse_limit(value):
+  """
+  Tamaño de página solicitado, acotado a MAX_PAGE_SIZE. Sin valor se usa DEFAULT_PAGE_SIZE.
+  """
+  if value is None or value == "":
+    return DEFAULT_PAGE_SIZE
+  try:
+    limit = int(value)
+  except (TypeError, ValueError):
+    raise BadRequestError("El parámetro 'limit' debe ser un número entero")
+  if limit < 1:
+    raise BadRequestError("El parámetro 'limit' debe ser mayor a 0")
+  return min(limit, MAX_PAGE_SIZE)
+
+def encode_cursor(name, id):
+  """
+  Cursor opaco con la posición (name, id) del último producto de la página.
+  """
+  raw = json.dumps({"name": name, "id": str(id)})
+  return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+  """
+  Retorna la tupla (name, id) codificada en el cursor, o None si no se envió.
+  """
+  if not cursor:
+    return None
+  try:
+    position = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    if not isinstance(position["name"], str):
+      raise ValueError("name")
+    return position["name"], uuid.UUID(position["id"])
+  except (ValueError, KeyError, TypeError):
+    raise BadRequestError("El cursor de paginación no es válido")
@@ -1,6 +1,6 @@
 from flask import jsonify
 
-def format_response(status, code, message=None, data=None, error=None):
+def format_response(status, code, message=None, data=None, error=None, meta=None):
   response = {
     "status": status,
     "code": code,
@@ -15,4 +15,7 @@ def format_response(status, code, message=None, data=None, error=None):
   if error is not None:
     response["error"] = error
 
+  if meta is not None:
+    response["meta"] = meta
+
   return jsonify(response), code
\ No newline at end of file
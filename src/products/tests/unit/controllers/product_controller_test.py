@@ -0,0 +1,89 @@
+import uuid
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from app.controllers.product_controller import product_bp
+from app.models.product_model import Product
+from app.utils.pagination_util import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor
+
+@pytest.fixture
+def app():
+  app = Flask(__name__)
+  app.config["JWT_SECRET_KEY"] = "test-secret"
+  app.config["TESTING"] = True
+  JWTManager(app)
+  app.register_blueprint(product_bp)
+  return app
+
+@pytest.fixture
+def client(app):
+  return app.test_client()
+
+@pytest.fixture
+def headers(app):
+  with app.app_context():
+    return {"Authorization": f"Bearer {create_access_token(identity='seller-1', additional_claims={'role': 'seller'})}"}
+
+def make_products(count):
+  products = []
+  for i in range(count):
+    product = Product(f"Producto {i}", "Descripción", 100.0 + i, i, None, uuid.uuid4(), uuid.uuid4())
+    product.id = uuid.uuid4()
+    products.append(product)
+  return products
+
+@patch("app.services.product_service.ProductRepository.get_page")
+@patch("app.services.product_service.ProductRepository.get_all")
+def test_get_products_without_params_returns_full_list(mock_get_all, mock_get_page, client, headers):
+  mock_get_all.return_value = make_products(3)
+
+  response = client.get("/products", headers=headers)
+
+  body = response.get_json()
+  assert response.status_code == 200
+  assert len(body["data"]) == 3
+  assert "meta" not in body
+  mock_get_page.assert_not_called()
+
+@patch("app.services.product_service.ProductRepository.get_page")
+def test_get_products_with_limit_returns_first_page(mock_get_page, client, headers):
+  products = make_products(3)
+  mock_get_page.return_value = products
+
+  response = client.get("/products?limit=2", headers=headers)
+
+  body = response.get_json()
+  assert response.status_code == 200
+  assert [product["name"] for product in body["data"]] == ["Producto 0", "Producto 1"]
+  assert body["meta"]["limit"] == 2
+  assert decode_cursor(body["meta"]["next_cursor"]) == ("Producto 1", products[1].id)
+  assert mock_get_page.call_args[0][0] == 2
+  assert mock_get_page.call_args.kwargs["after"] is None
+
+@patch("app.services.product_service.ProductRepository.get_page")
+def test_get_products_with_cursor_continues_after_it(mock_get_page, client, headers):
+  last_id = uuid.uuid4()
+  mock_get_page.return_value = make_products(1)
+
+  response = client.get(f"/products?cursor={encode_cursor('Producto 1', last_id)}", headers=headers)
+
+  body = response.get_json()
+  assert response.status_code == 200
+  assert body["meta"] == {"limit": DEFAULT_PAGE_SIZE, "next_cursor": None}
+  assert mock_get_page.call_args[0][0] == DEFAULT_PAGE_SIZE
+  assert mock_get_page.call_args.kwargs["after"] == ("Producto 1", last_id)
+
+@patch("app.services.product_service.ProductRepository.get_page")
+def test_get_products_with_fields_projects_response(mock_get_page, client, headers):
+  mock_get_page.return_value = make_products(1)
+
+  response = client.get("/products?fields=id,name", headers=headers)
+
+  assert set(response.get_json()["data"][0]) == {"id", "name"}
+
+@pytest.mark.parametrize("query", ["limit=0", "cursor=no-es-base64", "min_price=nan", "max_price=inf"])
+def test_get_products_invalid_params(query, client, headers):
+  response = client.get(f"/products?{query}", headers=headers)
+
+  assert response.status_code == 400
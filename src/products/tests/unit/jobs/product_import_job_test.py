@@ -0,0 +1,23 @@
+from flask import Flask
+from unittest.mock import patch
+from app.jobs.product_import_job import recover_product_imports, start_product_import
+
+@patch("app.jobs.product_import_job.ProductService.fail_stale_imports")
+def test_recover_product_imports(mock_fail_stale):
+  mock_fail_stale.return_value = ["import-id"]
+
+  assert recover_product_imports(Flask(__name__)) == ["import-id"]
+
+@patch("app.jobs.product_import_job.db.session")
+@patch("app.jobs.product_import_job.ProductService.fail_stale_imports")
+def test_recover_product_imports_does_not_block_startup(mock_fail_stale, mock_session):
+  mock_fail_stale.side_effect = Exception("relation \"product_imports\" does not exist")
+
+  assert recover_product_imports(Flask(__name__)) == []
+  mock_session.rollback.assert_called_once()
+
+@patch("app.jobs.product_import_job.ProductService.process_import")
+def test_start_product_import_runs_in_app_context(mock_process_import):
+  start_product_import(Flask(__name__), "import-id", "/tmp/carga.csv", True).result()
+
+  mock_process_import.assert_called_once_with("import-id", "/tmp/carga.csv", True)
@@ -0,0 +1,71 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from app.repositories.product_repository import ProductRepository, copy_value, copy_rows
+
+def product_row(name, quantity=1):
+  return {
+    "id": uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+    "name": name,
+    "description": "Ejemplo",
+    "unit_amount": 10.5,
+    "quantity": quantity,
+    "image_url": None,
+    "manufacturer_id": uuid.UUID("123e4567-e89b-12d3-a456-426614174001"),
+    "category_id": uuid.UUID("123e4567-e89b-12d3-a456-426614174002")
+  }
+
+def test_copy_value_escapes_text_format():
+  assert copy_value(None) == "\\N"
+  assert copy_value("") == ""
+  assert copy_value("a\tb\nc\\d\r") == "a\\tb\\nc\\\\d\\r"
+  assert copy_value(10.5) == "10.5"
+
+@patch("app.repositories.product_repository.db.session")
+def test_copy_rows_sends_one_line_per_row(mock_session):
+  cursor = mock_session.connection.return_value.connection.cursor.return_value
+
+  copy_rows("products", [product_row("Producto 1"), product_row("Producto 2")])
+
+  statement, buffer = cursor.copy_expert.call_args[0]
+  assert statement == "COPY products (id, name, description, unit_amount, quantity, image_url, manufacturer_id, category_id) FROM STDIN"
+  assert buffer.getvalue().splitlines()[0] == (
+    "123e4567-e89b-12d3-a456-426614174000\tProducto 1\tEjemplo\t10.5\t1\t\\N\t"
+    "123e4567-e89b-12d3-a456-426614174001\t123e4567-e89b-12d3-a456-426614174002"
+  )
+  assert len(buffer.getvalue().splitlines()) == 2
+  cursor.close.assert_called_once()
+
+@patch("app.repositories.product_repository.db.session")
+@patch("app.repositories.product_repository.copy_rows")
+def test_bulk_insert_copies_into_products(mock_copy_rows, mock_session):
+  rows = [product_row("Producto 1"), product_row("Producto 1")]
+
+  result = ProductRepository.bulk_insert(rows)
+
+  mock_copy_rows.assert_called_once_with("products", rows)
+  mock_session.execute.assert_not_called()
+  assert result == (2, 0)
+
+@patch("app.repositories.product_repository.db.session")
+@patch("app.repositories.product_repository.copy_rows")
+def test_bulk_insert_upsert_by_name_keeps_last_repeated_name(mock_copy_rows, mock_session):
+  mock_session.execute.side_effect = [MagicMock(), MagicMock(), MagicMock(), [SimpleNamespace(name="Producto 1")], MagicMock(rowcount=1)]
+
+  result = ProductRepository.bulk_insert([product_row("Producto 1"), product_row("Producto 2"), product_row("Producto 1", 9)], upsert_by_name=True)
+
+  table, rows = mock_copy_rows.call_args[0]
+  assert table == "products_bulk_staging"
+  assert [(row["name"], row["quantity"]) for row in rows] == [("Producto 1", 9), ("Producto 2", 1)]
+  lock_statement, lock_params = mock_session.execute.call_args_list[2][0]
+  assert str(lock_statement) == "SELECT pg_advisory_xact_lock(hashtext(:name))"
+  assert lock_params == {"name": "products_bulk_upsert"}
+  assert result == (1, 1)
+
+@patch("app.repositories.product_repository.db.session")
+@patch("app.repositories.product_repository.copy_rows")
+def test_bulk_insert_without_rows(mock_copy_rows, mock_session):
+  assert ProductRepository.bulk_insert([], upsert_by_name=True) == (0, 0)
+
+  mock_copy_rows.assert_not_called()
+  mock_session.execute.assert_not_called()
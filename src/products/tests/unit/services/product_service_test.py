@@ -1,8 +1,13 @@
 import pytest
 from flask import Flask
 from unittest.mock import patch, MagicMock
-from app.services.product_service import ProductService, BadRequestError
+from app.services.product_service import ProductService, BadRequestError, NotFoundError, validate_upload_frame, read_upload_chunks, parse_catalog_fields, batch_upload_chunks
+from app.utils.pagination_util import decode_cursor
+from openpyxl import Workbook
+from werkzeug.datastructures import FileStorage
 from app.models.product_model import Product
+from app.models.stock_reservation_model import StockReservationStatusEnum
+from app.models.product_import_model import ProductImportStatusEnum
 import io
 import pandas as pd
 import uuid
@@ -248,18 +253,37 @@ def test_bulk_save_products_creates_and_saves():
   ]
 
   with patch("app.services.product_service.ProductRepository.save_bulk_products") as mock_save:
+    mock_save.return_value = (1, 0)
     result = ProductService.bulk_save_products(product_input)
 
     mock_save.assert_called_once()
+    assert result == (1, 0)
 
-    productos_pasados = mock_save.call_args[0][0]
-    assert isinstance(productos_pasados, list)
-    assert all(isinstance(p, Product) for p in productos_pasados)
+    filas = mock_save.call_args[0][0]
+    assert mock_save.call_args[0][1] is False
+    assert isinstance(filas, list)
+    assert isinstance(filas[0]["id"], uuid.UUID)
 
-    assert productos_pasados[0].name == "Producto Test"
-    assert productos_pasados[0].quantity == 100
-    assert productos_pasados[0].description == "Ejemplo"
-    assert productos_pasados[0].unit_amount == 12000
+    assert filas[0]["name"] == "Producto Test"
+    assert filas[0]["quantity"] == 100
+    assert filas[0]["description"] == "Ejemplo"
+    assert filas[0]["unit_amount"] == 12000
+    assert filas[0]["image_url"] is None
+
+def test_bulk_save_products_upsert_by_name():
+  with patch("app.services.product_service.ProductRepository.save_bulk_products") as mock_save:
+    mock_save.return_value = (0, 1)
+    result = ProductService.bulk_save_products([{
+      "name": "Producto Test",
+      "quantity": 100,
+      "category_id": uuid.uuid4(),
+      "description": "Ejemplo",
+      "manufacturer_id": uuid.uuid4(),
+      "amount_unit": 12000
+    }], upsert_by_name=True)
+
+  assert mock_save.call_args[0][1] is True
+  assert result == (0, 1)
 
 @patch("app.repositories.product_repository.ProductRepository.get_categories")
 def test_get_categories_success(mock_get_categories):
@@ -285,4 +309,543 @@ def test_get_categories_no_categories(mock_get_categories):
 def test_get_categories_error(mock_get_categories):
     mock_get_categories.side_effect = Exception("Error al obtener categorías")
     with pytest.raises(Exception, match="Error al obtener categorías"):
-        ProductService.get_categories() 
\ No newline at end of file
+        ProductService.get_categories() 
+
+@patch("app.repositories.product_repository.ProductRepository.get_products_by_ids")
+def test_get_products_by_ids_success(mock_get_products_by_ids):
+    product_ids = [
+        "123e4567-e89b-12d3-a456-426614174000",
+        "123e4567-e89b-12d3-a456-426614174001",
+        "123e4567-e89b-12d3-a456-426614174000"
+    ]
+    mock_products = [MagicMock(id=product_ids[0]), MagicMock(id=product_ids[1])]
+    mock_get_products_by_ids.return_value = mock_products
+
+    result = ProductService.get_products_by_ids(product_ids)
+
+    mock_get_products_by_ids.assert_called_once_with(product_ids[:2])
+    assert result == mock_products
+
+@pytest.mark.parametrize("product_ids, expected_msg", [
+    (None, "Debe enviar una lista de ids de productos"),
+    ([], "Debe enviar una lista de ids de productos"),
+    ("123e4567-e89b-12d3-a456-426614174000", "Debe enviar una lista de ids de productos"),
+    (["invalid-uuid"], "Uno o más ids de productos no son válidos"),
+    ([123], "Uno o más ids de productos no son válidos"),
+    ([str(uuid.uuid4()) for _ in range(101)], "No se pueden consultar más de 100 productos por petición"),
+])
+def test_get_products_by_ids_invalid_request(product_ids, expected_msg):
+    with pytest.raises(BadRequestError, match=expected_msg):
+        ProductService.get_products_by_ids(product_ids)
+
+@patch("app.repositories.product_repository.ProductRepository.decrement_stock")
+def test_decrement_stock_success(mock_decrement_stock):
+    product_a = "123e4567-e89b-12d3-a456-426614174000"
+    product_b = "123e4567-e89b-12d3-a456-426614174001"
+    mock_decrement_stock.return_value = ({product_a: 5, product_b: 0}, True)
+
+    result = ProductService.decrement_stock({
+        "items": [
+            {"id": product_a, "quantity": 2},
+            {"id": product_b, "quantity": 4},
+            {"id": product_a.upper(), "quantity": 3}
+        ]
+    })
+
+    mock_decrement_stock.assert_called_once_with({product_a: 5, product_b: 4}, atomic=True)
+    assert result == {
+        "applied": True,
+        "items": [
+            {"product_id": product_a, "success": True, "quantity": 5},
+            {"product_id": product_b, "success": True, "quantity": 0}
+        ]
+    }
+
+@patch("app.repositories.product_repository.ProductRepository.decrement_stock")
+def test_decrement_stock_insufficient_stock(mock_decrement_stock):
+    product_a = "123e4567-e89b-12d3-a456-426614174000"
+    product_b = "123e4567-e89b-12d3-a456-426614174001"
+    mock_decrement_stock.return_value = ({product_a: 5}, False)
+
+    result = ProductService.decrement_stock({
+        "items": [
+            {"id": product_a, "quantity": 2},
+            {"id": product_b, "quantity": 40}
+        ]
+    })
+
+    assert result["applied"] is False
+    assert result["items"] == [
+        {"product_id": product_a, "success": True, "quantity": None},
+        {"product_id": product_b, "success": False, "quantity": None}
+    ]
+
+@pytest.mark.parametrize("request_data, expected_msg", [
+    ({}, "Debe enviar una lista de productos válida"),
+    ({"items": []}, "Debe enviar una lista de productos válida"),
+    ({"items": [{"id": "invalid-uuid", "quantity": 1}]}, "El ID del producto no es válido"),
+    ({"items": [{"quantity": 1}]}, "El ID del producto no es válido"),
+    ({"items": [{"id": "123e4567-e89b-12d3-a456-426614174000", "quantity": 0}]}, "La cantidad debe ser un número entero positivo"),
+    ({"items": [{"id": "123e4567-e89b-12d3-a456-426614174000", "quantity": "2"}]}, "La cantidad debe ser un número entero positivo"),
+])
+def test_decrement_stock_invalid_request(request_data, expected_msg):
+    with pytest.raises(BadRequestError, match=expected_msg):
+        ProductService.decrement_stock(request_data)
+
+@patch("app.services.product_service.ProductRepository.decrement_stock")
+@patch("app.services.product_service.StockReservationRepository.reserve")
+def test_decrement_stock_with_reference_registers_reservation(mock_reserve, mock_decrement_stock):
+    product_a = "123e4567-e89b-12d3-a456-426614174000"
+    reference = "223e4567-e89b-12d3-a456-426614174999"
+    mock_reserve.return_value = True
+    mock_decrement_stock.return_value = ({product_a: 5}, True)
+
+    result = ProductService.decrement_stock({"reference": reference, "items": [{"id": product_a, "quantity": 2}]})
+
+    mock_reserve.assert_called_once_with(reference, {product_a: 2})
+    assert result["applied"] is True
+
+@patch("app.services.product_service.db.session")
+@patch("app.services.product_service.ProductRepository.get_products_by_ids")
+@patch("app.services.product_service.ProductRepository.decrement_stock")
+@patch("app.services.product_service.StockReservationRepository")
+def test_decrement_stock_with_repeated_reference_is_not_applied_twice(mock_reservations, mock_decrement_stock, mock_get_products, mock_session):
+    product_a = "123e4567-e89b-12d3-a456-426614174000"
+    reference = "223e4567-e89b-12d3-a456-426614174999"
+    mock_reservations.reserve.return_value = False
+    mock_reservations.get.return_value = MagicMock(status=StockReservationStatusEnum.APPLIED)
+    mock_get_products.return_value = [MagicMock(id=uuid.UUID(product_a), quantity=5)]
+
+    result = ProductService.decrement_stock({"reference": reference, "items": [{"id": product_a, "quantity": 2}]})
+
+    mock_decrement_stock.assert_not_called()
+    assert result == {"applied": True, "items": [{"product_id": product_a, "success": True, "quantity": 5}]}
+
+@patch("app.services.product_service.db.session")
+@patch("app.services.product_service.ProductRepository.get_products_by_ids")
+@patch("app.services.product_service.StockReservationRepository")
+def test_decrement_stock_with_released_reference_is_not_applied(mock_reservations, mock_get_products, mock_session):
+    product_a = "123e4567-e89b-12d3-a456-426614174000"
+    mock_reservations.reserve.return_value = False
+    mock_reservations.get.return_value = MagicMock(status=StockReservationStatusEnum.RELEASED)
+    mock_get_products.return_value = []
+
+    result = ProductService.decrement_stock({
+        "reference": "223e4567-e89b-12d3-a456-426614174999",
+        "items": [{"id": product_a, "quantity": 2}]
+    })
+
+    assert result["applied"] is False
+
+@patch("app.services.product_service.db.session")
+@patch("app.services.product_service.ProductRepository.increment_stock")
+@patch("app.services.product_service.StockReservationRepository.release")
+def test_release_stock_returns_applied_reservations(mock_release, mock_increment_stock, mock_session):
+    product_a = "123e4567-e89b-12d3-a456-426614174000"
+    product_b = "123e4567-e89b-12d3-a456-426614174001"
+    reference_1 = "223e4567-e89b-12d3-a456-426614174998"
+    reference_2 = "223e4567-e89b-12d3-a456-426614174999"
+    mock_release.return_value = {reference_1: {product_a: 2, product_b: 1}, reference_2: {product_a: 3}}
+    mock_increment_stock.return_value = {product_a: 10, product_b: 4}
+
+    result = ProductService.release_stock({"references": [reference_1, reference_2, reference_1]})
+
+    mock_release.assert_called_once_with([reference_1, reference_2])
+    mock_increment_stock.assert_called_once_with({product_a: 5, product_b: 1})
+    mock_session.commit.assert_called_once()
+    assert result["released"] == [reference_1, reference_2]
+
+@patch("app.services.product_service.db.session")
+@patch("app.services.product_service.ProductRepository.increment_stock")
+@patch("app.services.product_service.StockReservationRepository.release")
+def test_release_stock_already_released(mock_release, mock_increment_stock, mock_session):
+    mock_release.return_value = {}
+
+    result = ProductService.release_stock({"references": ["223e4567-e89b-12d3-a456-426614174999"]})
+
+    mock_increment_stock.assert_not_called()
+    assert result == {"released": [], "items": []}
+
+@pytest.mark.parametrize("request_data, expected_msg", [
+    ({}, "Debe enviar una lista de referencias válida"),
+    ({"references": []}, "Debe enviar una lista de referencias válida"),
+    ({"references": ["invalid-uuid"]}, "La referencia del descuento no es válida"),
+])
+def test_release_stock_invalid_request(request_data, expected_msg):
+    with pytest.raises(BadRequestError, match=expected_msg):
+        ProductService.release_stock(request_data)
+
+def test_validate_upload_frame_collects_errors_per_row():
+  manufacturer_id = uuid.UUID("11111111-1111-1111-1111-111111111111")
+  category_id = uuid.UUID("22222222-2222-2222-2222-222222222222")
+  frame = pd.DataFrame([
+    {"Nombre del producto": "A", "Descripción": "ok", "Cantidad inicial": 5, "Precio unitario": 10.5,
+     "Nombre del fabricante": " Fabricante ", "Nombre de la categoría": "CATEGORÍA"},
+    {"Nombre del producto": " ", "Descripción": "", "Cantidad inicial": 1, "Precio unitario": 1,
+     "Nombre del fabricante": "Fabricante", "Nombre de la categoría": "otra"},
+    {"Nombre del producto": "C", "Descripción": "ok", "Cantidad inicial": 1, "Precio unitario": 1,
+     "Nombre del fabricante": "otro", "Nombre de la categoría": "categoría"},
+  ]).astype(object)
+
+  validos, errores, error_rows = validate_upload_frame(frame, {"fabricante": manufacturer_id}, {"categoría": category_id})
+
+  assert validos == [{
+    "name": "A",
+    "description": "ok",
+    "quantity": 5,
+    "amount_unit": 10.5,
+    "manufacturer_id": manufacturer_id,
+    "manufacturer_name": " Fabricante ",
+    "category_id": category_id,
+  }]
+  assert errores[0]["errores"] == ["Columna 'Nombre del producto' vacía", "Columna 'Descripción' vacía", "Categoría no encontrada"]
+  assert errores[0]["manufacturer_id"] == manufacturer_id
+  assert "category_id" not in errores[0]
+  assert errores[1]["errores"] == ["Fabricante no encontrado"]
+  assert errores[1]["category_id"] == category_id
+  assert "manufacturer_id" not in errores[1]
+  assert error_rows == [1, 2]
+
+def test_validate_upload_frame_missing_column_is_not_empty():
+  frame = pd.DataFrame([{"Nombre del producto": "A"}]).astype(object)
+
+  validos, errores, _ = validate_upload_frame(frame, {}, {})
+
+  assert validos == []
+  assert errores[0]["errores"] == [
+    "Columna 'Cantidad inicial' no es un número válido",
+    "Columna 'Precio unitario' no es un número válido",
+    "Fabricante no encontrado",
+    "Categoría no encontrada"
+  ]
+
+def test_validate_upload_frame_rejects_non_numeric_cells():
+  manufacturer_id = uuid.UUID("11111111-1111-1111-1111-111111111111")
+  category_id = uuid.UUID("22222222-2222-2222-2222-222222222222")
+  frame = pd.DataFrame([
+    {"Nombre del producto": "A", "Descripción": "ok", "Cantidad inicial": "5", "Precio unitario": "10.5",
+     "Nombre del fabricante": "Fabricante", "Nombre de la categoría": "Categoría"},
+    {"Nombre del producto": "B", "Descripción": "ok", "Cantidad inicial": "cinco", "Precio unitario": "inf",
+     "Nombre del fabricante": "Fabricante", "Nombre de la categoría": "Categoría"},
+    {"Nombre del producto": "C", "Descripción": "ok", "Cantidad inicial": "", "Precio unitario": "$10",
+     "Nombre del fabricante": "Fabricante", "Nombre de la categoría": "Categoría"},
+  ]).astype(object)
+
+  validos, errores, error_rows = validate_upload_frame(frame, {"fabricante": manufacturer_id}, {"categoría": category_id})
+
+  assert [(p["name"], p["quantity"], p["amount_unit"]) for p in validos] == [("A", 5, 10.5)]
+  assert error_rows == [1, 2]
+  assert errores[0]["errores"] == [
+    "Columna 'Cantidad inicial' no es un número válido",
+    "Columna 'Precio unitario' no es un número válido"
+  ]
+  assert errores[1]["errores"] == ["Columna 'Cantidad inicial' vacía", "Columna 'Precio unitario' no es un número válido"]
+
+
+UPLOAD_HEADER = "Nombre del producto,Descripción,Cantidad inicial,Precio unitario,Nombre del fabricante,Nombre de la categoría\n"
+
+@patch("app.services.product_service.ProductImportRepository")
+def test_create_import_saves_file(mock_imports, tmp_path):
+  file = MagicMock()
+  file.filename = "productos.CSV"
+  file.save.side_effect = lambda path: open(path, "w", encoding="utf-8").write(UPLOAD_HEADER)
+
+  with patch("app.services.product_service.PRODUCT_IMPORTS_DIR", str(tmp_path)):
+    product_import, path = ProductService.create_import(file)
+
+  assert path == str(tmp_path / f"{product_import.id}.csv")
+  file.save.assert_called_once_with(path)
+  mock_imports.create.assert_called_once_with(product_import)
+  assert product_import.status == ProductImportStatusEnum.PENDING
+
+@patch("app.services.product_service.ProductImportRepository")
+def test_create_import_missing_columns(mock_imports, tmp_path):
+  file = MagicMock()
+  file.filename = "productos.csv"
+  file.save.side_effect = lambda path: open(path, "w", encoding="utf-8").write("Nombre del producto,Descripción\nA,ok\n")
+
+  with patch("app.services.product_service.PRODUCT_IMPORTS_DIR", str(tmp_path)):
+    with pytest.raises(BadRequestError, match="Faltan columnas requeridas en el archivo: Cantidad inicial"):
+      ProductService.create_import(file)
+
+  mock_imports.create.assert_not_called()
+  assert list(tmp_path.iterdir()) == []
+
+def test_create_import_unsupported_format():
+  file = MagicMock()
+  file.filename = "productos.txt"
+
+  with pytest.raises(BadRequestError, match="Formato no soportado"):
+    ProductService.create_import(file)
+
+  file.save.assert_not_called()
+
+@patch("app.services.product_service.ProductRepository.bulk_insert")
+@patch("app.services.product_service.ProductImportRepository")
+@patch("app.services.product_service.Manufacturer")
+@patch("app.services.product_service.Category")
+def test_process_import_inserts_by_chunk(mock_category, mock_manufacturer, mock_imports, mock_bulk_insert, tmp_path):
+  manufacturer_id = uuid.uuid4()
+  manufacturer = MagicMock(id=manufacturer_id)
+  manufacturer.name = "Fabricante"
+  category = MagicMock(id="cat-id")
+  category.name = "Categoría"
+  mock_manufacturer.query.all.return_value = [manufacturer]
+  mock_category.query.all.return_value = [category]
+  path = tmp_path / "carga.csv"
+  path.write_text(
+    "Nombre del producto,Descripción,Cantidad inicial,Precio unitario,Nombre del fabricante,Nombre de la categoría\n"
+    "A,ok,5,10,Fabricante,Categoría\n"
+    "B,ok,5,10,Otro,Categoría\n"
+    "C,ok,5,10,Fabricante,Categoría\n",
+    encoding="utf-8"
+  )
+
+  mock_bulk_insert.side_effect = [(1, 0), (0, 1)]
+
+  ProductService.process_import("import-id", str(path), upsert_by_name=True, chunksize=2)
+
+  assert [call.args[0][0]["name"] for call in mock_bulk_insert.call_args_list] == ["A", "C"]
+  assert all(call.args[1] is True for call in mock_bulk_insert.call_args_list)
+  mock_imports.add_errors.assert_any_call("import-id", [(
+    2,
+    {"Nombre del producto": "B", "Descripción": "ok", "Cantidad inicial": 5, "Precio unitario": 10,
+     "Nombre del fabricante": "Otro", "Nombre de la categoría": "Categoría", "category_id": "cat-id"},
+    ["Fabricante no encontrado"]
+  )])
+  assert [call.args for call in mock_imports.add_progress.call_args_list] == [("import-id", 2, 1, 0, 1), ("import-id", 1, 0, 1, 0)]
+  mock_imports.set_status.assert_called_with("import-id", ProductImportStatusEnum.COMPLETED)
+  assert not path.exists()
+
+@patch("app.services.product_service.db.session")
+@patch("app.services.product_service.ProductImportRepository")
+@patch("app.services.product_service.Manufacturer")
+@patch("app.services.product_service.Category")
+def test_process_import_marks_failed(mock_category, mock_manufacturer, mock_imports, mock_session, tmp_path):
+  mock_manufacturer.query.all.return_value = []
+  mock_category.query.all.return_value = []
+  mock_imports.add_progress.side_effect = Exception("conexión perdida")
+  path = tmp_path / "carga.csv"
+  path.write_text(UPLOAD_HEADER + "A,ok,5,10,Fabricante,Categoría\n", encoding="utf-8")
+
+  ProductService.process_import("import-id", str(path))
+
+  mock_session.rollback.assert_called_once()
+  mock_imports.set_status.assert_called_with("import-id", ProductImportStatusEnum.FAILED, "conexión perdida")
+  assert not path.exists()
+
+@patch("app.services.product_service.ProductImportRepository")
+def test_get_import_paginates_errors(mock_imports):
+  import_id = "223e4567-e89b-12d3-a456-426614174999"
+  mock_imports.get_errors_page.return_value = [MagicMock(row_number=n) for n in (3, 7, 9)]
+
+  product_import, errors, next_after = ProductService.get_import(import_id, limit=2, after_row=1)
+
+  mock_imports.get_errors_page.assert_called_once_with(import_id, 2, 1)
+  assert product_import == mock_imports.get_by_id.return_value
+  assert [error.row_number for error in errors] == [3, 7]
+  assert next_after == 7
+
+@patch("app.services.product_service.ProductImportRepository")
+def test_get_import_not_found(mock_imports):
+  mock_imports.get_by_id.return_value = None
+
+  with pytest.raises(NotFoundError):
+    ProductService.get_import("223e4567-e89b-12d3-a456-426614174999")
+
+def test_get_import_invalid_id():
+  with pytest.raises(BadRequestError):
+    ProductService.get_import("invalid-uuid")
+
+
+def write_workbook(path, rows):
+  workbook = Workbook()
+  for row in rows:
+    workbook.active.append(row)
+  workbook.save(path)
+  return str(path)
+
+def test_read_upload_chunks_streams_excel_rows(tmp_path):
+  path = write_workbook(tmp_path / "carga.xlsx", [
+    ["Nombre del producto", "Cantidad inicial"],
+    ["A", 5],
+    [None, None],
+    ["B"],
+    ["C", 7],
+    [None, None],
+    [None, None],
+  ])
+
+  chunks = list(read_upload_chunks(path, "xlsx", chunksize=2))
+
+  assert [chunk.index.tolist() for chunk in chunks] == [[0, 1], [2, 3]]
+  assert chunks[0].to_dict("records") == [
+    {"Nombre del producto": "A", "Cantidad inicial": 5},
+    {"Nombre del producto": "", "Cantidad inicial": ""},
+  ]
+  assert chunks[1].to_dict("records") == [
+    {"Nombre del producto": "B", "Cantidad inicial": ""},
+    {"Nombre del producto": "C", "Cantidad inicial": 7},
+  ]
+
+def test_read_upload_chunks_empty_excel(tmp_path):
+  path = write_workbook(tmp_path / "vacio.xlsx", [])
+
+  assert list(read_upload_chunks(path, "xlsx")) == []
+
+@patch("app.services.product_service.Manufacturer")
+@patch("app.services.product_service.Category")
+def test_parse_and_validate_excel_file(mock_category, mock_manufacturer, tmp_path):
+  manufacturer = MagicMock(id="fab-id")
+  manufacturer.name = "Fabricante"
+  category = MagicMock(id="cat-id")
+  category.name = "Categoría"
+  mock_manufacturer.query.all.return_value = [manufacturer]
+  mock_category.query.all.return_value = [category]
+  path = write_workbook(tmp_path / "carga.xlsx", [
+    ["Nombre del producto", "Descripción", "Cantidad inicial", "Precio unitario", "Nombre del fabricante", "Nombre de la categoría"],
+    ["A", "ok", 5, 10.5, "Fabricante", "Categoría"],
+    ["B", "ok", 5, 10.5, "Otro", "Categoría"],
+  ])
+
+  with open(path, "rb") as stream:
+    result = ProductService.parse_and_validate_file(FileStorage(stream, filename="carga.xlsx"))
+
+  assert result["cantidad_validos"] == 1
+  assert result["validos"][0]["amount_unit"] == 10.5
+  assert result["errores"][0]["errores"] == ["Fabricante no encontrado"]
+
+
+@patch("app.services.product_service.ProductRepository.get_page")
+def test_get_catalog_page_applies_filters(mock_get_page):
+  category_id = "123e4567-e89b-12d3-a456-426614174001"
+  products = [MagicMock(id=uuid.uuid4()) for _ in range(3)]
+  for i, product in enumerate(products):
+    product.name = f"Producto {i}"
+  mock_get_page.return_value = products
+
+  result, next_cursor = ProductService.get_catalog_page(
+    2, fields=["id", "name"], category_id=category_id, in_stock="true", min_price="10", max_price="20.5"
+  )
+
+  mock_get_page.assert_called_once_with(
+    2, after=None, fields=["id", "name"], category_id=category_id, manufacturer_id=None,
+    in_stock=True, min_price=10.0, max_price=20.5
+  )
+  assert result == products[:2]
+  assert decode_cursor(next_cursor) == ("Producto 1", products[1].id)
+
+@patch("app.services.product_service.ProductRepository.get_page")
+def test_get_catalog_page_last_page(mock_get_page):
+  mock_get_page.return_value = [MagicMock()]
+
+  result, next_cursor = ProductService.get_catalog_page(2)
+
+  assert len(result) == 1
+  assert next_cursor is None
+  assert mock_get_page.call_args.kwargs["in_stock"] is False
+
+@pytest.mark.parametrize("filters, expected_msg", [
+  ({"category_id": "invalid-uuid"}, "El parámetro 'category_id' no es válido"),
+  ({"in_stock": "quizás"}, "El parámetro 'in_stock' debe ser true o false"),
+  ({"min_price": "abc"}, "El parámetro 'min_price' debe ser un número"),
+  ({"min_price": "nan"}, "El parámetro 'min_price' debe ser un número"),
+  ({"max_price": "inf"}, "El parámetro 'max_price' debe ser un número"),
+  ({"max_price": "-1"}, "El parámetro 'max_price' no puede ser negativo"),
+  ({"min_price": "30", "max_price": "20"}, "El parámetro 'min_price' no puede ser mayor que 'max_price'"),
+])
+def test_get_catalog_page_invalid_filters(filters, expected_msg):
+  with pytest.raises(BadRequestError, match=expected_msg):
+    ProductService.get_catalog_page(10, **filters)
+
+def test_parse_catalog_fields():
+  assert parse_catalog_fields(None) is None
+  assert parse_catalog_fields(" ") is None
+  assert parse_catalog_fields("id, name,unit_amount,name") == ["id", "name", "unit_amount"]
+
+  with pytest.raises(BadRequestError, match="Campos no válidos: precio"):
+    parse_catalog_fields("id,precio")
+
+@patch("app.services.product_service.db.session")
+@patch("app.services.product_service.ProductRepository.bulk_insert")
+@patch("app.services.product_service.ProductImportRepository")
+@patch("app.services.product_service.Manufacturer")
+@patch("app.services.product_service.Category")
+def test_process_import_missing_columns_writes_nothing(mock_category, mock_manufacturer, mock_imports, mock_bulk_insert, mock_session, tmp_path):
+  mock_manufacturer.query.all.return_value = []
+  mock_category.query.all.return_value = []
+  path = tmp_path / "carga.csv"
+  path.write_text("Nombre del producto\nA\n", encoding="utf-8")
+
+  ProductService.process_import("import-id", str(path))
+
+  mock_bulk_insert.assert_not_called()
+  mock_imports.add_progress.assert_not_called()
+  assert mock_imports.set_status.call_args.args[1] == ProductImportStatusEnum.FAILED
+  assert "Faltan columnas requeridas" in mock_imports.set_status.call_args.args[2]
+
+@patch("app.services.product_service.ProductRepository.bulk_insert")
+@patch("app.services.product_service.ProductImportRepository")
+def test_process_import_skips_import_no_longer_pending(mock_imports, mock_bulk_insert, tmp_path):
+  mock_imports.claim.return_value = False
+  path = tmp_path / "carga.csv"
+  path.write_text(UPLOAD_HEADER, encoding="utf-8")
+
+  ProductService.process_import("import-id", str(path))
+
+  mock_bulk_insert.assert_not_called()
+  mock_imports.set_status.assert_not_called()
+  assert not path.exists()
+
+@patch("app.services.product_service.ProductImportRepository")
+def test_fail_stale_imports_removes_spooled_files(mock_imports, tmp_path):
+  import_id = uuid.uuid4()
+  mock_imports.fail_stale.return_value = [import_id]
+  (tmp_path / f"{import_id}.xlsx").write_bytes(b"")
+  (tmp_path / "otra.csv").write_text("", encoding="utf-8")
+
+  with patch("app.services.product_service.PRODUCT_IMPORTS_DIR", str(tmp_path)):
+    result = ProductService.fail_stale_imports(60)
+
+  assert result == [import_id]
+  assert mock_imports.fail_stale.call_args.args[0] == 60
+  assert [path.name for path in tmp_path.iterdir()] == ["otra.csv"]
+
+def test_batch_upload_chunks_joins_consecutive_chunks():
+  chunks = [pd.DataFrame({"a": [i, i]}, index=[2 * i, 2 * i + 1]) for i in range(5)]
+
+  batches = list(batch_upload_chunks(iter(chunks), batch_size=4))
+
+  assert [batch.index.tolist() for batch in batches] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+@patch("app.services.product_service.UPLOAD_VALIDATION_BATCH_SIZE", 2)
+@patch("app.services.product_service.Manufacturer")
+@patch("app.services.product_service.Category")
+def test_parse_and_validate_file_validates_each_batch(mock_category, mock_manufacturer):
+  manufacturer = MagicMock(id="fab-id")
+  manufacturer.name = "Fabricante"
+  category = MagicMock(id="cat-id")
+  category.name = "Categoría"
+  mock_manufacturer.query.all.return_value = [manufacturer]
+  mock_category.query.all.return_value = [category]
+  content = UPLOAD_HEADER + "".join(
+    f"P{i},ok,{i},10,{'Fabricante' if i % 2 else 'Otro'},Categoría\n" for i in range(250)
+  )
+  file = FileStorage(io.BytesIO(content.encode("utf-8")), filename="carga.csv")
+
+  with patch("app.services.product_service.validate_upload_frame", wraps=validate_upload_frame) as mock_validate:
+    result = ProductService.parse_and_validate_file(file)
+
+  # Tres bloques de lectura de hasta 100 filas, cada uno ya supera el lote de 2 filas
+  assert [len(call.args[0]) for call in mock_validate.call_args_list] == [100, 100, 50]
+  assert result["cantidad_validos"] == 125
+  assert result["cantidad_errores"] == 125
+  assert result["validos"][0]["name"] == "P1"
+  assert result["errores"][-1]["Nombre del producto"] == "P248"
+
+def test_parse_and_validate_file_missing_columns():
+  file = FileStorage(io.BytesIO("Nombre del producto\nA\n".encode("utf-8")), filename="carga.csv")
+
+  with patch("app.services.product_service.get_upload_maps", return_value=({}, {})):
+    with pytest.raises(BadRequestError, match="Faltan columnas requeridas"):
+      ProductService.parse_and_validate_file(file)
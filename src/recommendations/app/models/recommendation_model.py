@@ -4,6 +4,9 @@ from sqlalchemy.dialects.postgresql import UUID
 
 class Recommendation(db.Model):
   __tablename__ = 'recommendations'
+  __table_args__ = (
+    db.Index('ix_recommendations_seller_id_customer_id', 'seller_id', 'customer_id'),
+  )
     
   id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
   video_url = db.Column(db.String(255), nullable=False)
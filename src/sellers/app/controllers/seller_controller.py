@@ -6,6 +6,7 @@ from app.exceptions.http_exceptions import BadRequestError
 from app.models.seller_model import SellerSchema
 from app.models.sales_plan_model import SalesPlanSchema
 from flask_jwt_extended import jwt_required
+from app.utils import http_client
 
 seller_bp = Blueprint('seller', __name__, url_prefix="/sellers")
 
@@ -39,6 +40,12 @@ def create_seller():
 def ping():
   return format_response("success", 200, "pong")
 
+@seller_bp.route('/metrics', methods=['GET'])
+@jwt_required()
+@validate_role("admin")
+def get_metrics():
+  return format_response("success", 200, "Métricas obtenidas con éxito", data={"http_client": http_client.get_metrics()})
+
 @seller_bp.route('/<string:seller_id>/sales-plans', methods=['GET'])
 @jwt_required()
 @validate_role("admin")
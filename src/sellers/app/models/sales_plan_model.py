@@ -12,7 +12,7 @@ class SalesPlan(db.Model):
   created_at = db.Column(db.DateTime, server_default=db.func.now())
   updated_at = db.Column(db.DateTime, server_default=db.func.now(), server_onupdate=db.func.now())
 
-  seller_id = db.Column(UUID(as_uuid=True), nullable=False)
+  seller_id = db.Column(UUID(as_uuid=True), nullable=False, index=True)
 
   def __init__(self, initial_date, end_date, sales_goals, seller_id):
     self.initial_date = initial_date
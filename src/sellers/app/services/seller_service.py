@@ -1,11 +1,11 @@
 import os
 import uuid
 import re
-import requests
 from app.exceptions.http_exceptions import BadRequestError
 from app.repositories.seller_repository import SellerRepository
 from flask import request
 from app.models.seller_model import SellerSchema
+from app.utils import http_client
 from datetime import datetime
 
 seller_schema = SellerSchema()
@@ -35,7 +35,7 @@ class SellerService:
       headers = {
         'Authorization': f'Bearer {token}',
       }
-      response = requests.get(f'{SellerService.BASE_URL_USER_API}/{seller.user_id}', headers=headers)
+      response = http_client.get(f'{SellerService.BASE_URL_USER_API}/{seller.user_id}', upstream="users", headers=headers)
       if response.status_code != 200:
         raise BadRequestError("No se pudo obtener el vendedor")
       seller_dict = seller_schema.dump(seller)
@@ -66,7 +66,7 @@ class SellerService:
       "password": SellerService.PASSWORD_DEFAULT,
       "role": "seller"
     }
-    response = requests.post(external_api_url, json=payload)
+    response = http_client.post(external_api_url, upstream="users", json=payload)
     if response.status_code != 201:
       raise BadRequestError(response.json().get("error"))
     seller = {
@@ -0,0 +1,34 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from app.controllers.seller_controller import seller_bp
+
+@pytest.fixture
+def app():
+  app = Flask(__name__)
+  app.config["JWT_SECRET_KEY"] = "test-secret"
+  app.config["TESTING"] = True
+  JWTManager(app)
+  app.register_blueprint(seller_bp)
+  return app
+
+@pytest.fixture
+def client(app):
+  return app.test_client()
+
+def auth_header(app, role):
+  with app.app_context():
+    return {"Authorization": f"Bearer {create_access_token(identity='user-1', additional_claims={'role': role})}"}
+
+def test_get_metrics(mocker, app, client):
+  mocker.patch("app.utils.http_client.get_metrics", return_value={"users": {"requests": 3}})
+
+  response = client.get("/sellers/metrics", headers=auth_header(app, "admin"))
+
+  assert response.status_code == 200
+  assert response.get_json()["data"] == {"http_client": {"users": {"requests": 3}}}
+
+def test_get_metrics_requires_admin(app, client):
+  response = client.get("/sellers/metrics", headers=auth_header(app, "seller"))
+
+  assert response.status_code == 403
@@ -71,7 +71,7 @@ def test_create_seller_invalid_email(seller_data):
     SellerService.create(seller_data)
 
 @patch.dict(os.environ, {'PATH_API_USER': 'http://mocked_api/users', 'PASSWORD_DEFAULT': 'password123'})
-@patch('requests.post')
+@patch('app.services.seller_service.http_client.post')
 @patch.object(SellerRepository, 'create', return_value={"id": "mocked-id"})
 def test_create_seller_success(mock_create, mock_post, seller_data):
   mock_response = MagicMock()
@@ -88,7 +88,7 @@ def test_create_seller_success(mock_create, mock_post, seller_data):
   mock_post.assert_called_once()
   mock_create.assert_called_once()
 
-@patch('requests.post')
+@patch('app.services.seller_service.http_client.post')
 def test_create_seller_external_api_failure(mock_post, seller_data):
   mock_response = MagicMock()
   mock_response.status_code = 400
@@ -99,7 +99,7 @@ def test_create_seller_external_api_failure(mock_post, seller_data):
     SellerService.create(seller_data)
 
 @patch('app.repositories.seller_repository.SellerRepository.get_all')
-@patch('requests.get')
+@patch('app.services.seller_service.http_client.get')
 def test_get_all_success(mock_requests_get, mock_get_all, mock_sellers, seller_schema, client):
   mock_get_all.return_value = mock_sellers
 
@@ -121,7 +121,7 @@ def test_get_all_success(mock_requests_get, mock_get_all, mock_sellers, seller_s
     assert sellers_dict[0]['email'] == "juan.perez@example.com"
 
 @patch('app.repositories.seller_repository.SellerRepository.get_all')
-@patch('requests.get')
+@patch('app.services.seller_service.http_client.get')
 def test_get_all_failure(mock_requests_get, mock_get_all, mock_sellers, seller_schema, client):
   mock_get_all.return_value = mock_sellers
 
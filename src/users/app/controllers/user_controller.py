@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.user_service import UserService
 from app.models.user_model import UserSchema
 from app.utils.response_util import format_response
+from app.utils.validate_role_util import validate_role
 from app.exceptions.http_exceptions import NotFoundError, BadRequestError
 
 user_bp = Blueprint('user', __name__, url_prefix='/users')
@@ -20,6 +21,15 @@ def get_users():
         return format_response("success", 200, message="Todos los usuarios han sido obtenidos", data=users_schema.dump(users))
 
 
+@user_bp.route('/blocked', methods=['GET'])
+@jwt_required()
+# Lo consultan los administradores y los demás microservicios con su token de servicio
+@validate_role(["admin", "service"])
+def get_blocked_users():
+    blocked_ids = UserService.get_blocked_ids()
+    return format_response("success", 200, message="Usuarios bloqueados obtenidos con éxito", data=blocked_ids)
+
+
 @user_bp.route('/<string:id>', methods=['GET'])
 @jwt_required()
 def get_user(id:str):
@@ -1,26 +1,60 @@
 import os
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
+from flask_migrate import Migrate, upgrade
 from sqlalchemy import inspect, text
 
 db = SQLAlchemy()
 ma = Marshmallow()
+migrate = Migrate()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "migrations")
+# Todos los servicios comparten la base de datos, cada uno registra sus migraciones en su propia tabla
+VERSION_TABLE = "alembic_version_users"
+# Tablas que este servicio mapea pero que pertenecen a otro servicio, sus migraciones no las incluyen
+EXTERNAL_TABLES = set()
+
+# create_all: crea las tablas faltantes al iniciar (desarrollo local y pruebas)
+# migrate: aplica las migraciones pendientes al iniciar, sin reflejar el esquema
+# none: no toca el esquema, las migraciones se aplican por fuera con `flask db upgrade`
+SCHEMA_MODE = os.getenv("DB_SCHEMA_MODE", "create_all")
+
+def include_object(object, name, type_, reflected, compare_to):
+    # La autogeneración ignora las tablas de otros servicios que existen en la misma base de datos
+    if type_ == "table":
+        return name in db.metadata.tables and name not in EXTERNAL_TABLES
+    return True
+
+def seed_initial_data():
+    """
+    Inserta los datos de data.sql si la tabla users está vacía, tanto después de create_all como
+    después de aplicar las migraciones. Con varias réplicas el bloqueo de transacción evita que
+    dos inserten los datos a la vez.
+    """
+    sql_file = os.path.join(os.path.dirname(__file__), "data.sql")
+    if not os.path.exists(sql_file) or "users" not in inspect(db.engine).get_table_names():
+        return
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": VERSION_TABLE})
+    result = db.session.execute(text("SELECT COUNT(*) FROM users")).scalar()
+    if result == 0:
+        with open(sql_file, "r") as f:
+            db.session.execute(text(f.read()))
+        print("Datos iniciales insertados correctamente en la base de datos.")
+    # La confirmación también libera el bloqueo
+    db.session.commit()
 
 def init_db(app):
     db.init_app(app)
     ma.init_app(app)
-    
-    with app.app_context():
-        db.create_all()
-        inspector = inspect(db.engine)
-        if "users" in inspector.get_table_names():
-            result = db.session.execute(text("SELECT COUNT(*) FROM users")).scalar()
-            if result == 0:
-                base_dir = os.path.dirname(__file__)
-                sql_file = os.path.join(base_dir, "data.sql")
-                if os.path.exists(sql_file):
-                    with open(sql_file, "r") as f:
-                        sql_statements = f.read()
-                        db.session.execute(text(sql_statements))
-                        db.session.commit()
-                    print("Datos iniciales insertados correctamente en la base de datos.")
\ No newline at end of file
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR, render_as_batch=False,
+                     version_table=VERSION_TABLE, include_object=include_object)
+
+    if SCHEMA_MODE == "create_all":
+        with app.app_context():
+            db.create_all()
+            seed_initial_data()
+    elif SCHEMA_MODE == "migrate":
+        with app.app_context():
+            upgrade(directory=MIGRATIONS_DIR)
+            seed_initial_data()
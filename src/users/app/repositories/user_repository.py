@@ -1,4 +1,4 @@
-from app.models.user_model import User
+from app.models.user_model import User, StatusEnum
 from app.core.database import db
 
 class UserRepository:
@@ -18,6 +18,10 @@ class UserRepository:
     def get_by_username(username):
         return User.query.filter_by(username=username).first()
 
+    @staticmethod
+    def get_blocked_ids():
+        return [user_id for (user_id,) in db.session.query(User.id).filter(User.status == StatusEnum.BLOCKED).all()]
+
     @staticmethod
     def create(user: User):
         db.session.add(user)
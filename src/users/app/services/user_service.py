@@ -50,6 +50,10 @@ class UserService:
             raise ForbiddenError("Tu cuenta ha sido bloqueada. Contacta al soporte del G18 para más información.")
         return user
 
+    @staticmethod
+    def get_blocked_ids():
+        return [str(user_id) for user_id in UserRepository.get_blocked_ids()]
+
     @staticmethod
     def get_by_email(email):
         if is_valid_email(email) is False:
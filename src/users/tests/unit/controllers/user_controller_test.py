@@ -1,6 +1,6 @@
 import pytest
 from flask import Flask
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, create_access_token
 from app.controllers.user_controller import user_bp
 from app.models.user_model import User
 from app.exceptions.http_exceptions import NotFoundError, BadRequestError
@@ -114,3 +114,26 @@ def test_ping(client):
     data = response.get_json()
     assert data["status"] == "success"
     assert data["message"] == "pong"
+
+
+def auth_header(app, role):
+    with app.app_context():
+        return {"Authorization": f"Bearer {create_access_token(identity='orders-service', additional_claims={'role': role})}"}
+
+@pytest.mark.parametrize("role", ["admin", "service"])
+def test_get_blocked_users(mocker, app, client, role):
+    mocker.patch("app.services.user_service.UserService.get_blocked_ids", return_value=["4e49e816-e4b0-4d94-974b-8b35d905ae21"])
+
+    response = client.get("/users/blocked", headers=auth_header(app, role))
+
+    assert response.status_code == 200
+    assert response.get_json()["data"] == ["4e49e816-e4b0-4d94-974b-8b35d905ae21"]
+
+@pytest.mark.parametrize("role", ["customer", "seller"])
+def test_get_blocked_users_requires_admin_or_service(mocker, app, client, role):
+    mock_get_blocked = mocker.patch("app.services.user_service.UserService.get_blocked_ids")
+
+    response = client.get("/users/blocked", headers=auth_header(app, role))
+
+    assert response.status_code == 403
+    mock_get_blocked.assert_not_called()
@@ -1,3 +1,4 @@
+import uuid
 import pytest
 from unittest.mock import MagicMock, patch
 from app.services.user_service import UserService, is_valid_email, validate_uuid
@@ -122,3 +123,13 @@ def test_check_credentials_invalid(mock_get_by_email, mock_get_by_username):
     mock_get_by_username.return_value = None
     with pytest.raises(UnauthorizedError, match="Credenciales inválidas"):
         UserService.check_credentials({"username": "invaliduser", "password": "wrongpassword"})
+
+
+@patch("app.repositories.user_repository.UserRepository.get_blocked_ids")
+def test_get_blocked_ids(mock_get_blocked_ids):
+    blocked_id = uuid.UUID("4e49e816-e4b0-4d94-974b-8b35d905ae21")
+    mock_get_blocked_ids.return_value = [blocked_id]
+
+    result = UserService.get_blocked_ids()
+
+    assert result == ["4e49e816-e4b0-4d94-974b-8b35d905ae21"]
@@ -1,12 +1,49 @@
+import os
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
+from flask_migrate import Migrate, upgrade
 
 db = SQLAlchemy()
 ma = Marshmallow()
+migrate = Migrate()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "migrations")
+# Todos los servicios comparten la base de datos, cada uno registra sus migraciones en su propia tabla
+VERSION_TABLE = "alembic_version_visits"
+# Tablas que este servicio mapea pero que pertenecen a otro servicio, sus migraciones no las incluyen
+EXTERNAL_TABLES = set()
+
+# create_all: crea las tablas faltantes al iniciar (desarrollo local y pruebas)
+# migrate: aplica las migraciones pendientes al iniciar, sin reflejar el esquema
+# none: no toca el esquema, las migraciones se aplican por fuera con `flask db upgrade`
+SCHEMA_MODE = os.getenv("DB_SCHEMA_MODE", "create_all")
+
+def create_missing_indexes():
+  """
+  db.create_all() solo crea los índices junto con las tablas nuevas; los índices declarados
+  en los modelos se agregan aquí a las tablas que ya existían.
+  """
+  with db.engine.begin() as connection:
+    for table in db.metadata.sorted_tables:
+      for index in table.indexes:
+        index.create(bind=connection, checkfirst=True)
+
+def include_object(object, name, type_, reflected, compare_to):
+  # La autogeneración ignora las tablas de otros servicios que existen en la misma base de datos
+  if type_ == "table":
+    return name in db.metadata.tables and name not in EXTERNAL_TABLES
+  return True
 
 def init_db(app):
   db.init_app(app)
   ma.init_app(app)
+  migrate.init_app(app, db, directory=MIGRATIONS_DIR, render_as_batch=False,
+                   version_table=VERSION_TABLE, include_object=include_object)
 
-  with app.app_context():
-    db.create_all()
\ No newline at end of file
+  if SCHEMA_MODE == "create_all":
+    with app.app_context():
+      db.create_all()
+      create_missing_indexes()
+  elif SCHEMA_MODE == "migrate":
+    with app.app_context():
+      upgrade(directory=MIGRATIONS_DIR)
\ No newline at end of file
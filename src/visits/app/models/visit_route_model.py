@@ -4,6 +4,10 @@ from sqlalchemy.dialects.postgresql import UUID
 
 class VisitRoute(db.Model):
     __tablename__ = 'visit_routes'
+    __table_args__ = (
+        # Cubre también las consultas que solo filtran por seller_id
+        db.Index('ix_visit_routes_seller_id_visit_date', 'seller_id', 'visit_date'),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     route_name = db.Column(db.String(255), nullable=False)
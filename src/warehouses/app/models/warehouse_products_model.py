@@ -8,7 +8,7 @@ class WarehouseProducts(db.Model):
     
   id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
   warehouse_id = db.Column(UUID(as_uuid=True), db.ForeignKey('warehouses.id', ondelete='CASCADE'), nullable=False)
-  product_id = db.Column(UUID(as_uuid=True), nullable=False)
+  product_id = db.Column(UUID(as_uuid=True), nullable=False, index=True)
     
   quantity = db.Column(db.Integer, nullable=False)
   place = db.Column(db.Text, nullable=False)